@@ -0,0 +1,105 @@
+"""
+Cold-start cost of the app: wall time of `import app` (create_app())
+in fresh interpreters, plus per-module cost from `python -X importtime`.
+
+    cd backend
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 300 --runs 7 --top 25
+
+Exits non-zero when the median import exceeds --budget-ms or when a
+module that must load lazily (Groq SDK, requests, reportlab, PyPDF2,
+...) is imported at startup, so it can gate CI.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+
+from benchmarks.load_test import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use (or by utils/preload.py), never by `import app`
+LAZY_MODULES = ("groq", "httpx", "pydantic", "requests", "reportlab", "PyPDF2", "redis")
+
+SNIPPET = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "print(round((time.perf_counter() - start) * 1000, 1))\n"
+)
+
+
+def run_once() -> tuple:
+    """
+    (wall ms, [(module, self_us, cumulative_us), ...]) for one import.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SNIPPET],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return float(proc.stdout.strip().splitlines()[-1]), modules
+
+
+def by_package(modules: list) -> dict:
+    """
+    Self time summed per top-level package (ms).
+    """
+    totals = defaultdict(int)
+    for name, self_us, _ in modules:
+        totals[name.split(".")[0]] += self_us
+    return {name: us / 1000 for name, us in totals.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="App import-time benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=300, help="median `import app` budget")
+    parser.add_argument("--top", type=int, default=15, help="packages / modules to list")
+    args = parser.parse_args(argv)
+
+    runs = [run_once() for _ in range(args.runs)]
+    walls = sorted(wall for wall, _ in runs)
+    median = percentile(walls, 50)
+    # Per-module numbers from the fastest run (least scheduler noise)
+    _, modules = min(runs, key=lambda run: run[0])
+
+    print(f"import app: median {median:.1f} ms, min {walls[0]:.1f} ms, max {walls[-1]:.1f} ms ({args.runs} runs)")
+
+    print(f"\n{'package':<28}{'self ms':>9}")
+    for name, ms in sorted(by_package(modules).items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<28}{ms:>9.1f}")
+
+    print(f"\n{'module':<40}{'cumulative ms':>14}")
+    for name, _, cumulative_us in sorted(modules, key=lambda m: -m[2])[:args.top]:
+        print(f"{name:<40}{cumulative_us / 1000:>14.1f}")
+
+    failures = []
+    if median > args.budget_ms:
+        failures.append(f"median import {median:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    eager = sorted({
+        name.split(".")[0] for name, _, _ in modules
+        if name.split(".")[0] in LAZY_MODULES
+    })
+    if eager:
+        failures.append("imported at startup (should be lazy): " + ", ".join(eager))
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"\nOK: within {args.budget_ms:.0f} ms, no lazy module imported at startup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+End-to-end load test: full interviews through /start, /answer and
+/report/pdf at N concurrent sessions.
+
+    cd backend
+    python -m benchmarks.load_test --sessions 50 --concurrency 10
+    python -m benchmarks.load_test --url http://localhost:5000 --sessions 20
+
+Without --url the app runs in-process on the fake LLM backend
+(LLM_BACKEND=fake, see utils/llm_backends.py), so no API key or network
+is needed. Reports p50/p95/p99 per endpoint and per turn stage (the
+"timings" returned by /answer). --json writes the same numbers for CI.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ANSWERS = [
+    "A hash map stores key value pairs in buckets chosen by the hash of the key, "
+    "so lookups are O(1) on average but degrade with many collisions.",
+    "I would add an index on the foreign key and check the query plan, then cache "
+    "hot reads in Redis with a short TTL and invalidate on writes.",
+    "Threads share memory so you need locks or queues; processes avoid the GIL "
+    "but cost more to start and need IPC to share data.",
+    "I don't know",
+    "Use pagination with a cursor instead of offset so deep pages stay fast, "
+    "and return a next cursor token to the client."
+]
+
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+# ======================================================
+# CLIENTS
+# ======================================================
+class InProcessClient:
+    def __init__(self):
+        from app import app
+
+        self.app = app
+        self.local = threading.local()
+
+    def _client(self):
+        if not hasattr(self.local, "client"):
+            self.local.client = self.app.test_client()
+        return self.local.client
+
+    def post(self, path, form=None, json_body=None):
+        if form is not None:
+            r = self._client().post(path, data=form)
+        else:
+            r = self._client().post(path, json=json_body)
+        body = r.get_json(silent=True) if r.mimetype == "application/json" else None
+        size = len(r.data)
+        # Closing runs call_on_close hooks, as a WSGI server would
+        r.close()
+        return r.status_code, body, size
+
+
+class HTTPClient:
+    def __init__(self, base_url: str):
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def post(self, path, form=None, json_body=None):
+        r = self.session.post(self.base_url + path, data=form, json=json_body, timeout=300)
+        is_json = r.headers.get("Content-Type", "").startswith("application/json")
+        return r.status_code, (r.json() if is_json else None), len(r.content)
+
+
+# ======================================================
+# SCENARIO
+# ======================================================
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = defaultdict(list)
+        self.stages = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def endpoint(self, name, ms, status):
+        with self.lock:
+            self.endpoints[name].append(ms)
+            if status >= 400:
+                self.errors[f"{name} {status}"] += 1
+
+    def timings(self, timings: dict):
+        with self.lock:
+            for key, value in timings.items():
+                if key.endswith("_ms"):
+                    self.stages[key[:-3]].append(value)
+
+
+def _timed_post(client, recorder, name, path, **kwargs):
+    start = time.perf_counter()
+    status, body, _ = client.post(path, **kwargs)
+    recorder.endpoint(name, (time.perf_counter() - start) * 1000, status)
+    return status, body
+
+
+def run_interview(client, recorder, number: int, role: str, topic: str):
+    status, body = _timed_post(
+        client, recorder, "start", "/api/interview/start",
+        form={
+            "name": f"Load Test {number}",
+            "mode": "normal",
+            "role": role,
+            "topic": topic,
+            "confidence": str(3 + number % 6)
+        }
+    )
+    if status != 200:
+        return
+
+    session_id = body["session_id"]
+    for turn in range(body.get("max_questions", 5) + 1):
+        status, body = _timed_post(
+            client, recorder, "answer", "/api/interview/answer",
+            json_body={
+                "session_id": session_id,
+                "answer": ANSWERS[(number + turn) % len(ANSWERS)]
+            }
+        )
+        if status != 200:
+            return
+        recorder.timings(body.get("timings", {}))
+        if body.get("done"):
+            break
+
+    if body.get("report"):
+        _timed_post(
+            client, recorder, "report_pdf", "/api/interview/report/pdf",
+            json_body={"session_id": session_id, "report": body["report"]}
+        )
+
+
+# ======================================================
+# REPORT
+# ======================================================
+def summarize(recorder: Recorder, sessions: int, elapsed: float) -> dict:
+    def table(samples):
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "p99_ms": round(percentile(values, 99), 1)
+            }
+            for name, values in sorted(samples.items())
+        }
+
+    return {
+        "sessions": sessions,
+        "seconds": round(elapsed, 2),
+        "sessions_per_minute": round(sessions / elapsed * 60, 1) if elapsed else 0.0,
+        "endpoints": table(recorder.endpoints),
+        "stages": table(recorder.stages),
+        "errors": dict(recorder.errors)
+    }
+
+
+def print_summary(summary: dict):
+    print(
+        f"\n{summary['sessions']} interviews in {summary['seconds']}s "
+        f"({summary['sessions_per_minute']}/min)"
+    )
+    for section in ("endpoints", "stages"):
+        print(f"\n{section:<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, row in summary[section].items():
+            print(
+                f"{name:<16}{row['count']:>7}{row['p50_ms']:>10}"
+                f"{row['p95_ms']:>10}{row['p99_ms']:>10}"
+            )
+    if summary["errors"]:
+        print("\nerrors:", summary["errors"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Interview API load test")
+    parser.add_argument("--sessions", type=int, default=20, help="interviews to run")
+    parser.add_argument("--concurrency", type=int, default=10, help="interviews in flight")
+    parser.add_argument("--url", help="base URL of a running server (default: in-process, fake LLM)")
+    parser.add_argument("--role", default="Backend Developer")
+    parser.add_argument("--topic", default="Python")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        client = HTTPClient(args.url)
+    else:
+        # Must be set before the app (and llm_client) is imported
+        os.environ.setdefault("LLM_BACKEND", "fake")
+        os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "1000000")
+        os.environ.setdefault("LLM_MAX_CONCURRENCY", "64")
+        os.environ.setdefault("SESSION_BACKEND", "memory")
+        # Every simulated candidate shares one client address
+        os.environ.setdefault("ADMISSION_MAX_PER_CLIENT", "0")
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        client = InProcessClient()
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(run_interview, client, recorder, number, args.role, args.topic)
+            for number in range(args.sessions)
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                recorder.errors[type(e).__name__] += 1
+    summary = summarize(recorder, args.sessions, time.perf_counter() - start)
+
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
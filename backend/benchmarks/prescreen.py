@@ -0,0 +1,99 @@
+"""
+Answer pre-screening against labeled answers: how many evaluation
+LLM calls it avoids, and how often it wrongly skips an answer that
+needed one (the number that must stay at zero).
+
+    cd backend
+    python -m benchmarks.prescreen
+    python -m benchmarks.prescreen --fixtures my_answers.jsonl --show-errors
+
+Fixture lines: {"topic", "question", "answer", "label"} with label one
+of empty / evasive / copy / off_topic / evaluate. The old substring
+rule (SKIP_PHRASES) is scored on the same set for comparison.
+"""
+
+import os
+import json
+import time
+import argparse
+from collections import Counter
+
+from core.answer_prescreen import prescreen_answer, EVALUATE, SCREENED_LABELS
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "prescreen_answers.jsonl")
+
+# Rule used before core.answer_prescreen (skipped / scored 1 when true)
+LEGACY_SKIP_PHRASES = ["don't know", "dont know", "do not know", "no idea", "skip", "not sure"]
+
+
+def legacy_label(question: str, answer: str, topic: str = "") -> str:
+    if not answer or len(answer.strip()) < 15:
+        return "skipped"
+    answer = answer.lower()
+    return "skipped" if any(p in answer for p in LEGACY_SKIP_PHRASES) else EVALUATE
+
+
+def load_fixtures(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def score(rows: list, classify) -> dict:
+    start = time.perf_counter()
+    predicted = [classify(r["question"], r["answer"], r.get("topic", "")) for r in rows]
+    elapsed = time.perf_counter() - start
+
+    needs_llm = [r["label"] == EVALUATE for r in rows]
+    skipped = [p != EVALUATE for p in predicted]
+    return {
+        "predicted": predicted,
+        "llm_calls_avoided": sum(skipped) / len(rows),
+        # Answers that needed the LLM but were scored locally
+        "false_skips": sum(1 for need, skip in zip(needs_llm, skipped) if need and skip),
+        # Trivial answers that still went to the LLM
+        "missed_skips": sum(1 for need, skip in zip(needs_llm, skipped) if not need and not skip),
+        "us_per_answer": elapsed / len(rows) * 1e6
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer pre-screen benchmark")
+    parser.add_argument("--fixtures", default=FIXTURES_PATH)
+    parser.add_argument("--show-errors", action="store_true", help="print misclassified answers")
+    args = parser.parse_args(argv)
+
+    rows = load_fixtures(args.fixtures)
+    labels = Counter(r["label"] for r in rows)
+    print(f"{len(rows)} answers: " + ", ".join(f"{k} {v}" for k, v in sorted(labels.items())))
+
+    results = {"legacy": score(rows, legacy_label), "prescreen": score(rows, prescreen_answer)}
+
+    print(f"\n{'rule':<11}{'avoided':>9}{'false skips':>13}{'missed':>8}{'us/answer':>11}")
+    for name, result in results.items():
+        print(
+            f"{name:<11}{result['llm_calls_avoided']:>8.0%}{result['false_skips']:>13}"
+            f"{result['missed_skips']:>8}{result['us_per_answer']:>11.1f}"
+        )
+
+    predicted = results["prescreen"]["predicted"]
+    print(f"\n{'label':<11}{'precision':>10}{'recall':>8}")
+    for label in SCREENED_LABELS + (EVALUATE,):
+        hits = sum(1 for r, p in zip(rows, predicted) if p == label and r["label"] == label)
+        chosen = sum(1 for p in predicted if p == label)
+        actual = labels.get(label, 0)
+        print(
+            f"{label:<11}{(hits / chosen if chosen else 0):>10.2f}"
+            f"{(hits / actual if actual else 0):>8.2f}"
+        )
+
+    if args.show_errors:
+        print()
+        for r, p in zip(rows, predicted):
+            if p != r["label"]:
+                print(f"[{r['label']} -> {p}] {r['answer']!r}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Tail latency of the LLM router on fake backends: one route alone,
+two routes with failover, and two routes with hedging.
+
+    cd backend
+    python -m benchmarks.router_tail --calls 400
+
+The fake routes have heavy-tailed latency (lognormal) and the primary
+also fails --failure-rate of its calls, so the numbers show what
+failover and hedged requests do to p95 / p99 and how many extra
+calls hedging costs.
+"""
+
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.load_test import percentile
+from utils.llm_backends import FakeBackend
+from utils.llm_router import Router, Route
+
+
+def _routes(args) -> list:
+    return [
+        Route("fake:primary", FakeBackend(
+            latency=f"lognormal:{args.median_ms}:{args.sigma}",
+            tokens_per_second=0,
+            failure_rate=args.failure_rate,
+            failure_kinds="unavailable",
+            seed=1
+        )),
+        Route("fake:secondary", FakeBackend(
+            latency=f"lognormal:{args.median_ms}:{args.sigma}",
+            tokens_per_second=0,
+            seed=2
+        ))
+    ]
+
+
+def run(name: str, router: Router, calls: int, concurrency: int) -> dict:
+    tier = router.for_template("question")
+    latencies, errors = [], 0
+
+    def one(i):
+        start = time.perf_counter()
+        tier.complete(f"Question {i}: explain caching", 0.6, 256)
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(one, i) for i in range(calls)]:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+
+    backend_calls = sum(route.backend.calls for route in router.routes())
+    return {
+        "mode": name,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "errors": errors,
+        "backend_calls": backend_calls
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LLM router tail-latency benchmark")
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--median-ms", type=float, default=50)
+    parser.add_argument("--sigma", type=float, default=0.8, help="lognormal spread (tail weight)")
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="primary route only")
+    args = parser.parse_args(argv)
+
+    results = []
+    primary, secondary = _routes(args)
+    results.append(run("single", Router({"fast": [primary]}, hedge=False), args.calls, args.concurrency))
+    results.append(run("failover", Router({"fast": _routes(args)}, hedge=False), args.calls, args.concurrency))
+    results.append(run("hedged", Router({"fast": _routes(args)}, hedge=True), args.calls, args.concurrency))
+
+    print(f"\n{'mode':<10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'calls':>8}")
+    for row in results:
+        print(
+            f"{row['mode']:<10}{row['p50_ms']:>9}{row['p95_ms']:>9}"
+            f"{row['p99_ms']:>9}{row['errors']:>8}{row['backend_calls']:>8}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
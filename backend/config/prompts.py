@@ -59,8 +59,12 @@ Project name: {project_name}
 README:
 {readme}
 
+Previous questions and answers:
+{history}
+
 Rules:
 - Ask EXACTLY ONE technical question
+- Do NOT repeat previous questions
 - No explanations
 """
 
@@ -69,6 +73,10 @@ PROJECT_CODE_INTERVIEW_PROMPT = """
 You are reviewing project code.
 
 Project: {project_name}
+Interview phase: {phase}
+
+README (excerpt):
+{readme}
 
 Structure:
 {file_tree}
@@ -76,9 +84,14 @@ Structure:
 Code snippets:
 {code_snippets}
 
+Previous questions and answers:
+{history}
+
 Rules:
 - Ask EXACTLY ONE deep technical question
 - Focus on design, performance or trade-offs
+- Refer to the code shown (files, functions) where possible
+- Go deeper than previous questions; do NOT repeat them
 """
 
 
@@ -113,6 +126,39 @@ Respond ONLY in JSON:
 
 
 
+BATCH_ANSWER_EVALUATION_PROMPT = """
+You are a fair and realistic technical interviewer.
+Evaluate EACH of the following answers independently.
+
+{items}
+
+Evaluation guidelines:
+- Give PARTIAL CREDIT for correct ideas, even if incomplete
+- Focus on CONCEPTUAL UNDERSTANDING more than syntax
+- Do NOT expect perfect or textbook answers
+- Penalize only for major misconceptions
+- If the idea is mostly correct, score should be 6 or above
+- Be encouraging but honest
+
+Respond ONLY in JSON, with one entry per answer id:
+{{
+  "evaluations": [
+    {{
+      "id": answer id,
+      "score": number between 0 and 10,
+      "technical_accuracy": number between 0 and 10,
+      "communication_clarity": number between 0 and 10,
+      "problem_solving": number between 0 and 10,
+      "strengths": "what the candidate understood correctly",
+      "weaknesses": "minor gaps or improvements (if any)",
+      "depth_assessment": "none | surface | moderate | deep"
+    }}
+  ]
+}}
+"""
+
+
+
 COMPETENCE_ESTIMATION_PROMPT = """
 Estimate competence.
 
@@ -133,6 +179,18 @@ Respond ONLY in JSON:
 """
 
 
+JSON_REPAIR_PROMPT = """
+Your previous reply could not be used:
+{errors}
+
+Previous reply:
+{response}
+
+Return ONLY the corrected JSON object, keeping the original content, with these fields:
+{fields}
+"""
+
+
 FINAL_REPORT_PROMPT = """
 You are a professional technical interviewer generating a final interview report.
 
@@ -204,6 +262,90 @@ STRICT RULES:
 - If answers were "I don't know" or "skip", the final score must reflect this (below 4).
 """
 
+REPORT_SECTION_PROMPT = """
+You are a professional technical interviewer writing one part of an interview report.
+
+Interview Type: {role}
+Topic: {topic}
+
+Question:
+{question}
+
+Candidate Answer:
+{answer}
+
+Score given: {score}/10
+Strengths noted: {strengths}
+Weaknesses noted: {weaknesses}
+
+Write ONLY the evaluation of this answer:
+- What was correct
+- What was partially correct
+- What needs improvement
+- If skipped, explain why it matters (knowledge gap)
+
+STRICT RULES:
+- 3 to 5 short bullet points, each starting with "- "
+- No headings, no score, do not repeat the question or answer
+- Keep tone supportive and realistic
+"""
+
+
+REPORT_SYNTHESIS_PROMPT = """
+You are a professional technical interviewer generating a final interview report.
+
+Candidate Name: {candidate_name}
+Interview Date: {date}
+
+Interview Type: {role}
+Topic: {topic}
+
+Self-reported confidence: {confidence}/10
+Estimated competence: {estimated_competence}/10
+
+PER-QUESTION RESULTS:
+{results}
+
+======================
+STRICT OUTPUT FORMAT
+======================
+
+1. Final Score & Verdict
+- Final Score: <calculate strictly based on the results>/10
+- Verdict: Hire | Borderline | Needs Practice
+- One-line justification
+- CRITICAL: If the candidate skipped many questions, the score MUST be low (e.g. 1-3). Do not inflate scores.
+
+2. Overall Performance Summary
+- Balanced, fair, and constructive
+- Acknowledge partial correctness
+- Do NOT be harsh or dismissive
+
+3. Strengths
+- Bullet points
+- Mention even small positives
+- Be specific
+
+4. Areas for Improvement
+- Bullet points
+- Phrase constructively (e.g. "Needs more practice with...")
+- No harsh language
+
+5. Confidence vs Competence
+- Compare self-confidence and observed ability
+- Encourage improvement if confidence is low
+
+7. Actionable Next Steps
+- 4–6 concrete learning steps
+- Practical (practice topics, exercises, habits)
+
+STRICT RULES:
+- Do NOT write section 6 (the question-wise review is added separately)
+- DO NOT cut off mid-report
+- Keep tone supportive and realistic
+- If answers were "I don't know" or "skip", the final score must reflect this (below 4).
+"""
+
 # ==================================================
 # RESUME-BASED QUESTION PROMPT (ADDITIVE)
 # ==================================================
@@ -230,3 +372,85 @@ Guidelines:
 
 Return ONLY ONE question.
 """
+
+# ==================================================
+# QUESTION BANK (OFFLINE BATCH GENERATION)
+# ==================================================
+
+QUESTION_BANK_PROMPT = """
+You are a realistic and experienced technical interviewer preparing a question bank.
+
+Topic: {topic}
+Interview phase: {phase}
+Question type: {question_type}
+
+Phase guidance:
+- Warm-up: basic concepts, light reasoning
+- Intermediate: applied understanding, small code snippets, scenarios
+- Advanced: edge cases, trade-offs, debugging, deeper reasoning
+
+Write {count} DIFFERENT interview questions of this type.
+
+Rules:
+- Each question asks EXACTLY ONE thing
+- No hints, no explanations, no answers
+- If a question includes code, put the code on new lines
+- Do not repeat any of these existing questions:
+{existing}
+
+Respond ONLY in JSON:
+{{
+  "questions": ["question 1", "question 2"]
+}}
+"""
+
+# ==================================================
+# INTERVIEW PLAN (QUESTION_MODE=plan)
+# ==================================================
+
+QUESTION_PLAN_PROMPT = """
+You are a realistic and experienced technical interviewer writing an interview plan.
+
+Interview type: {role}
+Topic: {topic}
+Candidate type: {candidate_type}
+
+Candidate confidence: {confidence}/10
+Current competence summary: {competence_summary}
+Focus areas: {focus}
+
+Previous Q&A:
+{history}
+
+Current question (not answered yet):
+{current_question}
+
+Plan these questions, in order:
+{slots}
+
+For EACH planned question write:
+- "question": the question for that phase, at the candidate's current level
+- "easier": an easier question on the same concept, for a struggling candidate
+- "deeper": a harder follow-up on the same concept (trade-offs, edge cases, internals)
+
+Question design rules:
+- Vary the question type across the plan (conceptual, code understanding,
+  output prediction, debugging, comparison, practical scenario, edge cases)
+- If focus areas are given, the main questions target them
+- Do not repeat any question already asked
+- Each question asks EXACTLY ONE thing
+- No hints, no explanations, no answers
+- If a question includes code, put the code on new lines
+
+Phase guidance:
+- Warm-up: basic concepts, light reasoning
+- Intermediate: applied understanding, small code snippets, scenarios
+- Advanced: edge cases, trade-offs, debugging, deeper reasoning
+
+Respond ONLY in JSON, one entry per planned question, in order:
+{{
+  "questions": [
+    {{"question": "...", "easier": "...", "deeper": "..."}}
+  ]
+}}
+"""
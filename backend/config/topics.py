@@ -1,3 +1,5 @@
+import os
+
 TOPICS = {
     "Programming": [
         "Python",
@@ -30,3 +32,46 @@ TOPICS = {
     ],
     
 }
+
+# Questions per interview (phases scale with it)
+MAX_QUESTIONS = int(os.getenv("MAX_QUESTIONS", "5"))
+
+# Interview phases, in order (see QUESTION_GENERATION_PROMPT)
+INTERVIEW_PHASES = [
+    "basic warm-up",
+    "intermediate",
+    "advanced probing"
+]
+
+# Question types from QUESTION_GENERATION_PROMPT, keyed for the question bank
+QUESTION_TYPES = {
+    "conceptual": "Conceptual explanation (why / how)",
+    "code_understanding": "Code understanding (given a short snippet, ask what it does or why)",
+    "output_prediction": "Output prediction (ask what the code outputs)",
+    "debugging": "Debugging or fixing a mistake",
+    "comparison": "Comparison (e.g., A vs B, pros/cons)",
+    "scenario": "Practical scenario or design decision",
+    "edge_case": "Edge-case reasoning",
+    "sql_reasoning": "SQL query reasoning (not writing full queries unless advanced)",
+    "system_behavior": "System behavior explanation (OS / DB / Networks)"
+}
+
+# Which question types make sense for each topic category
+QUESTION_TYPES_BY_CATEGORY = {
+    "Programming": [
+        "conceptual", "code_understanding", "output_prediction",
+        "debugging", "comparison", "edge_case"
+    ],
+    "CS Fundamentals": [
+        "conceptual", "comparison", "scenario", "edge_case", "system_behavior"
+    ],
+    "Databases": [
+        "conceptual", "sql_reasoning", "comparison", "scenario", "edge_case"
+    ],
+    "Web / Backend": [
+        "conceptual", "code_understanding", "debugging", "comparison", "scenario"
+    ],
+    "System Design (Basics)": [
+        "conceptual", "comparison", "scenario", "edge_case"
+    ],
+}
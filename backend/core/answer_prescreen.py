@@ -0,0 +1,248 @@
+"""
+Local answer pre-screening (no LLM).
+
+    label = prescreen_answer(question, answer, topic)
+
+Labels:
+    empty      nothing but filler ("", "ok", "hmm...")
+    evasive    "I don't know" / "skip" with next to no attempt
+    copy       restates the question without adding anything
+    off_topic  short small talk or gibberish that shares nothing with
+               the question and has no technical content
+    evaluate   everything else: needs ANSWER_EVALUATION_PROMPT
+
+Only the first four are scored locally, so the rules lean towards
+"evaluate": a "not sure, but ..." answer with content after the hedge,
+a terse technical one ("O(log n)", "use a hash map") or a yes / no
+reply to a yes / no question ("Yes, dict is ordered.") still goes to
+the LLM.
+
+Benchmark against the labeled fixtures:
+    python -m benchmarks.prescreen
+"""
+
+import re
+from difflib import SequenceMatcher
+
+EMPTY = "empty"
+EVASIVE = "evasive"
+COPY = "copy"
+OFF_TOPIC = "off_topic"
+EVALUATE = "evaluate"
+
+SCREENED_LABELS = (EMPTY, EVASIVE, COPY, OFF_TOPIC)
+
+# Evasive answers may add this many words of their own (beyond the
+# question's terms) before they count as an attempt
+EVASIVE_MAX_OWN_WORDS = 5
+# After a hedge ("not sure, but ..."), this many words of the
+# candidate's own make an attempt
+HEDGE_ATTEMPT_MIN_WORDS = 2
+# Copies may add this share of new words (and need this many words:
+# shorter echoes are usually terse answers)
+COPY_MAX_NOVEL_RATIO = 0.15
+COPY_MIN_WORDS = 3
+COPY_MIN_SIMILARITY = 0.9
+# Longer answers are never called off-topic (synonyms, analogies)
+OFF_TOPIC_MAX_WORDS = 25
+
+WORD_RE = re.compile(r"[a-z][a-z0-9_+#]*|[0-9]+")
+
+EVASIVE_RE = re.compile(
+    r"\b("
+    r"(i\s+)?(do\s*n[o']?t|dont|don't)\s+(really\s+)?(know|remember|recall)"
+    r"|no\s+(idea|clue)|idk"
+    r"|\A\W*(skip|pass)\W*\Z|i'?ll\s+(skip|pass)|let'?s\s+skip|skip\s+(this|it|the\s+question)"
+    r"|not\s+(sure|familiar)|never\s+(heard|used|worked|learned|studied)"
+    r"|(can'?t|cannot|can\s+not)\s+(answer|say|explain)"
+    r"|next\s+question|forgot|haven'?t\s+(studied|learned|used|worked)"
+    r")\b"
+)
+
+# "..., but I think ..." after a hedge introduces an attempt
+HEDGE_TURN_RE = re.compile(
+    r"\b(but|however|though|although|i\s+think|i\s+guess|maybe|probably|perhaps)\b"
+)
+
+# Yes / no questions, which a restatement does answer
+POLAR_QUESTION_RE = re.compile(
+    r"^\s*(is|are|was|were|do|does|did|can|could|should|would|will|has|have|must)\b",
+    re.IGNORECASE
+)
+POLAR_REPLY_RE = re.compile(r"^\W*(yes|yeah|yep|no|nope|true|false|correct)\b")
+
+CODE_RE = re.compile(
+    r"`"
+    r"|[A-Za-z_]\w*\([^)]*\)"
+    r"|[{};]\s*$|=>|->|==|!=|<=|>=|::|\[\s*\d*\s*\]"
+    r"|[\[(]\s*\w+\s*(,\s*\w+\s*)+[\])]"
+    r"|^\s*(def|class|function|const|let|var|import|return)\s+\w+.*[(=:]"
+    r"|(?i:\bselect\b.+\bfrom\b)",
+    re.MULTILINE
+)
+# camelCase, snake_case, dotted names (os.path, req.body)
+IDENTIFIER_RE = re.compile(r"\b[a-z]+[A-Z]\w*|\b\w+_\w+|\b[a-z]+\.[a-z]+\b")
+# Acronyms and compound terms (LRU, SYN-ACK, I/O)
+TECH_TOKEN_RE = re.compile(r"\b[A-Z]{2,}\b|\b\w+[-/]\w+\b")
+GIBBERISH_RE = re.compile(r"^([^aeiouy]+|.*(.)\2\2.*)$")
+
+STOPWORDS = frozenset("""
+a an the and or but if then else so of to in on at by for with from into
+about as is are was were be been being am it its this that these those
+there here what which who whom whose when where why how do does did doing
+done have has had having can could would should will shall may might must
+i me my we our you your he she they them their his her not no yes very
+just also than too more most some any all each both such only own same
+other again further once up down out over under between through during
+before after above below off one two get gets got make makes use uses
+used using like really much many well thing things way ways
+""".split())
+
+FILLER = frozenset("""
+ok okay hmm hm um uh uhh erm hi hello hey thanks thank sorry yeah yep nope
+right sure alright fine lol haha yes no
+""".split())
+
+# Off-topic needs positive evidence: small talk ...
+SMALL_TALK = frozenset("""
+favourite favorite love hobby hobbies food pizza cricket football movie
+movies music song weather today tomorrow yesterday weekend weekends
+morning evening night nice meet hear reschedule college school family
+friend friends hometown born holiday vacation lunch dinner coffee tea
+game games play playing watch watching internet
+""".split())
+
+# ... or keyboard mashing / placeholder text
+GIBBERISH = frozenset("asdf qwerty jkl zxcv lorem ipsum dolor".split())
+
+# Words that signal a technical attempt even without overlap
+TECH_TERMS = frozenset("""
+algorithm array list tuple dict dictionary set map hash hashmap hashing
+table tree graph node heap stack queue pointer reference index key value
+string integer int float boolean bool byte bit memory cache caching
+thread process lock mutex deadlock async await concurrency parallel
+function method class object instance inheritance interface abstract
+polymorphism encapsulation decorator generator iterator closure lambda
+recursion loop variable constant scope exception error type compile
+compiler interpreter runtime garbage collection immutable mutable
+sort search binary linear complexity time space log constant quadratic
+database sql query join index transaction acid normalization schema
+primary foreign row column nosql document replication shard sharding
+api rest http https request response endpoint status header json xml
+get post put delete patch server client route middleware session cookie
+token auth authentication authorization jwt oauth tcp udp ip dns socket
+packet protocol port latency bandwidth router load balancer kernel
+scheduler paging virtual file system disk cpu semaphore container
+docker kubernetes deploy microservice service queue message event
+python java javascript node flask django react framework library module
+package import version test testing unit mock orm model view controller
+""".split())
+
+
+def _stem(word: str) -> str:
+    # Plurals only: "decorators" matches "decorator"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def content_words(text: str) -> list:
+    return [
+        _stem(w)
+        for w in WORD_RE.findall(text.lower())
+        if w not in STOPWORDS and w not in FILLER
+    ]
+
+
+def has_code(answer: str) -> bool:
+    return bool(CODE_RE.search(answer) or IDENTIFIER_RE.search(answer))
+
+
+def _gibberish(word: str) -> bool:
+    return word in GIBBERISH or (len(word) >= 3 and bool(GIBBERISH_RE.match(word)))
+
+
+def answer_features(question: str, answer: str, topic: str = "") -> dict:
+    """
+    Lexical features used by prescreen_answer (also reported by the
+    benchmark).
+    """
+    answer = answer or ""
+    words = content_words(answer)
+    question_terms = set(content_words(question)) | set(content_words(topic))
+    own = [w for w in words if w not in question_terms]
+    code = has_code(answer)
+
+    return {
+        "chars": len(answer.strip()),
+        "words": len(words),
+        "own_words": len(own),
+        "overlap": len(words) - len(own),
+        "novel_ratio": (len(set(own)) / len(set(words))) if words else 0.0,
+        "code": code,
+        "technical": code or bool(TECH_TOKEN_RE.search(answer)) or any(w in TECH_TERMS for w in words),
+        "small_talk": sum(1 for w in words if w in SMALL_TALK),
+        "gibberish_ratio": (sum(1 for w in words if _gibberish(w)) / len(words)) if words else 0.0,
+        "evasive": bool(EVASIVE_RE.search(answer.strip().lower())),
+        "polar": bool(POLAR_QUESTION_RE.match(question or "")),
+        "polar_reply": bool(POLAR_REPLY_RE.match(answer.strip().lower()))
+    }
+
+
+def _own_words(text: str, question_terms: set) -> list:
+    # Evasive phrases themselves are not an attempt
+    return [w for w in content_words(EVASIVE_RE.sub(" ", text)) if w not in question_terms]
+
+
+def _hedged_attempt(answer: str, question_terms: set) -> bool:
+    """
+    Content after the hedge: "I dont know much, but it is stateless
+    http with resources and verbs".
+    """
+    text = answer.strip().lower()
+    tail = text[EVASIVE_RE.search(text).end():]
+    own = _own_words(tail, question_terms)
+    return len(own) >= HEDGE_ATTEMPT_MIN_WORDS and (
+        bool(HEDGE_TURN_RE.search(tail)) or any(w in TECH_TERMS for w in own)
+    )
+
+
+def prescreen_answer(question: str, answer: str, topic: str = "") -> str:
+    f = answer_features(question, answer, topic)
+
+    # "Yes" is a whole answer to "Is a Python dict ordered?"
+    polar_answer = f["polar"] and f["polar_reply"]
+
+    if f["words"] == 0 and not f["code"] and not polar_answer:
+        # "not sure" is all stopwords / filler
+        return EVASIVE if f["evasive"] else EMPTY
+
+    if f["evasive"] and not f["code"]:
+        question_terms = set(content_words(question)) | set(content_words(topic))
+        if (
+            len(_own_words((answer or "").strip().lower(), question_terms)) <= EVASIVE_MAX_OWN_WORDS
+            and not _hedged_attempt(answer, question_terms)
+        ):
+            return EVASIVE
+
+    # Restating a yes / no question answers it; only an echo is a copy
+    restates = (
+        not f["polar"]
+        and f["words"] >= COPY_MIN_WORDS
+        and f["novel_ratio"] <= COPY_MAX_NOVEL_RATIO
+    )
+    if not f["code"] and (
+        restates
+        or SequenceMatcher(None, question.lower().strip(), answer.lower().strip()).ratio() >= COPY_MIN_SIMILARITY
+    ):
+        return COPY
+
+    if (
+        f["overlap"] == 0
+        and not f["technical"]
+        and f["words"] <= OFF_TOPIC_MAX_WORDS
+        and (f["small_talk"] or f["gibberish_ratio"] >= 0.5)
+    ):
+        return OFF_TOPIC
+
+    return EVALUATE
@@ -0,0 +1,309 @@
+"""
+Batch / offline answer evaluation.
+
+CLI:  python -m core.batch_evaluator transcripts.jsonl --output scores.jsonl
+API:  POST /api/interview/evaluate/batch  (JSONL body, JSONL response)
+
+Input lines are transcripts:
+    {"id": "...", "role": "...", "topic": "...",
+     "qa_history": [{"question": "...", "answer": "..."}, ...]}
+
+Output lines are one evaluation per answer:
+    {"id": "...", "index": 0, "question": "...", "evaluation": {...}}
+followed by a {"summary": {...}} line with throughput.
+
+Several answers are packed into one LLM call. Answers that come back
+missing are re-scored one by one; answers that still fail are written
+with an "error" instead of a made-up score, so a re-run with the same
+output file (the checkpoint) only retries those.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from config.prompts import ANSWER_EVALUATION_PROMPT, BATCH_ANSWER_EVALUATION_PROMPT
+from core.evaluator import screen_answer, normalize_evaluation
+from utils.structured_output import (
+    call_structured,
+    parse_structured,
+    validate,
+    EVALUATION_SCHEMA,
+    BATCH_EVALUATION_SCHEMA
+)
+
+BATCH_EVAL_PACK_SIZE = int(os.getenv("BATCH_EVAL_PACK_SIZE", "5"))
+BATCH_EVAL_PACK_CHARS = int(os.getenv("BATCH_EVAL_PACK_CHARS", "8000"))
+BATCH_EVAL_WORKERS = int(os.getenv("BATCH_EVAL_WORKERS", "4"))
+# Larger jobs should use the CLI
+BATCH_EVAL_API_MAX_ANSWERS = int(os.getenv("BATCH_EVAL_API_MAX_ANSWERS", "1000"))
+# POST /evaluate/batch spends LLM calls in bulk: it is off unless a
+# token is set, and callers must send "Authorization: Bearer <token>"
+BATCH_EVAL_API_TOKEN = os.getenv("BATCH_EVAL_API_TOKEN", "")
+
+
+# ======================================================
+# INPUT
+# ======================================================
+def read_transcripts(lines):
+    """
+    Parses JSONL transcripts; blank lines are ignored.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            print(f"Batch evaluation: skipping line {number}:", e, file=sys.stderr)
+
+
+def transcript_error(transcript) -> str:
+    """
+    Why a parsed transcript cannot be scored, or None.
+    """
+    if not isinstance(transcript, dict):
+        return "expected a JSON object"
+    qa_history = transcript.get("qa_history")
+    if not isinstance(qa_history, list):
+        return '"qa_history" must be a list'
+    if not all(isinstance(qa, dict) for qa in qa_history):
+        return '"qa_history" entries must be objects'
+    for field in ("role", "topic"):
+        if not isinstance(transcript.get(field, ""), str):
+            return f'"{field}" must be a string'
+    for index, qa in enumerate(qa_history):
+        for field in ("question", "answer"):
+            if not isinstance(qa.get(field, ""), str):
+                return f'"qa_history"[{index}]["{field}"] must be a string'
+    return None
+
+
+def read_checkpoint(path: str) -> set:
+    """
+    (id, index) pairs already scored in an existing output file.
+    """
+    done = set()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for row in read_transcripts(f):
+                if "evaluation" in row:
+                    done.add((str(row["id"]), row["index"]))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _answer_items(transcripts, done):
+    """
+    One item per answer; a transcript that cannot be scored becomes a
+    single item carrying its "error".
+    """
+    for number, transcript in enumerate(transcripts):
+        error = transcript_error(transcript)
+        if error is not None:
+            transcript_id = transcript.get("id", number) if isinstance(transcript, dict) else number
+            yield {
+                "id": str(transcript_id),
+                "index": None,
+                "question": None,
+                "error": f"Transcript {number + 1}: {error}"
+            }
+            continue
+
+        transcript_id = str(transcript.get("id", number))
+        for index, qa in enumerate(transcript.get("qa_history", [])):
+            if (transcript_id, index) in done:
+                continue
+            yield {
+                "id": transcript_id,
+                "index": index,
+                "role": transcript.get("role", ""),
+                "topic": transcript.get("topic", ""),
+                "question": qa.get("question", ""),
+                "answer": qa.get("answer", "")
+            }
+
+
+def _packs(items, pack_size, pack_chars):
+    """
+    Groups consecutive answers with the same role/topic, bounded by
+    count and prompt size. Trivial answers (pre-screen) are packed
+    alone and scored without the LLM.
+    """
+    pack, size, context = [], 0, None
+    for item in items:
+        if "error" in item:
+            yield [item]
+            continue
+        item["screened"] = screen_answer(item["topic"], item["question"], item["answer"])
+        if item["screened"] is not None:
+            yield [item]
+            continue
+
+        item_size = len(item["question"]) + len(item["answer"])
+        item_context = (item["role"], item["topic"])
+        if pack and (
+            len(pack) >= pack_size
+            or size + item_size > pack_chars
+            or item_context != context
+        ):
+            yield pack
+            pack, size = [], 0
+        pack.append(item)
+        size += item_size
+        context = item_context
+
+    if pack:
+        yield pack
+
+
+# ======================================================
+# SCORING
+# ======================================================
+def _result(item, evaluation=None, error=None) -> dict:
+    row = {"id": item["id"], "index": item["index"], "question": item["question"]}
+    if error is None:
+        row["evaluation"] = evaluation
+    else:
+        row["error"] = error
+    return row
+
+
+def _evaluate_one(item, llm) -> dict:
+    prompt = ANSWER_EVALUATION_PROMPT.format(
+        role=item["role"],
+        topic=item["topic"],
+        question=item["question"],
+        answer=item["answer"]
+    )
+    try:
+        parsed = call_structured(prompt, EVALUATION_SCHEMA, template="batch_evaluation", llm=llm)
+        return _result(item, normalize_evaluation(parsed, item["answer"]))
+    except Exception as e:
+        return _result(item, error=str(e) or type(e).__name__)
+
+
+def _evaluate_pack(pack, llm) -> list:
+    if len(pack) == 1:
+        if "error" in pack[0]:
+            return [_result(pack[0], error=pack[0]["error"])]
+        if pack[0].get("screened") is not None:
+            return [_result(pack[0], pack[0]["screened"])]
+        return [_evaluate_one(pack[0], llm)]
+
+    items = "\n\n".join(
+        f"Answer id: {i}\n"
+        f"Role: {item['role']}\nTopic: {item['topic']}\n"
+        f"Question:\n{item['question']}\n"
+        f"Candidate Answer:\n{item['answer']}"
+        for i, item in enumerate(pack)
+    )
+    # Entries that are missing or fail validation are re-scored singly
+    # (with their own repair) rather than repairing the whole pack
+    scored = {}
+    try:
+        response = llm(BATCH_ANSWER_EVALUATION_PROMPT.format(items=items))
+        batch, errors = parse_structured(response, BATCH_EVALUATION_SCHEMA)
+        if errors:
+            raise ValueError("; ".join(errors[:3]))
+        for entry in batch["evaluations"]:
+            parsed, errors = validate(entry, EVALUATION_SCHEMA)
+            if not errors:
+                scored[int(entry.get("id", -1))] = parsed
+    except Exception as e:
+        print("Batch evaluation pack error:", e, file=sys.stderr)
+
+    return [
+        _result(item, normalize_evaluation(scored[i], item["answer"]))
+        if i in scored else _evaluate_one(item, llm)
+        for i, item in enumerate(pack)
+    ]
+
+
+def evaluate_batch(
+    transcripts,
+    done: set = frozenset(),
+    pack_size: int = BATCH_EVAL_PACK_SIZE,
+    pack_chars: int = BATCH_EVAL_PACK_CHARS,
+    workers: int = BATCH_EVAL_WORKERS,
+    llm=None
+):
+    """
+    Yields one result row per answer as packs complete (not in input
+    order), then a {"summary": ...} row. At most workers packs are in
+    flight, so arbitrarily large inputs are streamed.
+    llm is any callable prompt -> text (defaults to call_llm).
+    """
+    if llm is None:
+        from utils.llm_client import call_llm
+        llm = functools.partial(call_llm, template="batch_evaluation", json_mode=True)
+
+    start = time.perf_counter()
+    counts = {"scored": 0, "failed": 0, "packs": 0}
+    packs = _packs(_answer_items(transcripts, done), pack_size, pack_chars)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers:
+                pack = next(packs, None)
+                if pack is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_evaluate_pack, pack, llm))
+
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                rows = future.result()
+                counts["packs"] += 1
+                for row in rows:
+                    counts["failed" if "error" in row else "scored"] += 1
+                    yield row
+
+    elapsed = time.perf_counter() - start
+    answers = counts["scored"] + counts["failed"]
+    yield {
+        "summary": {
+            "answers": answers,
+            "scored": counts["scored"],
+            "failed": counts["failed"],
+            "skipped_from_checkpoint": len(done),
+            "packs": counts["packs"],
+            "seconds": round(elapsed, 2),
+            "answers_per_minute": round(answers / elapsed * 60, 1) if elapsed else 0.0
+        }
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score interview transcripts in bulk")
+    parser.add_argument("input", help="JSONL transcripts ('-' for stdin)")
+    parser.add_argument("--output", required=True, help="JSONL results; also the resume checkpoint")
+    parser.add_argument("--pack-size", type=int, default=BATCH_EVAL_PACK_SIZE, help="answers per LLM call")
+    parser.add_argument("--workers", type=int, default=BATCH_EVAL_WORKERS, help="parallel LLM calls")
+    args = parser.parse_args()
+
+    done = read_checkpoint(args.output)
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+
+    with source, open(args.output, "a", encoding="utf-8") as out:
+        for row in evaluate_batch(
+            read_transcripts(source),
+            done=done,
+            pack_size=args.pack_size,
+            workers=args.workers
+        ):
+            if "summary" in row:
+                print(json.dumps(row["summary"]))
+                continue
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
@@ -1,24 +1,164 @@
-import json
-from utils.llm_client import call_llm
+import os
+from utils.structured_output import call_structured, COMPETENCE_SCHEMA
 from config.prompts import COMPETENCE_ESTIMATION_PROMPT
+from core.transcript import render_evaluation_history, transcript_from_history
+from utils.metrics import inc, timed
 
+# local  -> Bayesian update over the evaluation scores (no LLM call)
+# llm    -> COMPETENCE_ESTIMATION_PROMPT every turn
+# hybrid -> local every turn, LLM only for the final estimate (report)
+COMPETENCE_MODE = os.getenv("COMPETENCE_MODE", "hybrid")
 
-def estimate_competence(topic, confidence, evaluation_history):
-    history = ""
-    for e in evaluation_history:
-        history += f"Score:{e['score']} Strengths:{e['strengths']} Weaknesses:{e['weaknesses']}\n"
+# ---------------- LOCAL MODEL ----------------
+# Prior: self-reported confidence with a wide spread
+PRIOR_SD = 2.0
+NEUTRAL_PRIOR = 5.0
+# Noise of one answer's observed score
+OBSERVATION_SD = 1.5
+# Older answers count less (the candidate warms up / the topic shifts)
+RECENCY_DECAY = 0.85
+
+OBSERVATION_WEIGHTS = {
+    "score": 0.5,
+    "technical_accuracy": 0.3,
+    "problem_solving": 0.2
+}
+
+ALIGNMENT_MARGIN = 1.5
+WEAK_DIMENSION_THRESHOLD = 5
+WEAK_DIMENSIONS = {
+    "technical_accuracy": "technical accuracy",
+    "communication_clarity": "communication",
+    "problem_solving": "problem solving"
+}
+
+
+def _number(value, default: float = 5.0) -> float:
+    try:
+        return min(10.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _observation(evaluation: dict) -> float:
+    return sum(
+        weight * _number(evaluation.get(field, evaluation.get("score")))
+        for field, weight in OBSERVATION_WEIGHTS.items()
+    )
+
+
+def _weak_areas(topic: str, evaluation_history: list) -> list:
+    areas = []
+    for field, label in WEAK_DIMENSIONS.items():
+        values = [_number(e.get(field)) for e in evaluation_history]
+        if sum(values) / len(values) < WEAK_DIMENSION_THRESHOLD:
+            areas.append(f"{topic} {label}")
+
+    shallow = sum(
+        1 for e in evaluation_history
+        if e.get("depth_assessment") in ("none", "surface")
+    )
+    if shallow * 2 > len(evaluation_history):
+        areas.append(f"{topic} depth of explanation")
+    return areas
+
+
+def _next_intent(last_score: float, weak_areas: list) -> str:
+    if last_score <= 3:
+        return "easier"
+    if last_score >= 8:
+        return "deeper"
+    if weak_areas and last_score <= 6:
+        return "focused"
+    return "similar"
+
+
+def estimate_competence_local(topic, confidence, evaluation_history) -> dict:
+    """
+    Normal-normal Bayesian update: prior N(confidence, PRIOR_SD^2),
+    one observation per answer (weighted score / accuracy / problem
+    solving) with recency-decayed precision. Same shape as the LLM output.
+    """
+    confidence = _number(confidence, 0.0)
+    prior_mean = confidence if confidence > 0 else NEUTRAL_PRIOR
+
+    precision = 1 / PRIOR_SD ** 2
+    weighted_sum = prior_mean * precision
+
+    n = len(evaluation_history)
+    for i, evaluation in enumerate(evaluation_history):
+        weight = RECENCY_DECAY ** (n - 1 - i) / OBSERVATION_SD ** 2
+        precision += weight
+        weighted_sum += weight * _observation(evaluation)
+
+    estimate = weighted_sum / precision
+    spread = precision ** -0.5
+
+    if not evaluation_history:
+        return {
+            "estimated_competence": round(estimate, 1),
+            "confidence_alignment": "aligned",
+            "weak_areas": [],
+            "next_question_intent": "similar",
+            "reasoning": "No answers evaluated yet."
+        }
+
+    alignment = "aligned"
+    if confidence > 0 and confidence - estimate > ALIGNMENT_MARGIN:
+        alignment = "overconfident"
+    elif confidence > 0 and estimate - confidence > ALIGNMENT_MARGIN:
+        alignment = "underconfident"
+
+    last_score = _number(evaluation_history[-1].get("score"))
+    weak_areas = _weak_areas(topic, evaluation_history)
+
+    reasoning = (
+        f"Estimated {estimate:.1f}/10 (±{spread:.1f}) after {n} answer(s); "
+        f"last score {last_score:g}/10."
+    )
+    if weak_areas:
+        reasoning += " Weak: " + ", ".join(weak_areas) + "."
+
+    return {
+        "estimated_competence": round(estimate, 1),
+        "confidence_alignment": alignment,
+        "weak_areas": weak_areas,
+        "next_question_intent": _next_intent(last_score, weak_areas),
+        "reasoning": reasoning
+    }
+
+
+def _estimate_competence_llm(topic, confidence, transcript) -> dict:
+    history = render_evaluation_history(transcript)
+    return call_structured(
+        COMPETENCE_ESTIMATION_PROMPT.format(
+            topic=topic,
+            confidence=confidence,
+            evaluation_history=history
+        ),
+        COMPETENCE_SCHEMA,
+        template="competence"
+    )
+
+
+@timed("estimate_competence")
+def estimate_competence(topic, confidence, evaluation_history, transcript=None, final=False):
+    """
+    final marks the last turn (hybrid mode refines it with the LLM).
+    """
+    use_llm = COMPETENCE_MODE == "llm" or (COMPETENCE_MODE == "hybrid" and final)
+    if not use_llm:
+        return estimate_competence_local(topic, confidence, evaluation_history)
+
+    if transcript is None:
+        transcript = transcript_from_history([], evaluation_history)
 
     try:
-        return json.loads(
-            call_llm(
-                COMPETENCE_ESTIMATION_PROMPT.format(
-                    topic=topic,
-                    confidence=confidence,
-                    evaluation_history=history
-                )
-            )
-        )
+        return _estimate_competence_llm(topic, confidence, transcript)
     except Exception:
+        inc("fallbacks_total", component="competence")
+        if COMPETENCE_MODE == "hybrid":
+            return estimate_competence_local(topic, confidence, evaluation_history)
         return {
             "estimated_competence": confidence,
             "confidence_alignment": "aligned",
@@ -1,49 +1,102 @@
-import json
-import re
-from utils.llm_client import call_llm
 from config.prompts import ANSWER_EVALUATION_PROMPT
-
-SKIP_PHRASES = [
-    "don't know",
-    "dont know",
-    "do not know",
-    "no idea",
-    "skip",
-    "not sure"
-]
-
-
-def is_skipped_answer(answer: str) -> bool:
-    if not answer or len(answer.strip()) < 15:
-        return True
-
-    ans = answer.lower()
-    return any(phrase in ans for phrase in SKIP_PHRASES)
-
-
-def safe_json_parse(text: str) -> dict:
+from core.answer_prescreen import prescreen_answer, EVALUATE, EMPTY, EVASIVE, COPY, OFF_TOPIC
+from utils.structured_output import call_structured, EVALUATION_SCHEMA
+from utils.metrics import inc, timed
+
+
+# Fixed result for skipped answers (no LLM call)
+SKIPPED_EVALUATION = {
+    "score": 1,
+    "technical_accuracy": 1,
+    "communication_clarity": 1,
+    "problem_solving": 1,
+    "strengths": "The candidate recognized their uncertainty.",
+    "weaknesses": "Did not attempt to explain the concept. Knowledge gap identified.",
+    "depth_assessment": "none"
+}
+
+# Fixed results per pre-screen label (core/answer_prescreen.py)
+SCREENED_EVALUATIONS = {
+    EMPTY: {
+        **SKIPPED_EVALUATION,
+        "strengths": "None demonstrated.",
+        "weaknesses": "No answer was given."
+    },
+    EVASIVE: SKIPPED_EVALUATION,
+    COPY: {
+        **SKIPPED_EVALUATION,
+        "strengths": "None demonstrated.",
+        "weaknesses": "Restated the question instead of answering it."
+    },
+    OFF_TOPIC: {
+        **SKIPPED_EVALUATION,
+        "strengths": "None demonstrated.",
+        "weaknesses": "The answer did not address the question."
+    }
+}
+
+FALLBACK_EVALUATION = {
+    "score": 5,
+    "technical_accuracy": 5,
+    "communication_clarity": 5,
+    "problem_solving": 5,
+    "strengths": "The candidate showed a reasonable attempt and partial understanding.",
+    "weaknesses": "Some gaps in explanation or technical depth.",
+    "depth_assessment": "surface"
+}
+
+
+def normalize_evaluation(parsed: dict, answer: str) -> dict:
+    """
+    Fills missing fields and applies the soft score correction.
     """
-    Extracts the first JSON object from LLM output safely.
+    # ---- Soft score correction (VERY IMPORTANT) ----
+    score = parsed.get("score", 5)
+
+    # If answer is mostly correct but unclear, gently boost
+    if score <= 4 and len(answer.split()) > 40:
+        score = min(score + 1, 6)
+
+    return {
+        "score": score,
+        "technical_accuracy": parsed.get("technical_accuracy", 5),
+        "communication_clarity": parsed.get("communication_clarity", 5),
+        "problem_solving": parsed.get("problem_solving", 5),
+        "strengths": parsed.get(
+            "strengths",
+            "The candidate demonstrated partial understanding."
+        ),
+        "weaknesses": parsed.get(
+            "weaknesses",
+            "Some concepts need clearer explanation."
+        ),
+        "depth_assessment": parsed.get(
+            "depth_assessment",
+            "surface"
+        )
+    }
+
+
+def screen_answer(topic, question, answer):
     """
-    match = re.search(r"\{[\s\S]*\}", text)
-    if not match:
-        raise ValueError("No JSON object found in LLM response")
-    return json.loads(match.group())
+    Fixed evaluation for trivial answers (empty, evasive, copied
+    question, off-topic), or None when the LLM has to score it.
+    """
+    label = prescreen_answer(question, answer, topic)
+    inc("answer_prescreen_total", label=label)
+    if label == EVALUATE:
+        return None
+    return dict(SCREENED_EVALUATIONS[label])
 
 
+@timed("evaluate_answer")
 def evaluate_answer(role, topic, question, answer):
     # -------------------------------
-    # Skipped / empty answer
+    # Trivial answer (local pre-screen)
     # -------------------------------
-        return {
-            "score": 1,
-            "technical_accuracy": 1,
-            "communication_clarity": 1,
-            "problem_solving": 1,
-            "strengths": "The candidate recognized their uncertainty.",
-            "weaknesses": "Did not attempt to explain the concept. Knowledge gap identified.",
-            "depth_assessment": "none"
-        }
+    screened = screen_answer(topic, question, answer)
+    if screened is not None:
+        return screened
 
     # -------------------------------
     # LLM-based evaluation
@@ -55,49 +108,14 @@ def evaluate_answer(role, topic, question, answer):
         answer=answer
     )
 
-    response = call_llm(prompt)
-
     try:
-        parsed = safe_json_parse(response)
-
-        # ---- Soft score correction (VERY IMPORTANT) ----
-        score = parsed.get("score", 5)
-
-        # If answer is mostly correct but unclear, gently boost
-        if score <= 4 and len(answer.split()) > 40:
-            score = min(score + 1, 6)
-
-        parsed["score"] = score
-
-        return {
-            "score": score,
-            "technical_accuracy": parsed.get("technical_accuracy", 5),
-            "communication_clarity": parsed.get("communication_clarity", 5),
-            "problem_solving": parsed.get("problem_solving", 5),
-            "strengths": parsed.get(
-                "strengths",
-                "The candidate demonstrated partial understanding."
-            ),
-            "weaknesses": parsed.get(
-                "weaknesses",
-                "Some concepts need clearer explanation."
-            ),
-            "depth_assessment": parsed.get(
-                "depth_assessment",
-                "surface"
-            )
-        }
+        # Validated JSON; one repair call before falling back
+        evaluation = call_structured(prompt, EVALUATION_SCHEMA, template="evaluation")
+        return normalize_evaluation(evaluation, answer)
 
     except Exception:
         # -------------------------------
         # FINAL SAFE FALLBACK
         # -------------------------------
-        return {
-            "score": 5,
-            "technical_accuracy": 5,
-            "communication_clarity": 5,
-            "problem_solving": 5,
-            "strengths": "The candidate showed a reasonable attempt and partial understanding.",
-            "weaknesses": "Some gaps in explanation or technical depth.",
-            "depth_assessment": "surface"
-        }
+        inc("fallbacks_total", component="evaluator")
+        return dict(FALLBACK_EVALUATION)
@@ -0,0 +1,277 @@
+"""
+Interview plan mode (QUESTION_MODE=plan, normal interviews).
+
+Once /start has asked the first question, ONE structured call plans
+every remaining question by phase, each with an easier and a deeper
+alternate. Each turn then picks the next question locally from the
+competence estimate's next_question_intent:
+
+    similar         -> planned question
+    easier / deeper -> that alternate
+    focused         -> planned question of a plan revised for the
+                       current weak areas (same areas), otherwise
+                       not covered
+
+When the plan cannot cover the candidate's trajectory (focused on new
+weak areas, first plan not ready yet) the turn falls back to the
+live path and the remaining questions are re-planned in the background
+with the answers and weak areas so far. Resume questions (1 and 3)
+are always live.
+
+Plans are saved to the derived store under "<session_id>:question_plan",
+like the report drafts, so every worker with a shared backend sees them.
+A plan that finishes after the interview ended is dropped.
+
+QUESTION_MODE=live (the default) keeps per-turn generation.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.structured_output import call_structured, QUESTION_PLAN_SCHEMA
+from config.prompts import QUESTION_PLAN_PROMPT
+from config.topics import MAX_QUESTIONS
+from core.question_generator import question_phase, sanitize_question
+from core.transcript import render_question_history
+from utils.metrics import inc
+
+QUESTION_MODE = os.getenv("QUESTION_MODE", "live")
+QUESTION_PLAN_WORKERS = int(os.getenv("QUESTION_PLAN_WORKERS", "4"))
+# Re-plans per interview after the first plan
+QUESTION_PLAN_MAX_REVISIONS = int(os.getenv("QUESTION_PLAN_MAX_REVISIONS", "2"))
+# Four questions with two alternates each
+QUESTION_PLAN_MAX_TOKENS = 1500
+
+# Intents served straight from a plan entry
+PLANNED_INTENTS = ("similar", "easier", "deeper")
+
+_executor = ThreadPoolExecutor(
+    max_workers=QUESTION_PLAN_WORKERS,
+    thread_name_prefix="question-plan"
+)
+
+# session_id -> Future for a plan still being generated in this worker
+_pending = {}
+# Sessions whose plan was discarded while it was still being generated
+_discarded = set()
+_pending_lock = threading.Lock()
+
+
+def plan_enabled(session: dict) -> bool:
+    return QUESTION_MODE == "plan" and session["interview_mode"] == "normal"
+
+
+def is_planned(session: dict, question_number: int) -> bool:
+    """
+    Resume questions are not planned (they ignore competence anyway).
+    """
+    if question_number > MAX_QUESTIONS:
+        return False
+    return not (session["resume_text"] and question_number in (1, 3))
+
+
+def _plan_key(session_id: str) -> str:
+    return f"{session_id}:question_plan"
+
+
+# ======================================================
+# GENERATION
+# ======================================================
+def build_plan_prompt(session: dict, first: int, competence_summary: str, focus: list) -> tuple:
+    """
+    (prompt, question numbers planned) for questions first..MAX_QUESTIONS.
+    """
+    numbers = [n for n in range(first, MAX_QUESTIONS + 1) if is_planned(session, n)]
+    prompt = QUESTION_PLAN_PROMPT.format(
+        role=session["role"],
+        topic=session["topic"],
+        candidate_type="fresher",
+        confidence=session["confidence"],
+        competence_summary=competence_summary,
+        focus=", ".join(focus) if focus else "None yet",
+        history=render_question_history(session["transcript"]),
+        current_question=session["current_question"],
+        slots="\n".join(f"Q{n} ({question_phase(n)})" for n in numbers)
+    )
+    return prompt, numbers
+
+
+def generate_plan(prompt: str, numbers: list, focus: list) -> dict:
+    """
+    {"questions": {"<n>": {"phase", "similar", "easier", "deeper"}},
+     "focus": [...]}. Raises StructuredOutputError / LLMError.
+    """
+    items = call_structured(
+        prompt,
+        QUESTION_PLAN_SCHEMA,
+        template="question_plan",
+        max_tokens=QUESTION_PLAN_MAX_TOKENS,
+        repair_max_tokens=QUESTION_PLAN_MAX_TOKENS
+    )["questions"]
+
+    questions = {}
+    for n, item in zip(numbers, items):
+        if not item.get("question", "").strip():
+            continue
+        # String keys: plans round-trip through JSON session stores
+        questions[str(n)] = {
+            "phase": question_phase(n),
+            "similar": sanitize_question(item["question"]),
+            "easier": sanitize_question(item["easier"]) if item.get("easier", "").strip() else None,
+            "deeper": sanitize_question(item["deeper"]) if item.get("deeper", "").strip() else None
+        }
+    return {"questions": questions, "focus": list(focus)}
+
+
+def _take_discarded(session_id: str) -> bool:
+    with _pending_lock:
+        if session_id in _discarded:
+            _discarded.discard(session_id)
+            return True
+        return False
+
+
+def _generate_and_save(store, session_id: str, prompt: str, numbers: list, focus: list, outcome: str):
+    try:
+        plan = generate_plan(prompt, numbers, focus)
+    except Exception as e:
+        print("Question plan error:", e)
+        inc("question_plan_total", outcome="failed")
+        _take_discarded(session_id)
+        return None
+
+    if _take_discarded(session_id):
+        inc("question_plan_total", outcome="discarded")
+        return None
+
+    try:
+        store.save(_plan_key(session_id), plan)
+        # discard_plan() may have run during the save
+        if _take_discarded(session_id):
+            store.delete(_plan_key(session_id))
+            inc("question_plan_total", outcome="discarded")
+            return None
+    except Exception as e:
+        print("Question plan save error:", e)
+    inc("question_plan_total", outcome=outcome)
+    return plan
+
+
+def _forget(session_id: str, future):
+    with _pending_lock:
+        if _pending.get(session_id) is future:
+            _pending.pop(session_id)
+
+
+def schedule_plan(
+    store,
+    session: dict,
+    first: int,
+    competence_summary: str = "Interview started",
+    focus: list = (),
+    outcome: str = "planned"
+):
+    """
+    Plans questions first..MAX_QUESTIONS in the background; returns the
+    Future, or None when nothing is left to plan. The prompt is built
+    here, so the caller may keep mutating the session.
+    """
+    prompt, numbers = build_plan_prompt(session, first, competence_summary, focus)
+    if not numbers:
+        return None
+
+    session_id = session["session_id"]
+    future = _executor.submit(
+        _generate_and_save, store, session_id, prompt, numbers, list(focus), outcome
+    )
+    with _pending_lock:
+        _pending[session_id] = future
+    # Saved to the store before it is dropped here
+    future.add_done_callback(lambda f: _forget(session_id, f))
+    return future
+
+
+def plan_pending(session: dict) -> bool:
+    with _pending_lock:
+        future = _pending.get(session["session_id"])
+    return future is not None and not future.done()
+
+
+def load_plan(store, session: dict):
+    """
+    The saved plan, or None. Turns never wait for a plan: while a
+    revision runs, the previous plan is still used.
+    """
+    try:
+        return store.get(_plan_key(session["session_id"]))
+    except Exception as e:
+        print("Question plan load error:", e)
+        return None
+
+
+def discard_plan(store, session: dict):
+    """
+    Deletes the plan; one still being generated is cancelled or, once
+    running, not saved.
+    """
+    session_id = session["session_id"]
+    with _pending_lock:
+        future = _pending.pop(session_id, None)
+        if future is not None and not future.cancel() and not future.done():
+            _discarded.add(session_id)
+    try:
+        store.delete(_plan_key(session["session_id"]))
+    except Exception as e:
+        print("Question plan delete error:", e)
+
+
+# ======================================================
+# POLICY
+# ======================================================
+def pick_question(plan: dict, session: dict, intent: str):
+    """
+    The planned question for the next turn and this intent, or None
+    when the plan does not cover it. "focused" needs a plan revised for
+    the session's current weak areas.
+    """
+    if not plan:
+        return None
+    entry = plan["questions"].get(str(len(session["qa_history"]) + 1))
+    if entry is None:
+        return None
+
+    if intent == "focused":
+        # Only a plan revised for these weak areas targets them
+        weak_areas = set(session.get("weak_areas") or [])
+        focus = set(plan.get("focus") or [])
+        question = entry["similar"] if weak_areas and weak_areas <= focus else None
+    elif intent in PLANNED_INTENTS:
+        question = entry.get(intent)
+    else:
+        question = None
+
+    asked = {qa["question"] for qa in session["qa_history"]}
+    return question if question and question not in asked else None
+
+
+def revise_plan(store, session: dict, competence: dict):
+    """
+    After a miss: re-plans the questions after the one just asked with
+    the answers, competence and weak areas so far (bounded per
+    interview). Call once session["current_question"] is set.
+    """
+    revisions = session.get("question_plan_revisions", 0)
+    if revisions >= QUESTION_PLAN_MAX_REVISIONS or plan_pending(session):
+        return None
+    future = schedule_plan(
+        store,
+        session,
+        len(session["qa_history"]) + 2,
+        competence.get("reasoning", ""),
+        competence.get("weak_areas") or [],
+        outcome="revised"
+    )
+    if future is not None:
+        session["question_plan_revisions"] = revisions + 1
+    return future
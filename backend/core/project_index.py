@@ -0,0 +1,259 @@
+import os
+import re
+import math
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.github_fetcher import (
+    repo_slug,
+    fetch_readme,
+    fetch_repo_tree,
+    fetch_files,
+    select_important_files
+)
+from utils.llm_cache import TTLCache
+from utils.prompt_budget import fit_input
+
+PROJECT_INDEX_MAX_FILES = int(os.getenv("PROJECT_INDEX_MAX_FILES", "12"))
+PROJECT_INDEX_TTL_SECONDS = int(os.getenv("PROJECT_INDEX_TTL_SECONDS", "3600"))
+PROJECT_INDEX_MAX_REPOS = int(os.getenv("PROJECT_INDEX_MAX_REPOS", "100"))
+PROJECT_SNIPPETS_TOP_K = int(os.getenv("PROJECT_SNIPPETS_TOP_K", "3"))
+
+CHUNK_LINES = 30
+TREE_LINES = 40
+
+SOURCE_EXTENSIONS = (".py", ".js", ".jsx", ".ts", ".tsx", ".java", ".go", ".rb", ".rs")
+SKIP_DIRS = ("node_modules/", "dist/", "build/", "vendor/", ".github/", "migrations/")
+
+FILE_ROLES = [
+    ("test", "tests"),
+    ("route", "api"),
+    ("controller", "api"),
+    ("api/", "api"),
+    ("model", "data model"),
+    ("schema", "data model"),
+    ("service", "service"),
+    ("view", "ui"),
+    ("component", "ui"),
+    ("pages/", "ui"),
+    ("config", "config"),
+    ("util", "helper"),
+    ("requirements.txt", "dependencies"),
+    ("package.json", "dependencies"),
+    ("app.", "entry point"),
+    ("main.", "entry point"),
+    ("server.", "entry point"),
+    ("index.", "entry point")
+]
+
+SYMBOL_RE = re.compile(
+    r"^\s*(?:async\s+)?(?:def|class|function|func|fn)\s+([A-Za-z_]\w*)"
+    r"|^\s*(?:export\s+)?(?:const|let)\s+([A-Za-z_]\w*)\s*=\s*(?:async\s*)?\(",
+    re.MULTILINE
+)
+WORD_RE = re.compile(r"[A-Za-z][a-z]*|[0-9]+")
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_indexes = TTLCache(PROJECT_INDEX_MAX_REPOS, PROJECT_INDEX_TTL_SECONDS)
+_inflight = {}
+_inflight_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="project-index")
+
+
+# ======================================================
+# INDEXING
+# ======================================================
+def tokenize(text: str) -> list:
+    """
+    Lowercased words; snake_case and camelCase identifiers are split.
+    """
+    return [w.lower() for w in WORD_RE.findall(text) if len(w) > 1]
+
+
+def file_role(path: str) -> str:
+    lower = path.lower()
+    for pattern, role in FILE_ROLES:
+        if pattern in lower:
+            return role
+    return "source"
+
+
+def select_index_files(paths: list, limit: int = PROJECT_INDEX_MAX_FILES) -> list:
+    """
+    Key files first (select_important_files), then other source files.
+    """
+    paths = [p for p in paths if not any(d in p for d in SKIP_DIRS)]
+    chosen = select_important_files(paths, limit)
+    for p in paths:
+        if len(chosen) >= limit:
+            break
+        if p.endswith(SOURCE_EXTENSIONS) and p not in chosen:
+            chosen.append(p)
+    return chosen
+
+
+def _chunks(path: str, content: str):
+    lines = content.splitlines()
+    for start in range(0, len(lines), CHUNK_LINES):
+        text = "\n".join(lines[start:start + CHUNK_LINES]).strip()
+        if text:
+            yield {"path": path, "line": start + 1, "text": text}
+
+
+def build_project_index(readme: str, tree: list, files: dict) -> dict:
+    files_info = []
+    chunks = []
+
+    for path, content in files.items():
+        symbols = [a or b for a, b in SYMBOL_RE.findall(content)]
+        files_info.append({
+            "path": path,
+            "role": file_role(path),
+            "symbols": symbols[:12]
+        })
+        for chunk in _chunks(path, content):
+            # Path words count towards the chunk so "routes" finds routes/*
+            chunk["tf"] = Counter(tokenize(chunk["text"] + " " + path))
+            chunk["length"] = sum(chunk["tf"].values())
+            chunks.append(chunk)
+
+    df = Counter()
+    for chunk in chunks:
+        df.update(chunk["tf"].keys())
+
+    n = len(chunks)
+    return {
+        "readme": readme,
+        "tree": tree,
+        "files": files_info,
+        "chunks": chunks,
+        "idf": {
+            term: math.log(1 + (n - freq + 0.5) / (freq + 0.5))
+            for term, freq in df.items()
+        },
+        "avg_length": (sum(c["length"] for c in chunks) / n) if n else 0.0
+    }
+
+
+def search(index: dict, query: str, k: int = PROJECT_SNIPPETS_TOP_K) -> list:
+    """
+    BM25 over the indexed chunks. Returns the top-k chunks (best first).
+    """
+    terms = set(tokenize(query))
+    idf = index["idf"]
+    avg_length = index["avg_length"] or 1.0
+
+    scored = []
+    for chunk in index["chunks"]:
+        score = 0.0
+        for term in terms:
+            tf = chunk["tf"].get(term)
+            if not tf:
+                continue
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * chunk["length"] / avg_length)
+            score += idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+        if score > 0:
+            scored.append((score, chunk))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [chunk for _, chunk in scored[:k]]
+
+
+def load_project_index(repo_url: str) -> dict:
+    """
+    Returns the index for a repository, building it on first use.
+    README and tree are fetched concurrently, then the selected files
+    in parallel. Indexes are kept in memory per repo.
+    """
+    slug = repo_slug(repo_url)
+    index = _indexes.get(slug)
+    if index is not None:
+        return index
+
+    # Concurrent /start requests for the same repo share one build
+    with _inflight_lock:
+        pending = _inflight.get(slug)
+        owner = pending is None
+        if owner:
+            pending = Future()
+            _inflight[slug] = pending
+
+    if not owner:
+        return pending.result()
+
+    try:
+        readme = _executor.submit(fetch_readme, repo_url)
+        tree = fetch_repo_tree(repo_url)
+        files = fetch_files(repo_url, select_index_files(tree))
+
+        index = build_project_index(readme.result(), tree, files)
+        _indexes.set(slug, index)
+        pending.set_result(index)
+    except Exception as e:
+        pending.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(slug, None)
+
+    return index
+
+
+# ======================================================
+# PROMPT CONTEXT
+# ======================================================
+def render_file_tree(index: dict) -> str:
+    lines = []
+    for info in index["files"]:
+        line = f"{info['path']} ({info['role']})"
+        if info["symbols"]:
+            line += ": " + ", ".join(info["symbols"])
+        lines.append(line)
+
+    indexed = {info["path"] for info in index["files"]}
+    others = [
+        p for p in index["tree"]
+        if p not in indexed and not any(d in p for d in SKIP_DIRS)
+    ]
+    room = TREE_LINES - len(lines)
+    lines.extend(others[:max(room, 0)])
+    if len(others) > room:
+        lines.append(f"... {len(others) - max(room, 0)} more files")
+    return "\n".join(lines)
+
+
+def render_snippets(chunks: list) -> str:
+    return "\n\n".join(
+        f"# {c['path']} (line {c['line']})\n{c['text']}"
+        for c in chunks
+    )
+
+
+def project_prompt_context(repo_url: str, qa_history: list):
+    """
+    File tree, README excerpt and the snippets most relevant to the
+    last turn (or to the README on the first question).
+    Returns None when no code could be indexed.
+    """
+    index = load_project_index(repo_url)
+    if not index["chunks"]:
+        return None
+
+    # Key README sections within the excerpt budget (cached per repo README)
+    readme = fit_input("project_code_question", "readme", index["readme"])
+
+    if qa_history:
+        last = qa_history[-1]
+        query = f"{last['question']} {last['answer']}"
+    else:
+        query = readme or "main app routes models"
+
+    return {
+        "file_tree": render_file_tree(index),
+        "readme": readme,
+        "code_snippets": render_snippets(search(index, query))
+    }
@@ -0,0 +1,240 @@
+"""
+Pre-generated question bank.
+
+Offline:  python -m core.question_bank --per-key 10
+Runtime:  draw_question(topic, phase, qa_history)
+
+The bank is a gzip-compressed JSON file mapping "topic|phase|type"
+to a list of questions. It is loaded once per process and indexed by
+(topic, phase) so a draw is a dict lookup plus a random choice.
+"""
+
+import os
+import re
+import json
+import gzip
+import time
+import random
+import argparse
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config.topics import (
+    TOPICS,
+    INTERVIEW_PHASES,
+    QUESTION_TYPES,
+    QUESTION_TYPES_BY_CATEGORY
+)
+
+QUESTION_BANK_PATH = os.getenv(
+    "QUESTION_BANK_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "question_bank.json.gz")
+)
+QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK_ENABLED", "true").lower() == "true"
+
+# The bank is built from technical question types (QUESTION_BANK_PROMPT);
+# HR / Behavioral interviews are always generated live
+BANK_ROLES = ("Technical",)
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _bank_key(topic: str, phase: str, question_type: str) -> str:
+    return f"{topic}|{phase}|{question_type}"
+
+
+def _normalize(question: str) -> str:
+    return re.sub(r"\W+", " ", question).strip().lower()
+
+
+# ======================================================
+# RUNTIME LOOKUP
+# ======================================================
+def load_bank(path: str = QUESTION_BANK_PATH) -> dict:
+    """
+    Returns {"|".join((topic, phase)): [(question_type, question), ...]}.
+    Missing or unreadable banks load as empty.
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            entries = json.load(f).get("entries", {})
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print("Question bank load error:", e)
+        return {}
+
+    index = {}
+    for key, questions in entries.items():
+        topic, phase, question_type = key.split("|")
+        index.setdefault(f"{topic}|{phase}", []).extend(
+            (question_type, q) for q in questions
+        )
+    return index
+
+
+def _get_index() -> dict:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = load_bank()
+    return _index
+
+
+def warm_up():
+    """
+    Loads and indexes the bank now instead of on the first draw.
+    """
+    _get_index()
+
+
+def draw_question(topic: str, phase: str, qa_history: list, question_type: str = None, role: str = "Technical"):
+    """
+    Random bank question for (topic, phase) not already asked in this
+    interview, or None when the bank cannot cover it (including roles
+    the bank was not built for).
+    """
+    if not QUESTION_BANK_ENABLED or role not in BANK_ROLES:
+        return None
+
+    candidates = _get_index().get(f"{topic}|{phase}")
+    if not candidates:
+        return None
+
+    asked = {_normalize(qa["question"]) for qa in qa_history}
+    asked_types = [qt for qt, q in candidates if _normalize(q) in asked]
+
+    fresh = [
+        (qt, q) for qt, q in candidates
+        if _normalize(q) not in asked
+        and (question_type is None or qt == question_type)
+    ]
+    if not fresh:
+        return None
+
+    # Prefer question types not used yet, so the interview stays varied
+    unused = [(qt, q) for qt, q in fresh if qt not in asked_types]
+    return random.choice(unused or fresh)[1]
+
+
+# ======================================================
+# OFFLINE BUILDER
+# ======================================================
+def _bank_jobs(per_key: int, existing: dict, topics: dict):
+    for category, topic_list in topics.items():
+        types = QUESTION_TYPES_BY_CATEGORY.get(category, list(QUESTION_TYPES))
+        for topic in topic_list:
+            for phase in INTERVIEW_PHASES:
+                for question_type in types:
+                    key = _bank_key(topic, phase, question_type)
+                    missing = per_key - len(existing.get(key, []))
+                    if missing > 0:
+                        yield key, topic, phase, question_type, missing
+
+
+def _generate_batch(llm, topic, phase, question_type, count, existing):
+    # Imported here so loading the bank at runtime stays light
+    from config.prompts import QUESTION_BANK_PROMPT
+    from utils.structured_output import call_structured, QUESTION_BANK_SCHEMA
+    from core.question_generator import sanitize_question
+
+    prompt = QUESTION_BANK_PROMPT.format(
+        topic=topic,
+        phase=phase,
+        question_type=QUESTION_TYPES[question_type],
+        count=count,
+        existing="\n".join(f"- {q}" for q in existing) or "- (none)"
+    )
+    questions = call_structured(prompt, QUESTION_BANK_SCHEMA, template="question_bank", llm=llm)["questions"]
+    return [sanitize_question(q) for q in questions if isinstance(q, str) and q.strip()]
+
+
+def build_question_bank(
+    path: str = QUESTION_BANK_PATH,
+    per_key: int = 10,
+    batch_size: int = 5,
+    workers: int = 4,
+    llm=None,
+    topics: dict = TOPICS
+) -> dict:
+    """
+    Fills the bank up to per_key questions per (topic, phase, type).
+    Existing entries are kept, so an interrupted build can be re-run.
+    llm is any callable prompt -> text (defaults to call_llm).
+    """
+    if llm is None:
+        from utils.llm_client import call_llm
+        llm = functools.partial(call_llm, template="question_bank", json_mode=True)
+
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            entries = json.load(f).get("entries", {})
+    except FileNotFoundError:
+        entries = {}
+
+    jobs = list(_bank_jobs(per_key, entries, topics))
+    print(f"Question bank: {len(jobs)} keys to fill")
+
+    def fill(job):
+        key, topic, phase, question_type, missing = job
+        questions = list(entries.get(key, []))
+        seen = {_normalize(q) for q in questions}
+        attempts = 0
+        while len(questions) < per_key and attempts < 3:
+            attempts += 1
+            batch = _generate_batch(
+                llm, topic, phase, question_type,
+                min(batch_size, per_key - len(questions)),
+                questions
+            )
+            for q in batch:
+                if _normalize(q) not in seen:
+                    seen.add(_normalize(q))
+                    questions.append(q)
+        return key, questions[:per_key]
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fill, job) for job in jobs]
+        for future in as_completed(futures):
+            try:
+                key, questions = future.result()
+                entries[key] = questions
+            except Exception as e:
+                print("Question bank batch error:", e)
+            done += 1
+            if done % 10 == 0 or done == len(jobs):
+                print(f"  {done}/{len(jobs)} keys")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(
+            {"version": 1, "built_at": int(time.time()), "entries": entries},
+            f,
+            separators=(",", ":"),
+            ensure_ascii=False
+        )
+    os.replace(tmp_path, path)
+
+    global _index
+    _index = None
+    return entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate the interview question bank")
+    parser.add_argument("--path", default=QUESTION_BANK_PATH)
+    parser.add_argument("--per-key", type=int, default=10, help="questions per (topic, phase, type)")
+    parser.add_argument("--batch-size", type=int, default=5, help="questions requested per LLM call")
+    parser.add_argument("--workers", type=int, default=4, help="parallel LLM calls")
+    args = parser.parse_args()
+
+    build_question_bank(
+        path=args.path,
+        per_key=args.per_key,
+        batch_size=args.batch_size,
+        workers=args.workers
+    )
@@ -0,0 +1,128 @@
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.llm_cache import TTLCache, cache_key
+from utils.metrics import register_collector
+
+# off   -> always call the LLM
+# exact -> reuse a question generated for identical (normalized) inputs
+# pool  -> warm-up questions are drawn at random from a per-topic pool
+QUESTION_CACHE_MODE = os.getenv("QUESTION_CACHE_MODE", "pool")
+QUESTION_CACHE_TTL_SECONDS = int(os.getenv("QUESTION_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+QUESTION_CACHE_MAX_ENTRIES = int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", "2000"))
+QUESTION_POOL_SIZE = int(os.getenv("QUESTION_POOL_SIZE", "8"))
+# Pools smaller than this are still filled on the request path
+QUESTION_POOL_MIN = int(os.getenv("QUESTION_POOL_MIN", "3"))
+
+_exact = TTLCache(QUESTION_CACHE_MAX_ENTRIES, QUESTION_CACHE_TTL_SECONDS)
+_pools = TTLCache(QUESTION_CACHE_MAX_ENTRIES, QUESTION_CACHE_TTL_SECONDS)
+
+_refill_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="question-pool")
+_refilling = set()
+_pool_lock = threading.Lock()
+
+_counters = {"pool_served": 0, "pool_generated": 0, "pool_refills": 0}
+
+
+def _confidence_bucket(confidence) -> str:
+    confidence = int(confidence or 0)
+    if confidence <= 3:
+        return "low"
+    if confidence <= 7:
+        return "medium"
+    return "high"
+
+
+def _add_to_pool(key: str, question: str):
+    with _pool_lock:
+        pool = list(_pools.get(key, record=False) or [])
+        if question not in pool:
+            pool.append(question)
+        _pools.set(key, pool[-QUESTION_POOL_SIZE:])
+
+
+def _refill(key: str, generate):
+    try:
+        question = generate()
+        if question:
+            _add_to_pool(key, question)
+            _counters["pool_refills"] += 1
+    finally:
+        with _pool_lock:
+            _refilling.discard(key)
+
+
+def _schedule_refill(key: str, generate):
+    with _pool_lock:
+        if key in _refilling:
+            return
+        _refilling.add(key)
+    _refill_executor.submit(_refill, key, generate)
+
+
+def cached_question(inputs: dict, qa_history: list, generate):
+    """
+    Returns a question for warm-up prompt inputs, calling generate()
+    (which returns a question or None on LLM failure) only on a miss.
+
+    inputs: role, topic, phase, candidate_type, confidence,
+            competence_summary, history
+    """
+    if QUESTION_CACHE_MODE == "exact":
+        key = cache_key("question", **inputs)
+        question = _exact.get(key)
+        if question is None:
+            question = generate()
+            if question:
+                _exact.set(key, question)
+        return question
+
+    if QUESTION_CACHE_MODE == "pool":
+        key = cache_key(
+            "question_pool",
+            role=inputs["role"],
+            topic=inputs["topic"],
+            phase=inputs["phase"],
+            candidate_type=inputs["candidate_type"],
+            confidence=_confidence_bucket(inputs["confidence"])
+        )
+        pool = _pools.get(key) or []
+        asked = {qa["question"] for qa in qa_history}
+        candidates = [q for q in pool if q not in asked]
+
+        if len(pool) >= QUESTION_POOL_MIN and candidates:
+            if len(pool) < QUESTION_POOL_SIZE:
+                _schedule_refill(key, generate)
+            _counters["pool_served"] += 1
+            return random.choice(candidates)
+
+        question = generate()
+        if question:
+            _add_to_pool(key, question)
+            _counters["pool_generated"] += 1
+        return question
+
+    return generate()
+
+
+def question_cache_stats() -> dict:
+    return {
+        "mode": QUESTION_CACHE_MODE,
+        "exact": _exact.stats(),
+        "pool": {**_pools.stats(), **_counters}
+    }
+
+
+def _collect_metrics():
+    for cache_name, cache in (("exact", _exact), ("pool", _pools)):
+        stats = cache.stats()
+        yield "question_cache_entries", "gauge", {"cache": cache_name}, stats["entries"]
+        for outcome in ("hits", "misses", "evictions", "expirations"):
+            yield "question_cache_total", "counter", {"cache": cache_name, "outcome": outcome}, stats[outcome]
+    for outcome, value in _counters.items():
+        yield "question_cache_total", "counter", {"cache": "pool", "outcome": outcome}, value
+
+
+register_collector(_collect_metrics)
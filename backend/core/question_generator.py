@@ -1,9 +1,31 @@
-from utils.llm_client import call_llm
+from utils.llm_client import call_llm, stream_llm, LLMError
 from config.prompts import (
     QUESTION_GENERATION_PROMPT,
     RESUME_QUESTION_PROMPT,
-    PROJECT_INTERVIEW_PROMPT
+    PROJECT_INTERVIEW_PROMPT,
+    PROJECT_CODE_INTERVIEW_PROMPT
 )
+from config.topics import INTERVIEW_PHASES, MAX_QUESTIONS
+from core.question_cache import cached_question
+from core.question_bank import draw_question
+from core.project_index import project_prompt_context
+from utils.metrics import inc, timed, timed_stream
+from utils.prompt_budget import fit_input
+from core.transcript import render_question_history, transcript_from_history
+
+WARMUP_PHASE = INTERVIEW_PHASES[0]
+
+# Intents that need a question adapted to the last answer (never from the bank)
+ADAPTIVE_INTENTS = ("deeper", "focused")
+
+
+def question_phase(question_number: int, max_questions: int = MAX_QUESTIONS) -> str:
+    # First 40% warm-up, next 40% intermediate, rest advanced (2 / 2 / 1 for 5)
+    if question_number <= round(max_questions * 0.4):
+        return INTERVIEW_PHASES[0]
+    if question_number <= round(max_questions * 0.8):
+        return INTERVIEW_PHASES[1]
+    return INTERVIEW_PHASES[2]
 
 
 def sanitize_question(text: str) -> str:
@@ -60,7 +82,143 @@ def sanitize_question(text: str) -> str:
     return final_text
 
 
+def ask_llm_question(prompt: str) -> str:
+    """
+    Calls the LLM for a question, falling back to a generic
+    question instead of surfacing provider errors to the candidate.
+    """
+    try:
+        raw = call_llm(prompt, template="question")
+    except LLMError as e:
+        print("Question generation error:", e)
+        inc("fallbacks_total", component="question")
+        raw = ""
+    return sanitize_question(raw)
+
+
+def _cacheable_llm_question(prompt: str):
+    """
+    Like ask_llm_question, but returns None on LLM failure so the
+    generic fallback question never ends up in the question cache.
+    """
+    try:
+        return sanitize_question(call_llm(prompt, template="question"))
+    except LLMError as e:
+        print("Question generation error:", e)
+        return None
+
+
+class QuestionStreamSanitizer:
+    """
+    Incremental counterpart of sanitize_question for streamed tokens.
+    - feed() returns display-safe text as soon as it arrives
+      (list numbering stripped, prose lines joined)
+    - once a code fence appears, text passes through untouched
+    - finish() returns the authoritative sanitize_question() result
+    """
+
+    def __init__(self):
+        self.raw = []
+        self.code_mode = False
+        self.at_line_start = True
+        self.pending_space = False
+        self.emitted = False
+
+    def feed(self, delta: str) -> str:
+        self.raw.append(delta)
+        out = []
+
+        for ch in delta:
+            if self.code_mode:
+                out.append(ch)
+                continue
+
+            if ch == "\n":
+                self.at_line_start = True
+                self.pending_space = self.emitted
+                continue
+
+            if self.at_line_start:
+                if ch in "0123456789.-) \t":
+                    continue
+                self.at_line_start = False
+                if self.pending_space:
+                    out.append(" ")
+                    self.pending_space = False
+
+            out.append(ch)
+            self.emitted = True
+
+        if not self.code_mode and "```" in "".join(self.raw):
+            self.code_mode = True
+
+        return "".join(out)
+
+    def finish(self) -> str:
+        return sanitize_question("".join(self.raw))
+
+
+def stream_llm_question(prompt: str):
+    """
+    Streams a question as ("token", text) events followed by a final
+    ("question", sanitized_text) event. Falls back like ask_llm_question.
+    """
+    sanitizer = QuestionStreamSanitizer()
+    try:
+        for delta in stream_llm(prompt, template="question"):
+            text = sanitizer.feed(delta)
+            if text:
+                yield "token", text
+    except LLMError as e:
+        print("Question generation error:", e)
+        inc("fallbacks_total", component="question")
+    yield "question", sanitizer.finish()
+
+
+def _bank_question(
+    question_intent: str,
+    role: str,
+    topic: str,
+    qa_history: list,
+    interview_mode: str = "normal",
+    project_readme: str = "",
+    resume_text: str = "",
+    **_
+):
+    """
+    Draws a topic question from the pre-generated bank, or returns None
+    for project / resume questions, adaptive follow-ups and non-technical
+    roles.
+    """
+    question_number = len(qa_history) + 1
+
+    if question_intent in ADAPTIVE_INTENTS:
+        return None
+    if interview_mode == "project" and project_readme:
+        return None
+    if resume_text and question_number in (1, 3):
+        return None
+
+    phase_index = INTERVIEW_PHASES.index(question_phase(question_number))
+    if question_intent == "easier":
+        phase_index = max(0, phase_index - 1)
+
+    return draw_question(topic, INTERVIEW_PHASES[phase_index], qa_history, role=role)
+
 
+def _cached_topic_question(prompt: str, cache_inputs: dict, qa_history: list) -> str:
+    question = cached_question(
+        cache_inputs,
+        qa_history,
+        lambda: _cacheable_llm_question(prompt)
+    )
+    if not question:
+        inc("fallbacks_total", component="question")
+        return sanitize_question("")
+    return question
+
+
+@timed("generate_next_question")
 def generate_next_question(
     role: str,
     topic: str,
@@ -71,52 +229,130 @@ def generate_next_question(
     interview_mode: str = "normal",
     project_readme: str = "",
     project_name: str = "",
-    resume_text: str = ""
+    resume_text: str = "",
+    question_intent: str = "similar",
+    transcript: dict = None,
+    project_url: str = ""
 ) -> str:
+    kwargs = dict(
+        role=role,
+        topic=topic,
+        confidence=confidence,
+        competence_summary=competence_summary,
+        qa_history=qa_history,
+        is_fresher=is_fresher,
+        interview_mode=interview_mode,
+        project_readme=project_readme,
+        project_name=project_name,
+        resume_text=resume_text,
+        transcript=transcript,
+        project_url=project_url
+    )
+
+    # 1. Question bank (sub-millisecond lookup)
+    question = _bank_question(question_intent, **kwargs)
+    if question:
+        return question
+
+    # 2. Warm-up question cache / pool
+    prompt, cache_inputs = build_question_prompt(**kwargs)
+    if cache_inputs:
+        return _cached_topic_question(prompt, cache_inputs, qa_history)
+
+    # 3. Live generation
+    return ask_llm_question(prompt)
+
+
+@timed_stream("generate_next_question")
+def stream_next_question(question_intent: str = "similar", **kwargs):
+    """
+    Streaming variant of generate_next_question (same keyword arguments).
+    Bank and cached questions are served whole as a single token.
+    """
+    question = _bank_question(question_intent, **kwargs)
+
+    if question is None:
+        prompt, cache_inputs = build_question_prompt(**kwargs)
+        if not cache_inputs:
+            yield from stream_llm_question(prompt)
+            return
+        question = _cached_topic_question(prompt, cache_inputs, kwargs["qa_history"])
+
+    yield "token", question
+    yield "question", question
+
+
+def build_question_prompt(
+    role: str,
+    topic: str,
+    confidence: int,
+    competence_summary: str,
+    qa_history: list,
+    is_fresher: bool,
+    interview_mode: str = "normal",
+    project_readme: str = "",
+    project_name: str = "",
+    resume_text: str = "",
+    transcript: dict = None,
+    project_url: str = ""
+) -> tuple:
+    """
+    Returns (prompt, cache_inputs).
+    History comes from the session transcript (windowed, rendered once
+    per turn); without one it is rendered from qa_history.
+    cache_inputs is None unless the question may be served from the
+    question cache (topic questions in the warm-up phase).
+    """
 
     question_number = len(qa_history) + 1
 
     # ---------------- PHASE ----------------
-    if question_number <= 2:
-        phase = "basic warm-up"
-    elif question_number <= 4:
-        phase = "intermediate"
-    else:
-        phase = "advanced probing"
+    phase = question_phase(question_number)
 
     # ---------------- HISTORY ----------------
-    history = "No previous questions."
-    if qa_history:
-        history = ""
-        for i, qa in enumerate(qa_history, start=1):
-            history += f"Q{i}: {qa['question']}\nA{i}: {qa['answer']}\n\n"
+    if transcript is None:
+        transcript = transcript_from_history(qa_history)
+    history = render_question_history(transcript)
 
     # ==================================================
     # PROJECT INTERVIEW (TOP PRIORITY)
     # ==================================================
     if interview_mode == "project" and project_readme:
-        prompt = PROJECT_INTERVIEW_PROMPT.format(
+        context = None
+        if project_url:
+            try:
+                context = project_prompt_context(project_url, qa_history)
+            except Exception as e:
+                print("Project index error:", e)
+                inc("fallbacks_total", component="project_index")
+
+        if context:
+            return PROJECT_CODE_INTERVIEW_PROMPT.format(
+                project_name=project_name,
+                phase=phase,
+                history=history,
+                **context
+            ), None
+
+        return PROJECT_INTERVIEW_PROMPT.format(
             project_name=project_name,
-            readme=project_readme
-        )
-        raw = call_llm(prompt)
-        return sanitize_question(raw)
+            readme=fit_input("project_question", "readme", project_readme),
+            history=history
+        ), None
 
     # ==================================================
     # RESUME-BASED QUESTION
     # ==================================================
     if resume_text and question_number in (1, 3):
-        prompt = RESUME_QUESTION_PROMPT.format(
-            resume_text=resume_text,
+        return RESUME_QUESTION_PROMPT.format(
+            resume_text=fit_input("resume_question", "resume_text", resume_text),
             history=history
-        )
-        raw = call_llm(prompt)
-        return sanitize_question(raw)
+        ), None
 
     # ==================================================
     # NORMAL TOPIC QUESTION
     # ==================================================
-    prompt = QUESTION_GENERATION_PROMPT.format(
+    inputs = dict(
         role=role,
         topic=topic,
         candidate_type="fresher" if is_fresher else "experienced",
@@ -125,6 +361,6 @@ def generate_next_question(
         competence_summary=competence_summary,
         history=history
     )
+    prompt = QUESTION_GENERATION_PROMPT.format(**inputs)
 
-    raw = call_llm(prompt)
-    return sanitize_question(raw)
+    return prompt, (inputs if phase == WARMUP_PHASE else None)
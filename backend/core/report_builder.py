@@ -0,0 +1,284 @@
+"""
+Incremental final report (REPORT_MODE=incremental, the default).
+
+Each question's review section is drafted in the background as soon as
+its answer is evaluated, while the candidate types the next answer.
+The last turn then only waits for the synthesis (score, verdict,
+summary, next steps) and the last answer's section, which run in
+parallel, and stitches in the drafted sections as "6. Question-wise
+Review".
+
+Drafts are saved to the derived store (utils.session_store.
+create_derived_store) under "<session_id>:report_section:<n>", so they
+survive the request that scheduled them and are visible to other
+workers with a shared backend, without counting against the sessions.
+A missing draft is simply written at the end.
+
+REPORT_MODE=single keeps the one-call FINAL_REPORT_PROMPT report.
+"""
+
+import os
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.llm_client import call_llm, stream_llm, LLMError
+from config.prompts import REPORT_SECTION_PROMPT, REPORT_SYNTHESIS_PROMPT
+from core.report_generator import ReportCompletenessTracker, is_report_complete, _continuation_prompt
+from core.transcript import REPORT_ANSWER_CHAR_LIMIT
+from utils.metrics import inc, span, timed, timed_stream
+
+REPORT_MODE = os.getenv("REPORT_MODE", "incremental")
+REPORT_SECTION_WORKERS = int(os.getenv("REPORT_SECTION_WORKERS", "4"))
+# Sections are short; a bounded answer keeps the draft cheap
+REPORT_SECTION_MAX_TOKENS = 300
+
+REVIEW_HEADING = "6. Question-wise Review"
+
+_executor = ThreadPoolExecutor(
+    max_workers=REPORT_SECTION_WORKERS,
+    thread_name_prefix="report-section"
+)
+
+# (session_id, n) -> Future for drafts still running in this worker
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def incremental_enabled() -> bool:
+    return REPORT_MODE == "incremental"
+
+
+def _section_key(session_id: str, n: int) -> str:
+    return f"{session_id}:report_section:{n}"
+
+
+# ======================================================
+# PER-QUESTION SECTIONS
+# ======================================================
+def _fallback_bullets(evaluation: dict) -> str:
+    return (
+        f"- What went well: {evaluation.get('strengths') or 'N/A'}\n"
+        f"- Needs improvement: {evaluation.get('weaknesses') or 'N/A'}"
+    )
+
+
+def draft_section(role, topic, n, question, answer, evaluation) -> str:
+    """
+    One "Q<n>." review entry. The question and answer are copied
+    verbatim; only the evaluation bullets come from the LLM.
+    """
+    if len(answer) > REPORT_ANSWER_CHAR_LIMIT:
+        answer = answer[:REPORT_ANSWER_CHAR_LIMIT].rstrip() + " [...]"
+
+    try:
+        with span("report_section"):
+            bullets = call_llm(
+                REPORT_SECTION_PROMPT.format(
+                    role=role,
+                    topic=topic,
+                    question=question,
+                    answer=answer,
+                    score=evaluation.get("score", 0),
+                    strengths=evaluation.get("strengths", ""),
+                    weaknesses=evaluation.get("weaknesses", "")
+                ),
+                temperature=0.4,
+                max_tokens=REPORT_SECTION_MAX_TOKENS,
+                template="report_section"
+            ).strip()
+    except LLMError as e:
+        print("Report section error:", e)
+        inc("fallbacks_total", component="report_section")
+        bullets = _fallback_bullets(evaluation)
+
+    return (
+        f"Q{n}. Question:\n{question}\n\n"
+        f"Candidate Answer:\n{answer}\n\n"
+        f"Evaluation:\n{bullets or _fallback_bullets(evaluation)}"
+    )
+
+
+def _draft_and_save(store, session_id, role, topic, n, question, answer, evaluation) -> str:
+    text = draft_section(role, topic, n, question, answer, evaluation)
+    try:
+        store.save(_section_key(session_id, n), {"text": text})
+    except Exception as e:
+        print("Report section save error:", e)
+    return text
+
+
+def _forget(key):
+    with _pending_lock:
+        _pending.pop(key, None)
+
+
+def schedule_section(store, session: dict, n: int, question: str, answer: str, evaluation: dict):
+    """
+    Starts drafting section n in the background; returns immediately.
+    """
+    key = (session["session_id"], n)
+    future = _executor.submit(
+        _draft_and_save,
+        store,
+        session["session_id"],
+        session["role"],
+        session["topic"],
+        n,
+        question,
+        answer,
+        evaluation
+    )
+    with _pending_lock:
+        _pending[key] = future
+    # Saved to the store before it is dropped here, so no draft is lost
+    future.add_done_callback(lambda _: _forget(key))
+    return future
+
+
+def collect_sections(store, session: dict) -> list:
+    """
+    Every section in order: a running draft is awaited, a saved one is
+    reused and a missing one is written now.
+    """
+    session_id = session["session_id"]
+    sections = []
+    for n, (qa, evaluation) in enumerate(
+        zip(session["qa_history"], session["evaluation_history"]), 1
+    ):
+        with _pending_lock:
+            future = _pending.get((session_id, n))
+        if future is not None:
+            sections.append(future.result())
+            inc("report_sections_total", outcome="awaited")
+            continue
+
+        saved = store.get(_section_key(session_id, n)) if store is not None else None
+        if saved and saved.get("text"):
+            sections.append(saved["text"])
+            inc("report_sections_total", outcome="drafted")
+            continue
+
+        sections.append(draft_section(
+            session["role"], session["topic"], n,
+            qa["question"], qa["answer"], evaluation
+        ))
+        inc("report_sections_total", outcome="late")
+    return sections
+
+
+def discard_sections(store, session: dict):
+    if store is None:
+        return
+    for n in range(1, len(session["evaluation_history"]) + 1):
+        try:
+            store.delete(_section_key(session["session_id"], n))
+        except Exception as e:
+            print("Report section delete error:", e)
+
+
+# ======================================================
+# SYNTHESIS
+# ======================================================
+def build_synthesis_prompt(session: dict, estimated_competence) -> str:
+    results = "\n".join(
+        f"Q{n} (score {evaluation.get('score', 0)}/10): {qa['question']}\n"
+        f"  Strengths: {evaluation.get('strengths', '')}\n"
+        f"  Weaknesses: {evaluation.get('weaknesses', '')}"
+        for n, (qa, evaluation) in enumerate(
+            zip(session["qa_history"], session["evaluation_history"]), 1
+        )
+    )
+    return REPORT_SYNTHESIS_PROMPT.format(
+        candidate_name=session["name"],
+        date=datetime.now().strftime("%d %b %Y"),
+        role=session["role"],
+        topic=session["topic"],
+        confidence=session["confidence"],
+        estimated_competence=estimated_competence,
+        results=results
+    )
+
+
+def _synthesize(prompt: str) -> str:
+    synthesis = call_llm(prompt, template="report_synthesis")
+
+    if not is_report_complete(synthesis):
+        try:
+            continuation = call_llm(
+                _continuation_prompt(synthesis),
+                temperature=0.4,
+                max_tokens=1024,
+                template="report_continuation"
+            )
+            synthesis = synthesis.rstrip() + "\n\n" + continuation.lstrip()
+        except LLMError as e:
+            print("Report continuation error:", e)
+            inc("fallbacks_total", component="report_continuation")
+
+    return synthesis
+
+
+def assemble_report(synthesis: str, sections: list) -> str:
+    """
+    Places the question-wise review before "7." (or at the end).
+    """
+    review = REVIEW_HEADING + "\n" + "\n\n".join(sections)
+    lines = synthesis.strip().split("\n")
+    for i, line in enumerate(lines):
+        if line.lstrip("#* ").startswith("7."):
+            before = "\n".join(lines[:i]).rstrip()
+            after = "\n".join(lines[i:])
+            return f"{before}\n\n{review}\n\n{after}"
+    return f"{synthesis.strip()}\n\n{review}"
+
+
+@timed("generate_final_report")
+def build_final_report(store, session: dict, estimated_competence) -> str:
+    """
+    The last section is already drafting in the background while the
+    synthesis runs. LLMError from the synthesis propagates like
+    generate_final_report.
+    """
+    synthesis = _synthesize(build_synthesis_prompt(session, estimated_competence))
+    report = assemble_report(synthesis, collect_sections(store, session))
+    discard_sections(store, session)
+    return report
+
+
+@timed_stream("generate_final_report")
+def stream_final_report_incremental(store, session: dict, estimated_competence):
+    """
+    Streaming variant: ("report_token", text) for the synthesis as it
+    is generated, then ("report", full_text) with the review stitched in.
+    """
+    prompt = build_synthesis_prompt(session, estimated_competence)
+
+    tracker = ReportCompletenessTracker()
+    parts = []
+    for delta in stream_llm(prompt, template="report_synthesis"):
+        tracker.feed(delta)
+        parts.append(delta)
+        yield "report_token", delta
+
+    if not tracker.complete:
+        synthesis = "".join(parts).rstrip()
+        parts = [synthesis, "\n\n"]
+        yield "report_token", "\n\n"
+        try:
+            for delta in stream_llm(
+                _continuation_prompt(synthesis),
+                temperature=0.4,
+                max_tokens=1024,
+                template="report_continuation"
+            ):
+                parts.append(delta)
+                yield "report_token", delta
+        except LLMError as e:
+            print("Report continuation error:", e)
+            inc("fallbacks_total", component="report_continuation")
+
+    # Drafts kept running in the background while the synthesis streamed
+    report = assemble_report("".join(parts), collect_sections(store, session))
+    discard_sections(store, session)
+    yield "report", report
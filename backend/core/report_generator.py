@@ -1,24 +1,54 @@
 from datetime import datetime
-from utils.llm_client import call_llm
+from utils.llm_client import call_llm, stream_llm, LLMError
 from config.prompts import FINAL_REPORT_PROMPT
+from core.transcript import render_report_history, transcript_from_history
+from utils.metrics import inc, timed, timed_stream
 
+# Headings FINAL_REPORT_PROMPT asks for at the start and end of the report
+REPORT_REQUIRED_SECTIONS = ("Final Score", "Actionable Next Steps")
 
-def generate_final_report(
+
+def is_report_complete(report: str) -> bool:
+    return all(section in report for section in REPORT_REQUIRED_SECTIONS)
+
+
+class ReportCompletenessTracker:
+    """
+    Incremental is_report_complete() over a token stream.
+    Only keeps a short tail so section names split across chunks are found.
+    """
+
+    def __init__(self):
+        self.seen = set()
+        self.tail = ""
+        self.keep = max(len(s) for s in REPORT_REQUIRED_SECTIONS) - 1
+
+    def feed(self, delta: str):
+        window = self.tail + delta
+        for section in REPORT_REQUIRED_SECTIONS:
+            if section in window:
+                self.seen.add(section)
+        self.tail = window[-self.keep:]
+
+    @property
+    def complete(self) -> bool:
+        return len(self.seen) == len(REPORT_REQUIRED_SECTIONS)
+
+
+def build_report_prompt(
     role,
     topic,
     confidence,
     estimated_competence,
     qa_history,
-    candidate_name
+    candidate_name,
+    transcript=None
 ):
-    history = ""
-    for i, qa in enumerate(qa_history, 1):
-        history += (
-            f"Q{i}: {qa['question']}\n"
-            f"Candidate Answer:\n{qa['answer']}\n\n"
-        )
-
-    prompt = FINAL_REPORT_PROMPT.format(
+    if transcript is None:
+        transcript = transcript_from_history(qa_history)
+    history = render_report_history(transcript)
+
+    return FINAL_REPORT_PROMPT.format(
         candidate_name=candidate_name,
         date=datetime.now().strftime("%d %b %Y"),
         role=role,
@@ -28,24 +58,105 @@ def generate_final_report(
         history=history
     )
 
+
+def _continuation_prompt(report: str) -> str:
+    return (
+        "Continue the SAME interview report EXACTLY from where it stopped.\n"
+        "Do NOT repeat previous sections.\n\n"
+        f"Partial report so far:\n{report}\n\n"
+        "Continue now:"
+    )
+
+
+@timed("generate_final_report")
+def generate_final_report(
+    role,
+    topic,
+    confidence,
+    estimated_competence,
+    qa_history,
+    candidate_name,
+    transcript=None
+):
+    prompt = build_report_prompt(
+        role,
+        topic,
+        confidence,
+        estimated_competence,
+        qa_history,
+        candidate_name,
+        transcript
+    )
+
     # First attempt
-    report = call_llm(prompt)
+    report = call_llm(prompt, template="report")
 
     # 🔥 SAFETY NET: detect incomplete report
-    if "Actionable Recommendations" not in report or "Final Score" not in report:
-        continuation_prompt = (
-            "Continue the SAME interview report EXACTLY from where it stopped.\n"
-            "Do NOT repeat previous sections.\n\n"
-            f"Partial report so far:\n{report}\n\n"
-            "Continue now:"
-        )
-
-        continuation = call_llm(
-            continuation_prompt,
-            temperature=0.4,
-            max_tokens=1024
-        )
-
-        report = report.rstrip() + "\n\n" + continuation.lstrip()
+    if not is_report_complete(report):
+        try:
+            continuation = call_llm(
+                _continuation_prompt(report),
+                temperature=0.4,
+                max_tokens=1024,
+                template="report_continuation"
+            )
+            report = report.rstrip() + "\n\n" + continuation.lstrip()
+        except LLMError as e:
+            # A partial report is still better than none
+            print("Report continuation error:", e)
+            inc("fallbacks_total", component="report_continuation")
 
     return report
+
+
+@timed_stream("generate_final_report")
+def stream_final_report(
+    role,
+    topic,
+    confidence,
+    estimated_competence,
+    qa_history,
+    candidate_name,
+    transcript=None
+):
+    """
+    Streaming variant of generate_final_report.
+    Yields ("report_token", text) events and a final ("report", full_text).
+    The completeness check runs on the stream, so the continuation call
+    starts as soon as the first completion ends.
+    """
+    prompt = build_report_prompt(
+        role,
+        topic,
+        confidence,
+        estimated_competence,
+        qa_history,
+        candidate_name,
+        transcript
+    )
+
+    tracker = ReportCompletenessTracker()
+    parts = []
+    for delta in stream_llm(prompt, template="report"):
+        tracker.feed(delta)
+        parts.append(delta)
+        yield "report_token", delta
+
+    if not tracker.complete:
+        report = "".join(parts).rstrip()
+        parts = [report, "\n\n"]
+        yield "report_token", "\n\n"
+        try:
+            for delta in stream_llm(
+                _continuation_prompt(report),
+                temperature=0.4,
+                max_tokens=1024,
+                template="report_continuation"
+            ):
+                parts.append(delta)
+                yield "report_token", delta
+        except LLMError as e:
+            print("Report continuation error:", e)
+            inc("fallbacks_total", component="report_continuation")
+
+    yield "report", "".join(parts).strip()
@@ -0,0 +1,143 @@
+import os
+
+from utils.prompt_budget import approx_tokens
+
+# Turns kept verbatim in question / competence prompts; older turns
+# are folded (once) into a one-line-per-turn rolling summary.
+TRANSCRIPT_KEEP_LAST = int(os.getenv("TRANSCRIPT_KEEP_LAST", "3"))
+PROMPT_HISTORY_TOKEN_BUDGET = int(os.getenv("PROMPT_HISTORY_TOKEN_BUDGET", "1200"))
+
+# The report reviews every question, so answers are capped instead
+REPORT_ANSWER_CHAR_LIMIT = int(os.getenv("REPORT_ANSWER_CHAR_LIMIT", "1500"))
+
+SUMMARY_QUESTION_CHARS = 90
+
+
+def new_transcript() -> dict:
+    """
+    Plain-dict transcript stored on the session (serializable).
+    Every turn is rendered exactly once, when it is appended.
+    """
+    return {
+        "qa": [],          # "Q{i}: ...\nA{i}: ...\n\n" for question prompts
+        "report": [],      # "Q{i}: ...\nCandidate Answer:\n...\n\n" for the report
+        "evaluations": [], # "Score:.. Strengths:.. Weaknesses:..\n" for competence
+        "scores": [],
+        "summary": [],     # one line per folded turn
+        "folded": 0        # turns already folded into summary
+    }
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def append_answer(transcript: dict, question: str, answer: str):
+    i = len(transcript["qa"]) + 1
+    transcript["qa"].append(f"Q{i}: {question}\nA{i}: {answer}\n\n")
+
+    if len(answer) > REPORT_ANSWER_CHAR_LIMIT:
+        answer = answer[:REPORT_ANSWER_CHAR_LIMIT].rstrip() + " [...]"
+    transcript["report"].append(f"Q{i}: {question}\nCandidate Answer:\n{answer}\n\n")
+
+
+def append_evaluation(transcript: dict, evaluation: dict):
+    transcript["evaluations"].append(
+        f"Score:{evaluation['score']} "
+        f"Strengths:{evaluation['strengths']} "
+        f"Weaknesses:{evaluation['weaknesses']}\n"
+    )
+    transcript["scores"].append(evaluation["score"])
+
+
+def _fold(transcript: dict, upto: int):
+    """
+    Moves turns [folded, upto) into the rolling summary. Each turn is folded once.
+    """
+    for i in range(transcript["folded"], upto):
+        question = transcript["qa"][i].split("\n", 1)[0].split(": ", 1)[-1]
+        score = (
+            f"score {transcript['scores'][i]}/10"
+            if i < len(transcript["scores"]) else "not scored"
+        )
+        transcript["summary"].append(
+            f"Q{i + 1} ({score}): {_clip(question, SUMMARY_QUESTION_CHARS)}"
+        )
+    transcript["folded"] = max(transcript["folded"], upto)
+
+
+def _window(
+    transcript: dict,
+    entries: list,
+    keep_last: int,
+    budget_tokens: int
+) -> tuple:
+    """
+    Picks how many recent entries stay verbatim: at most keep_last,
+    fewer if they do not fit the token budget (but always at least one).
+    Returns (summary_lines, verbatim_entries).
+    """
+    keep = min(keep_last, len(entries))
+    while keep > 1 and approx_tokens("".join(entries[-keep:])) > budget_tokens:
+        keep -= 1
+
+    _fold(transcript, len(entries) - keep)
+    summary = transcript["summary"][:len(entries) - keep]
+    return summary, entries[len(entries) - keep:]
+
+
+def render_question_history(
+    transcript: dict,
+    keep_last: int = TRANSCRIPT_KEEP_LAST,
+    budget_tokens: int = PROMPT_HISTORY_TOKEN_BUDGET
+) -> str:
+    if not transcript["qa"]:
+        return "No previous questions."
+
+    summary, recent = _window(transcript, transcript["qa"], keep_last, budget_tokens)
+
+    history = ""
+    if summary:
+        history = "Earlier questions (summary):\n" + "\n".join(summary) + "\n\n"
+    return history + "".join(recent)
+
+
+def render_evaluation_history(
+    transcript: dict,
+    keep_last: int = TRANSCRIPT_KEEP_LAST,
+    budget_tokens: int = PROMPT_HISTORY_TOKEN_BUDGET
+) -> str:
+    entries = transcript["evaluations"]
+    if not entries:
+        return ""
+
+    keep = min(keep_last, len(entries))
+    while keep > 1 and approx_tokens("".join(entries[-keep:])) > budget_tokens:
+        keep -= 1
+
+    older = transcript["scores"][:len(entries) - keep]
+    history = ""
+    if older:
+        mean = sum(older) / len(older)
+        history = (
+            f"Earlier scores: {', '.join(str(s) for s in older)} "
+            f"(mean {mean:.1f})\n"
+        )
+    return history + "".join(entries[len(entries) - keep:])
+
+
+def render_report_history(transcript: dict) -> str:
+    return "".join(transcript["report"])
+
+
+def transcript_from_history(qa_history: list, evaluation_history: list = ()) -> dict:
+    """
+    Builds a transcript for callers that only have the raw histories.
+    """
+    transcript = new_transcript()
+    for qa in qa_history:
+        append_answer(transcript, qa["question"], qa["answer"])
+    for evaluation in evaluation_history:
+        append_evaluation(transcript, evaluation)
+    return transcript
@@ -0,0 +1,446 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.question_generator import generate_next_question, stream_next_question
+from core.evaluator import evaluate_answer
+from core.competence_estimator import estimate_competence
+from core.report_generator import generate_final_report, stream_final_report
+from core.report_builder import (
+    incremental_enabled,
+    schedule_section,
+    build_final_report,
+    stream_final_report_incremental
+)
+from core.transcript import append_evaluation
+from core.interview_plan import (
+    plan_enabled,
+    is_planned,
+    load_plan,
+    pick_question,
+    revise_plan,
+    discard_plan
+)
+from utils.metrics import inc, register_collector
+
+# Bounded pool shared by every request in this worker.
+# Only speculative work is submitted here; the critical path
+# (evaluation -> competence) runs on the request thread.
+TURN_PIPELINE_WORKERS = int(os.getenv("TURN_PIPELINE_WORKERS", "8"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=TURN_PIPELINE_WORKERS,
+    thread_name_prefix="turn-pipeline"
+)
+
+# A speculative question only survives when the interviewer's intent
+# did not change; a miss pays for two question generations. Hold rates
+# are tracked per previous intent (EWMA, per worker) and speculation is
+# skipped for intents that rarely hold. Every turn is an observation,
+# speculated or not, so a skipped intent can recover.
+SPECULATION_MIN_HOLD_RATE = float(os.getenv("SPECULATION_MIN_HOLD_RATE", "0.5"))
+# Always speculate until an intent has this many observations
+SPECULATION_WARMUP_TURNS = 20
+SPECULATION_HOLD_ALPHA = 0.1
+
+_hold_rates = {}  # previous intent -> [ewma, observations]
+_hold_lock = threading.Lock()
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, _elapsed_ms(start)
+
+
+def _question_uses_competence(session: dict, question_number: int) -> bool:
+    """
+    Project questions and resume questions ignore the competence
+    summary, so a speculative question is always valid for them.
+    """
+    if session["interview_mode"] == "project" and session["project_readme"]:
+        return False
+    if session["resume_text"] and question_number in (1, 3):
+        return False
+    return True
+
+
+def _question_kwargs(session: dict, competence_summary: str, question_intent: str) -> dict:
+    return dict(
+        role=session["role"],
+        topic=session["topic"],
+        confidence=session["confidence"],
+        competence_summary=competence_summary,
+        qa_history=session["qa_history"],
+        is_fresher=True,
+        interview_mode=session["interview_mode"],
+        project_readme=session["project_readme"],
+        project_name=session["project_name"],
+        resume_text=session["resume_text"],
+        question_intent=question_intent,
+        transcript=session["transcript"],
+        project_url=session.get("project_url", "")
+    )
+
+
+def _next_question(session: dict, competence_summary: str, question_intent: str) -> str:
+    return generate_next_question(
+        **_question_kwargs(session, competence_summary, question_intent)
+    )
+
+
+def _report_args(session: dict, competence: dict) -> tuple:
+    return (
+        session["role"],
+        session["topic"],
+        session["confidence"],
+        competence.get("estimated_competence"),
+        session["qa_history"],
+        session["name"],
+        session["transcript"]
+    )
+
+
+def record_hold(previous_intent: str, held: bool):
+    with _hold_lock:
+        rate = _hold_rates.get(previous_intent)
+        if rate is None:
+            _hold_rates[previous_intent] = [1.0 if held else 0.0, 1]
+            return
+        rate[0] += SPECULATION_HOLD_ALPHA * ((1.0 if held else 0.0) - rate[0])
+        rate[1] += 1
+
+
+def worth_speculating(session: dict, previous_intent: str) -> bool:
+    """
+    False when a question speculated for previous_intent is unlikely
+    to be kept. Questions that ignore competence always hold.
+    """
+    if not _question_uses_competence(session, len(session["qa_history"]) + 1):
+        return True
+    with _hold_lock:
+        rate = _hold_rates.get(previous_intent)
+    if rate is None or rate[1] < SPECULATION_WARMUP_TURNS:
+        return True
+    return rate[0] >= SPECULATION_MIN_HOLD_RATE
+
+
+def _collect_metrics():
+    with _hold_lock:
+        rates = {intent: rate[0] for intent, rate in _hold_rates.items()}
+    for intent, rate in rates.items():
+        yield "speculation_hold_rate", "gauge", {"intent": intent}, round(rate, 3)
+
+
+register_collector(_collect_metrics)
+
+
+def _start_speculation(session: dict, is_last_turn: bool):
+    if is_last_turn:
+        return None
+    previous_summary = session.get("competence_summary", "Interview started")
+    previous_intent = session.get("next_question_intent", "similar")
+    if not worth_speculating(session, previous_intent):
+        return None
+    return _executor.submit(
+        _timed, _next_question, session, previous_summary, previous_intent
+    )
+
+
+def _assess(session: dict, question: str, answer: str, timings: dict, is_last_turn: bool, store=None):
+    """
+    Critical path: evaluation -> competence. Updates the session.
+    With an incremental report, this answer's review section starts
+    drafting in the background as soon as it is evaluated.
+    """
+    evaluation, timings["evaluation_ms"] = _timed(
+        evaluate_answer,
+        session["role"],
+        session["topic"],
+        question,
+        answer
+    )
+
+    session["evaluation_history"].append(evaluation)
+    append_evaluation(session["transcript"], evaluation)
+    session["question_count"] += 1
+
+    incremental = store is not None and incremental_enabled()
+    if incremental:
+        schedule_section(
+            store, session, len(session["evaluation_history"]), question, answer, evaluation
+        )
+
+    # The report synthesis re-scores the whole interview anyway, so an
+    # incremental report skips the extra LLM competence refinement
+    competence, timings["competence_ms"] = _timed(
+        estimate_competence,
+        session["topic"],
+        session["confidence"],
+        session["evaluation_history"],
+        session["transcript"],
+        final=is_last_turn and not incremental
+    )
+    return evaluation, competence
+
+
+def _turn_plan(session: dict, is_last_turn: bool, store=None) -> tuple:
+    """
+    (applies, plan): whether the next question may come from the
+    interview plan, and the plan (None until the first one is saved).
+    """
+    if store is None or is_last_turn or not plan_enabled(session):
+        return False, None
+    if not is_planned(session, len(session["qa_history"]) + 1):
+        return False, None
+    return True, load_plan(store, session)
+
+
+def _start_unplanned_speculation(session: dict, plan, is_last_turn: bool):
+    """
+    No speculative question when the plan already covers the
+    interviewer's previous intent and weak areas (it usually holds).
+    """
+    if pick_question(plan, session, session.get("next_question_intent", "similar")):
+        return None
+    return _start_speculation(session, is_last_turn)
+
+
+def _planned_question(session: dict, plan_applies: bool, plan, intent: str):
+    if not plan_applies:
+        return None
+    question = pick_question(plan, session, intent)
+    inc(
+        "question_plan_total",
+        outcome="hit" if question else ("miss" if plan else "unavailable")
+    )
+    return question
+
+
+def _drop_speculation(speculative):
+    """
+    The plan served the question: cancels the speculative one, or waits
+    for it, since it folds session["transcript"] and the session is
+    about to be saved.
+    """
+    if speculative is None or speculative.cancel():
+        return
+    try:
+        speculative.result()
+    except Exception as e:
+        print("Speculation error:", e)
+    inc("speculation_wasted_total", reason="plan")
+
+
+def _speculation_holds(session: dict, previous_intent: str, intent: str) -> bool:
+    question_number = len(session["qa_history"]) + 1
+    if not _question_uses_competence(session, question_number):
+        return True
+    held = intent == previous_intent
+    record_hold(previous_intent, held)
+    return held
+
+
+def run_turn(session: dict, question: str, answer: str, max_questions: int, store=None) -> dict:
+    """
+    Runs one interview turn, overlapping independent LLM stages.
+
+    The next question is generated speculatively (using the previous
+    competence summary) while the answer is evaluated and competence
+    is re-estimated. Once competence is known the speculative question
+    is kept if the interviewer's intent did not change, otherwise it
+    is regenerated. Intents that rarely hold are not speculated ("off"):
+    the question is generated once, after competence.
+
+    store (the derived store, utils.session_store.create_derived_store)
+    enables the incremental report: review sections are drafted between
+    turns and kept under derived keys.
+    With QUESTION_MODE=plan it also holds the interview plan: a planned
+    question for the new intent replaces speculation ("plan"), a miss
+    re-plans the remaining questions in the background.
+
+    Mutates the session (callers save it only on success; LLMError
+    from the final report propagates) and returns:
+    {evaluation, competence, done, next_question, report, timings}
+    """
+    turn_start = time.perf_counter()
+    timings = {}
+
+    is_last_turn = session["question_count"] + 1 >= max_questions
+    previous_intent = session.get("next_question_intent", "similar")
+
+    plan_applies, plan = _turn_plan(session, is_last_turn, store)
+    speculative = _start_unplanned_speculation(session, plan, is_last_turn)
+    evaluation, competence = _assess(session, question, answer, timings, is_last_turn, store)
+
+    intent = competence.get("next_question_intent", "similar")
+    summary = competence.get("reasoning", "")
+    session["next_question_intent"] = intent
+    session["competence_summary"] = summary
+    session["weak_areas"] = competence.get("weak_areas") or []
+
+    result = {
+        "evaluation": evaluation,
+        "competence": competence,
+        "done": is_last_turn,
+        "next_question": None,
+        "report": None,
+        "timings": timings
+    }
+
+    # ---------------- FINAL REPORT ----------------
+    if is_last_turn:
+        if store is not None and incremental_enabled():
+            result["report"], timings["report_ms"] = _timed(
+                build_final_report,
+                store,
+                session,
+                competence.get("estimated_competence")
+            )
+        else:
+            result["report"], timings["report_ms"] = _timed(
+                generate_final_report,
+                *_report_args(session, competence)
+            )
+        session["final_report"] = result["report"]
+        if store is not None and plan_enabled(session):
+            discard_plan(store, session)
+        timings["speculation"] = "skipped"
+        timings["total_ms"] = _elapsed_ms(turn_start)
+        return result
+
+    # ---------------- RECONCILE ----------------
+    # Observed on every turn, so skipped intents keep being measured
+    held = _speculation_holds(session, previous_intent, intent)
+    next_question = _planned_question(session, plan_applies, plan, intent)
+
+    if next_question:
+        timings["speculation"] = "plan"
+        _drop_speculation(speculative)
+    elif speculative is None:
+        # Not speculated: generated once, for the new intent
+        timings["speculation"] = "off"
+        next_question, timings["question_ms"] = _timed(
+            _next_question, session, summary, intent
+        )
+    else:
+        next_question, timings["question_ms"] = speculative.result()
+        if held:
+            timings["speculation"] = "hit"
+        else:
+            timings["speculation"] = "miss"
+            inc("speculation_wasted_total", reason="miss")
+            next_question, timings["regeneration_ms"] = _timed(
+                _next_question, session, summary, intent
+            )
+
+    inc("speculation_total", outcome=timings["speculation"])
+    session["current_question"] = next_question
+    if plan_applies and timings["speculation"] != "plan":
+        revise_plan(store, session, competence)
+    result["next_question"] = next_question
+    timings["total_ms"] = _elapsed_ms(turn_start)
+    return result
+
+
+def stream_turn(session: dict, question: str, answer: str, max_questions: int, store=None):
+    """
+    Streaming variant of run_turn. Yields (event, data) pairs:
+    - ("stage", {...})        after evaluation and competence
+    - ("token", {...})        next-question text as it is generated
+    - ("report_token", {...}) final report text as it is generated
+                              (the synthesis only, for an incremental
+                              report; "done" carries the full report)
+    - ("done", {...})         same payload as the /answer JSON response
+
+    A speculative question that survives reconciliation is sent as a
+    single token, so only a miss pays for a streamed regeneration.
+    """
+    turn_start = time.perf_counter()
+    timings = {}
+
+    is_last_turn = session["question_count"] + 1 >= max_questions
+    previous_intent = session.get("next_question_intent", "similar")
+
+    plan_applies, plan = _turn_plan(session, is_last_turn, store)
+    speculative = _start_unplanned_speculation(session, plan, is_last_turn)
+    evaluation, competence = _assess(session, question, answer, timings, is_last_turn, store)
+
+    intent = competence.get("next_question_intent", "similar")
+    summary = competence.get("reasoning", "")
+    session["next_question_intent"] = intent
+    session["competence_summary"] = summary
+    session["weak_areas"] = competence.get("weak_areas") or []
+
+    yield "stage", {"stage": "assessed", "timings": dict(timings)}
+
+    # ---------------- FINAL REPORT ----------------
+    if is_last_turn:
+        report = None
+        stage_start = time.perf_counter()
+        if store is not None and incremental_enabled():
+            report_events = stream_final_report_incremental(
+                store, session, competence.get("estimated_competence")
+            )
+        else:
+            report_events = stream_final_report(*_report_args(session, competence))
+        for event, data in report_events:
+            if event == "report":
+                report = data
+            else:
+                yield event, {"text": data}
+        timings["report_ms"] = _elapsed_ms(stage_start)
+        timings["speculation"] = "skipped"
+        timings["total_ms"] = _elapsed_ms(turn_start)
+        session["final_report"] = report
+        if store is not None and plan_enabled(session):
+            discard_plan(store, session)
+        yield "done", {
+            "done": True,
+            "report": report,
+            "evaluation_history": session["evaluation_history"],
+            "timings": timings
+        }
+        return
+
+    # ---------------- RECONCILE ----------------
+    held = _speculation_holds(session, previous_intent, intent)
+    next_question = _planned_question(session, plan_applies, plan, intent)
+    if next_question:
+        timings["speculation"] = "plan"
+        _drop_speculation(speculative)
+    elif speculative is None:
+        timings["speculation"] = "off"
+    else:
+        next_question, timings["question_ms"] = speculative.result()
+        timings["speculation"] = "hit" if held else "miss"
+        if not held:
+            inc("speculation_wasted_total", reason="miss")
+
+    if timings["speculation"] in ("plan", "hit"):
+        yield "token", {"text": next_question}
+    else:
+        stage_start = time.perf_counter()
+        for event, data in stream_next_question(**_question_kwargs(session, summary, intent)):
+            if event == "question":
+                next_question = data
+            else:
+                yield event, {"text": data}
+        stage = "regeneration_ms" if timings["speculation"] == "miss" else "question_ms"
+        timings[stage] = _elapsed_ms(stage_start)
+
+    inc("speculation_total", outcome=timings["speculation"])
+    session["current_question"] = next_question
+    if plan_applies and timings["speculation"] != "plan":
+        revise_plan(store, session, competence)
+    timings["total_ms"] = _elapsed_ms(turn_start)
+    yield "done", {
+        "done": False,
+        "next_question": next_question,
+        "timings": timings
+    }
@@ -0,0 +1,59 @@
+"""
+Gunicorn settings (Procfile: gunicorn -c gunicorn.conf.py app:app).
+
+An interview turn spends seconds waiting on the LLM, so workers are
+threaded (gthread): a waiting turn holds one thread, not a process.
+Capacity is WEB_CONCURRENCY x GUNICORN_THREADS concurrent requests;
+the LLM itself stays capped per process by LLM_MAX_CONCURRENCY /
+LLM_REQUESTS_PER_MINUTE, and turns beyond that queue cheaply.
+
+One worker by default: the memory session store lives in each
+process. More than one worker needs SESSION_BACKEND=sqlite or redis so
+every worker sees every session (checked below).
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "64"))
+
+# Final reports can take a while; SSE streams stay open for a whole turn
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Sessions, idempotency claims and report drafts would be missing on
+# every worker but the one that created them
+if workers > 1 and os.getenv("SESSION_BACKEND", "memory") == "memory":
+    raise SystemExit(
+        f"WEB_CONCURRENCY={workers} needs SESSION_BACKEND=sqlite or redis "
+        "(the memory session store is per process)"
+    )
+
+# Executors and pools are created at import time and do not survive
+# fork, so the app is imported in each worker (no preload_app)
+preload_app = False
+
+
+def post_worker_init(worker):
+    # APP_PRELOAD=true: load SDKs / clients / process pools before the
+    # worker takes requests (utils/preload.py); off for scale-to-zero
+    from utils.preload import APP_PRELOAD, preload
+
+    if APP_PRELOAD:
+        preload()
+
+# Every in-flight turn submits one speculative question and one report
+# section draft; size both pools to the thread count so background work
+# never waits for a slot
+os.environ.setdefault("TURN_PIPELINE_WORKERS", str(threads))
+os.environ.setdefault("REPORT_SECTION_WORKERS", str(threads))
+
+# Admission control: half the threads run requests, the other half may
+# wait in the queue; beyond that clients get 429 instead of a stalled
+# connection
+os.environ.setdefault("ADMISSION_MAX_ACTIVE", str(max(1, threads // 2)))
+os.environ.setdefault("ADMISSION_QUEUE_SIZE", str(max(1, threads - threads // 2)))
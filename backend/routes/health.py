@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, Response
 
 health_bp = Blueprint("health", __name__)
 
@@ -8,3 +8,15 @@ def health_check():
         "status": "ok",
         "message": "AI Mock Interviewer backend is running"
     })
+
+
+@health_bp.route("/cache", methods=["GET"])
+def cache_stats():
+    from core.question_cache import question_cache_stats
+    return jsonify(question_cache_stats())
+
+
+@health_bp.route("/metrics", methods=["GET"])
+def metrics():
+    from utils.metrics import render_prometheus
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
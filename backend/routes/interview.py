@@ -1,32 +1,59 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, Response, stream_with_context
+import hmac
 import uuid
-import io
+import json
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from flask_cors import cross_origin
 
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-
 from core.question_generator import generate_next_question
-from core.evaluator import evaluate_answer
-from core.competence_estimator import estimate_competence
-from core.report_generator import generate_final_report
+from core.turn_pipeline import run_turn, stream_turn
+from utils.llm_client import LLMError
 from utils.resume_validator import is_valid_resume
+from utils.session_store import create_session_store, create_derived_store
+from utils.pdf_renderer import get_report_pdf, PDF_MAX_REPORT_CHARS
+from utils.admission import admitted
+from utils.prompt_budget import compress_input
+from utils.idempotency import (
+    IDEMPOTENCY_HEADER,
+    IDEMPOTENCY_WAIT_SECONDS,
+    TurnInProgress,
+    turn_key,
+    replay,
+    remember,
+    claim,
+    release
+)
+from core.transcript import new_transcript, append_answer
+from config.topics import MAX_QUESTIONS
 from utils.github_fetcher import (
     is_valid_github_url,
-    fetch_readme,
     extract_repo_name
 )
+from core.project_index import load_project_index
+from core.interview_plan import plan_enabled, schedule_plan
+from core.batch_evaluator import (
+    evaluate_batch,
+    read_transcripts,
+    transcript_error,
+    BATCH_EVAL_API_MAX_ANSWERS,
+    BATCH_EVAL_API_TOKEN
+)
 
 interview_bp = Blueprint("interview", __name__)
 
-INTERVIEW_SESSIONS = {}
-MAX_QUESTIONS = 5
+# Backend chosen by SESSION_BACKEND (memory | sqlite | redis)
+INTERVIEW_SESSIONS = create_session_store()
+# Report drafts and question plans, kept apart from the session LRU
+INTERVIEW_DRAFTS = create_derived_store()
+
+LLM_UNAVAILABLE_ERROR = "Interviewer is temporarily unavailable. Please retry."
 
 
 # ======================================================
 # START INTERVIEW
 # ======================================================
 @interview_bp.route("/start", methods=["POST"])
+@admitted("start")
 def start_interview():
     form = request.form
 
@@ -40,6 +67,7 @@ def start_interview():
     resume_text = ""
     project_readme = ""
     project_name = ""
+    project_url = ""
 
     if interview_mode == "normal":
         role = form.get("role")
@@ -53,7 +81,8 @@ def start_interview():
             ok, res = is_valid_resume(resume_file)
             if not ok:
                 return jsonify({"error": res}), 400
-            resume_text = res
+            # Compressed once; the session keeps the prompt-sized text
+            resume_text = compress_input("resume_question", "resume_text", res)
 
     elif interview_mode == "project":
         github_url = form.get("github_url")
@@ -61,7 +90,12 @@ def start_interview():
         if not github_url or not is_valid_github_url(github_url):
             return jsonify({"error": "Valid GitHub URL is required"}), 400
 
-        project_readme = fetch_readme(github_url)
+        # README, tree and key files are fetched concurrently and indexed
+        # once per repo; later questions only pull the relevant snippets
+        project_readme = compress_input(
+            "project_question", "readme", load_project_index(github_url)["readme"]
+        )
+        project_url = github_url
         if not project_readme:
             project_readme = "README not available. Ask high-level architecture questions."
 
@@ -75,7 +109,8 @@ def start_interview():
 
     session_id = str(uuid.uuid4())
 
-    INTERVIEW_SESSIONS[session_id] = {
+    session = {
+        "session_id": session_id,
         "name": name,
         "interview_mode": interview_mode,
         "role": role,
@@ -84,10 +119,15 @@ def start_interview():
         "resume_text": resume_text,
         "project_readme": project_readme,
         "project_name": project_name,
+        "project_url": project_url,
         "qa_history": [],
         "evaluation_history": [],
+        "transcript": new_transcript(),
         "question_count": 0,
-        "current_question": None
+        "current_question": None,
+        "competence_summary": "Interview started",
+        "next_question_intent": "similar",
+        "weak_areas": []
     }
 
     first_question = generate_next_question(
@@ -100,126 +140,344 @@ def start_interview():
         interview_mode=interview_mode,
         project_readme=project_readme,
         project_name=project_name,
-        resume_text=resume_text
+        resume_text=resume_text,
+        project_url=project_url
     )
 
-    INTERVIEW_SESSIONS[session_id]["current_question"] = first_question
+    session["current_question"] = first_question
+    INTERVIEW_SESSIONS.save(session_id, session)
+
+    # The rest of the interview is planned while the first answer is typed
+    if plan_enabled(session):
+        schedule_plan(INTERVIEW_DRAFTS, session, 2)
 
     return jsonify({
         "session_id": session_id,
-        "question": first_question
+        "question": first_question,
+        "max_questions": MAX_QUESTIONS
     }), 200
 
 
 # ======================================================
 # ANSWER QUESTION
 # ======================================================
-@interview_bp.route("/answer", methods=["POST"])
-def submit_answer():
+def _stored_response(session: dict, key: str, replayable: bool):
+    """
+    A stored response to send as-is (retried turn or finished
+    interview), or None.
+    """
+    stored = replay(session, key) if replayable else None
+    # A finished interview is replayed, not re-scored (see _final_payload)
+    if stored is None and session.get("final_report"):
+        stored = _final_payload(session)
+    return stored
+
+
+def _begin_turn():
+    """
+    Validates an answer payload, claims the turn and records the answer.
+    Returns (turn, None) or (None, error_response); turn is
+    {session, question, answer, key, replay, owner, future}. replay is a
+    stored response to send as-is; a non-owner waits on future.
+    """
     data = request.get_json(silent=True)
 
     if not data:
-        return jsonify({"error": "Invalid JSON payload"}), 400
+        return None, (jsonify({"error": "Invalid JSON payload"}), 400)
 
     session_id = data.get("session_id")
     answer = data.get("answer", "").strip()
 
     if not session_id:
-        return jsonify({"error": "session_id missing"}), 400
+        return None, (jsonify({"error": "session_id missing"}), 400)
 
+    expired = (jsonify({"error": "Session expired. Please restart interview."}), 400)
     session = INTERVIEW_SESSIONS.get(session_id)
     if not session:
-        return jsonify({"error": "Session expired. Please restart interview."}), 400
+        return None, expired
 
-    question = session["current_question"]
-
-    session["qa_history"].append({
-        "question": question,
-        "answer": answer or "Don't know"
-    })
+    key, replayable = turn_key(request.headers.get(IDEMPOTENCY_HEADER), session, answer)
+    turn = {
+        "session": session, "question": None, "answer": answer, "key": key,
+        "replay": _stored_response(session, key, replayable),
+        "owner": False, "future": None
+    }
+    if turn["replay"] is not None:
+        return turn, None
+
+    try:
+        turn["owner"], turn["future"] = claim(session_id, key)
+    except TurnInProgress:
+        return None, (
+            jsonify({"error": "Previous answer is still being processed."}), 409
+        )
+    if not turn["owner"]:
+        return turn, None
+
+    try:
+        # The previous owner may have saved this turn between the read
+        # above and the claim: re-read under the claim before recording
+        # the answer
+        session = INTERVIEW_SESSIONS.get(session_id)
+        if not session:
+            release(session_id, turn["future"], error=LLMError("Session expired"))
+            return None, expired
+        turn["replay"] = _stored_response(session, key, replayable)
+        if turn["replay"] is not None:
+            release(session_id, turn["future"], turn["replay"])
+            return turn, None
+
+        question = session["current_question"]
+        turn["session"] = session
+        turn["question"] = question
+
+        session["qa_history"].append({
+            "question": question,
+            "answer": answer or "Don't know"
+        })
+        append_answer(session["transcript"], question, answer or "Don't know")
+    except Exception:
+        release(session_id, turn["future"], error=LLMError("Turn failed"))
+        raise
+
+    return turn, None
+
+
+def _final_payload(session: dict, timings: dict = None) -> dict:
+    return {
+        "done": True,
+        "report": session["final_report"],
+        "evaluation_history": session["evaluation_history"],
+        "timings": timings or {}
+    }
 
-    evaluation = evaluate_answer(
-        session["role"],
-        session["topic"],
-        question,
-        answer
-    )
 
-    session["evaluation_history"].append(evaluation)
-    session["question_count"] += 1
+def _finish_turn(turn: dict, future, payload: dict):
+    session = turn["session"]
+    remember(session, turn["key"], payload)
+    INTERVIEW_SESSIONS.save(session["session_id"], session)
+    release(session["session_id"], future, payload)
 
-    competence = estimate_competence(
-        session["topic"],
-        session["confidence"],
-        session["evaluation_history"]
-    )
 
-    if session["question_count"] >= MAX_QUESTIONS:
-        report = generate_final_report(
-            session["role"],
-            session["topic"],
-            session["confidence"],
-            competence.get("estimated_competence"),
-            session["qa_history"],
-            session["name"]
+@interview_bp.route("/answer", methods=["POST"])
+@admitted("answer")
+def submit_answer():
+    turn, error = _begin_turn()
+    if error:
+        return error
+    if turn["replay"] is not None:
+        return jsonify(turn["replay"]), 200
+
+    future = turn["future"]
+    if not turn["owner"]:
+        # Same turn already running (client retry): share its result
+        try:
+            return jsonify(future.result(timeout=IDEMPOTENCY_WAIT_SECONDS)), 200
+        except Exception as e:
+            print("Turn error:", e)
+            return jsonify({"error": LLM_UNAVAILABLE_ERROR}), 503
+
+    session = turn["session"]
+    try:
+        result = run_turn(
+            session, turn["question"], turn["answer"], MAX_QUESTIONS, store=INTERVIEW_DRAFTS
         )
-        return jsonify({
-            "done": True, 
-            "report": report,
-            "evaluation_history": session["evaluation_history"]
-        }), 200
-
-    next_question = generate_next_question(
-        role=session["role"],
-        topic=session["topic"],
-        confidence=session["confidence"],
-        competence_summary=competence.get("reasoning", ""),
-        qa_history=session["qa_history"],
-        is_fresher=True,
-        interview_mode=session["interview_mode"],
-        project_readme=session["project_readme"],
-        project_name=session["project_name"],
-        resume_text=session["resume_text"]
+
+        if result["done"]:
+            payload = _final_payload(session, result["timings"])
+        else:
+            payload = {
+                "done": False,
+                "next_question": result["next_question"],
+                "timings": result["timings"]
+            }
+        _finish_turn(turn, future, payload)
+        return jsonify(payload), 200
+
+    except LLMError as e:
+        # Nothing was saved, so the stored session is still pre-turn
+        print("Turn error:", e)
+        release(session["session_id"], future, error=e)
+        return jsonify({"error": LLM_UNAVAILABLE_ERROR}), 503
+    finally:
+        # No-op after _finish_turn; frees the session if anything else raised
+        release(session["session_id"], future, error=LLMError("Turn failed"))
+
+
+# ======================================================
+# ANSWER QUESTION (SERVER-SENT EVENTS)
+# ======================================================
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@interview_bp.route("/answer/stream", methods=["POST"])
+@admitted("answer")
+def submit_answer_stream():
+    turn, error = _begin_turn()
+    if error:
+        return error
+
+    owner, future = turn["owner"], turn["future"]
+
+    def events():
+        # Replays and shared duplicates get the final payload only
+        if turn["replay"] is not None:
+            yield _sse("done", turn["replay"])
+            return
+        if not owner:
+            try:
+                yield _sse("done", future.result(timeout=IDEMPOTENCY_WAIT_SECONDS))
+            except Exception as e:
+                print("Turn error:", e)
+                yield _sse("error", {"error": LLM_UNAVAILABLE_ERROR})
+            return
+
+        session = turn["session"]
+        try:
+            for event, data in stream_turn(
+                session, turn["question"], turn["answer"], MAX_QUESTIONS, store=INTERVIEW_DRAFTS
+            ):
+                if event == "done":
+                    _finish_turn(turn, future, data)
+                yield _sse(event, data)
+        except LLMError as e:
+            print("Turn error:", e)
+            release(session["session_id"], future, error=e)
+            yield _sse("error", {"error": LLM_UNAVAILABLE_ERROR})
+        finally:
+            # Client went away mid-turn: let waiting duplicates retry
+            release(session["session_id"], future, error=LLMError("Turn interrupted"))
+
+    response = Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
     )
+    if owner:
+        # A stream closed before its first chunk never runs the finally
+        # above; no-op once the turn was released
+        response.call_on_close(
+            lambda: release(turn["session"]["session_id"], future, error=LLMError("Turn interrupted"))
+        )
+    return response
 
-    session["current_question"] = next_question
 
+# ======================================================
+# RESUME SESSION
+# ======================================================
+@interview_bp.route("/session/<session_id>", methods=["GET"])
+def get_session_state(session_id):
+    """
+    Current question and progress, read from the store (no LLM calls).
+    Lets a reloaded page or a new tab resume the interview.
+    """
+    session = INTERVIEW_SESSIONS.get(session_id)
+    if not session:
+        return jsonify({"error": "Session expired. Please restart interview."}), 404
+
+    done = bool(session.get("final_report"))
     return jsonify({
-        "done": False,
-        "next_question": next_question
+        "session_id": session_id,
+        "name": session["name"],
+        "interview_mode": session["interview_mode"],
+        "role": session["role"],
+        "topic": session["topic"],
+        "question_count": session["question_count"],
+        "max_questions": MAX_QUESTIONS,
+        "current_question": None if done else session["current_question"],
+        "done": done,
+        "report": session.get("final_report"),
+        "evaluation_history": session["evaluation_history"] if done else []
     }), 200
 
 # ======================================================
-# DOWNLOAD REPORT PDF (STATELESS ✅)
+# DOWNLOAD REPORT PDF
 # ======================================================
 @interview_bp.route("/report/pdf", methods=["POST"])
 @cross_origin()
 def download_report_pdf():
-    data = request.get_json(silent=True)
-
-    if not data or "report" not in data:
+    """
+    {"session_id": ...} renders the report stored on the session;
+    {"report": ...} still works once the session has expired.
+    """
+    data = request.get_json(silent=True) or {}
+
+    report_text = None
+    if data.get("session_id"):
+        session = INTERVIEW_SESSIONS.get(data["session_id"])
+        report_text = session and session.get("final_report")
+    report_text = report_text or data.get("report")
+
+    if not report_text or not isinstance(report_text, str):
         return jsonify({"error": "Report content missing"}), 400
-
-    report_text = data["report"]
-
-    buffer = io.BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
-    y = height - 40
-    for line in report_text.split("\n"):
-        if y < 40:
-            pdf.showPage()
-            y = height - 40
-        pdf.drawString(40, y, line[:110])
-        y -= 14
-
-    pdf.save()
-    buffer.seek(0)
+    if len(report_text) > PDF_MAX_REPORT_CHARS:
+        return jsonify({"error": "Report is too large to render."}), 413
+
+    # Layout runs on a process pool; repeated downloads hit the disk cache
+    try:
+        digest, pdf_path = get_report_pdf(report_text)
+    except FuturesTimeoutError:
+        return jsonify({"error": "Report rendering timed out. Please retry."}), 503
+    except Exception as e:
+        print("PDF render error:", e)
+        return jsonify({"error": "Report could not be rendered as PDF."}), 500
 
     return send_file(
-        buffer,
+        pdf_path,
         as_attachment=True,
         download_name="Interview_Report.pdf",
-        mimetype="application/pdf"
+        mimetype="application/pdf",
+        etag=digest,
+        max_age=3600
+    )
+
+
+# ======================================================
+# BATCH EVALUATION (OFFLINE RE-SCORING)
+# ======================================================
+@interview_bp.route("/evaluate/batch", methods=["POST"])
+@admitted("batch")
+def evaluate_batch_route():
+    """
+    JSONL transcripts in, JSONL evaluations out, streamed as they are
+    scored (format in core.batch_evaluator). To resume, re-send only
+    the transcripts without results.
+    Disabled unless BATCH_EVAL_API_TOKEN is set; requires that token
+    as a Bearer token.
+    """
+    if not BATCH_EVAL_API_TOKEN:
+        return jsonify({"error": "Not found"}), 404
+    authorization = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(authorization, f"Bearer {BATCH_EVAL_API_TOKEN}"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    transcripts = list(read_transcripts(request.get_data(as_text=True).splitlines()))
+    if not transcripts:
+        return jsonify({"error": "JSONL transcripts required"}), 400
+
+    # Validated up front: an error mid-stream would cut the response
+    for number, transcript in enumerate(transcripts, 1):
+        error = transcript_error(transcript)
+        if error:
+            return jsonify({"error": f"Transcript {number}: {error}"}), 400
+
+    answers = sum(len(t["qa_history"]) for t in transcripts)
+    if answers > BATCH_EVAL_API_MAX_ANSWERS:
+        return jsonify({
+            "error": f"Too many answers ({answers}); max {BATCH_EVAL_API_MAX_ANSWERS} per request. "
+                     "Use python -m core.batch_evaluator for larger jobs."
+        }), 413
+
+    def rows():
+        for row in evaluate_batch(transcripts):
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    return Response(
+        stream_with_context(rows()),
+        mimetype="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
     )
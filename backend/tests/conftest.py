@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Tests import backend modules the way app.py does (cwd = backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubGroq:
+    """
+    Local stand-in for the Groq chat completions API. Responses are
+    scripted per request: (status, body, headers, delay_seconds).
+    Unscripted requests get a 200 completion.
+    """
+
+    def __init__(self):
+        self.script = []
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def push(self, status=200, content="ok", headers=None, delay=0.0):
+        self.script.append((status, content, headers or {}, delay))
+
+    def next(self, body: dict):
+        with self.lock:
+            self.requests.append(body)
+            return self.script.pop(0) if self.script else (200, "ok", {}, 0.0)
+
+
+def _completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "test-model",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+    }
+
+
+def _chunk(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": "test-model",
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]
+    }
+
+
+def _handler(stub: StubGroq):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            status, content, headers, delay = stub.next(body)
+            time.sleep(delay)
+
+            if status != 200:
+                payload = json.dumps({"error": {"message": content, "type": "test"}}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+
+            if body.get("stream"):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for word in content.split(" "):
+                    self.wfile.write(f"data: {json.dumps(_chunk(word + ' '))}\n\n".encode())
+                self.wfile.write(b"data: [DONE]\n\n")
+                return
+
+            payload = json.dumps(_completion(content)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+@pytest.fixture
+def stub_groq():
+    stub = StubGroq()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(stub))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stub.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def llm(stub_groq, monkeypatch):
+    """
+    utils.llm_client routed to the stub (as with GROQ_BASE_URL), with
+    a fresh rate limiter and short backoff.
+    """
+    from utils import llm_client, llm_router
+
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("GROQ_BASE_URL", stub_groq.url)
+    monkeypatch.setattr(llm_client, "LLM_BASE_URL", stub_groq.url)
+    monkeypatch.setattr(llm_client, "LLM_BACKEND", "groq")
+    monkeypatch.setattr(llm_client, "LLM_TIMEOUT_SECONDS", 1.0)
+    monkeypatch.setattr(llm_client, "LLM_BACKOFF_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(llm_client, "_bucket", llm_client.TokenBucket(1000.0, 100))
+    monkeypatch.setattr(llm_client, "_router", None)
+    monkeypatch.setattr(llm_client, "_backend", None)
+    # Failures are the point here; keep the only route in rotation
+    monkeypatch.setattr(llm_router, "LLM_ROUTER_TRIP_ERRORS", 1000)
+    yield llm_client
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+from flask import Flask
+
+from utils import admission
+from utils.admission import AdmissionController, Rejected
+
+
+def _acquire_later(controller, kind, client):
+    result = {}
+
+    def run():
+        try:
+            result["ticket"] = controller.acquire(kind, client)
+        except Rejected as rejected:
+            result["rejected"] = rejected
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+def _wait_queued(controller, count):
+    with controller.cond:
+        assert controller.cond.wait_for(lambda: len(controller.waiting) == count, 5)
+
+
+def test_client_over_its_limit_waits_instead_of_being_rejected():
+    controller = AdmissionController(max_active=8, reserved_for_answers=0, max_per_client=1)
+    first = controller.acquire("answer", "nat")
+
+    thread, result = _acquire_later(controller, "answer", "nat")
+    _wait_queued(controller, 1)
+    first.release()
+    thread.join(5)
+
+    assert "ticket" in result
+
+
+def test_waiter_held_by_its_client_limit_does_not_block_others():
+    controller = AdmissionController(max_active=8, reserved_for_answers=0, max_per_client=1)
+    first = controller.acquire("answer", "nat")
+    thread, result = _acquire_later(controller, "answer", "nat")
+    _wait_queued(controller, 1)
+
+    assert controller.acquire("answer", "other") is not None
+    assert "ticket" not in result
+    first.release()
+    thread.join(5)
+    assert "ticket" in result
+
+
+def test_client_is_rejected_past_twice_its_limit(monkeypatch):
+    monkeypatch.setitem(admission.WAIT_SECONDS, "answer", 0.5)
+    controller = AdmissionController(max_active=8, reserved_for_answers=0, max_per_client=1)
+    controller.acquire("answer", "nat")
+    thread, _ = _acquire_later(controller, "answer", "nat")
+    _wait_queued(controller, 1)
+
+    with pytest.raises(Rejected) as rejected:
+        controller.acquire("answer", "nat")
+    assert rejected.value.reason == "client_limit"
+    thread.join(5)
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies(monkeypatch):
+    app = Flask(__name__)
+    headers = {"X-Forwarded-For": "1.2.3.4, 10.0.0.1"}
+    environ = {"REMOTE_ADDR": "10.0.0.2"}
+
+    with app.test_request_context(headers=headers, environ_base=environ):
+        assert admission.client_id() == "10.0.0.2"
+        monkeypatch.setattr(admission, "ADMISSION_TRUSTED_PROXIES", 1)
+        assert admission.client_id() == "10.0.0.1"
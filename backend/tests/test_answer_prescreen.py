@@ -0,0 +1,11 @@
+import pytest
+
+from benchmarks.prescreen import FIXTURES_PATH, load_fixtures
+from core.answer_prescreen import prescreen_answer
+
+FIXTURES = load_fixtures(FIXTURES_PATH)
+
+
+@pytest.mark.parametrize("row", FIXTURES, ids=lambda row: row["answer"][:40])
+def test_labeled_answers(row):
+    assert prescreen_answer(row["question"], row["answer"], row["topic"]) == row["label"]
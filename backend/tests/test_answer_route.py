@@ -0,0 +1,94 @@
+import pytest
+
+from app import create_app
+from routes import interview
+from utils.idempotency import _inflight
+from utils.session_store import MemorySessionStore
+
+URL = "/api/interview/answer"
+
+
+class RacingStore(MemorySessionStore):
+    """
+    Runs on_get once, right after the first read (another worker
+    finishing the turn between the read and the claim).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.on_get = None
+
+    def get(self, session_id):
+        session = super().get(session_id)
+        hook, self.on_get = self.on_get, None
+        if hook:
+            hook()
+        return session
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = RacingStore()
+    store.save("s1", {
+        "session_id": "s1",
+        "qa_history": [],
+        "transcript": [],
+        "question_count": 0,
+        "current_question": "Q1?"
+    })
+    monkeypatch.setattr(interview, "INTERVIEW_SESSIONS", store)
+    return store
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+def test_turn_finished_before_the_claim_is_replayed(client, store, monkeypatch):
+    finished = {"done": False, "next_question": "Q2?", "timings": {}}
+
+    def finish_elsewhere():
+        session = store.get("s1")
+        session["qa_history"].append({"question": "Q1?", "answer": "A1"})
+        session["question_count"] = 1
+        session["current_question"] = "Q2?"
+        session["last_turn"] = {"key": "client:k1", "response": finished}
+        store.save("s1", session)
+
+    def run_turn(*args, **kwargs):
+        raise AssertionError("turn re-run")
+
+    store.on_get = finish_elsewhere
+    monkeypatch.setattr(interview, "run_turn", run_turn)
+
+    response = client.post(
+        URL, json={"session_id": "s1", "answer": "A1"}, headers={"Idempotency-Key": "k1"}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == finished
+    assert len(store.get("s1")["qa_history"]) == 1
+
+
+def test_stream_closed_before_the_first_chunk_releases_the_turn(client, store):
+    response = client.post(
+        URL + "/stream", json={"session_id": "s1", "answer": "A1"}, headers={"Idempotency-Key": "k1"}
+    )
+    # Closed without reading: the events() generator never starts
+    response.close()
+
+    assert "s1" not in _inflight
+
+
+def test_error_after_the_claim_releases_the_turn(client, store, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("store down")
+
+    store.on_get = lambda: monkeypatch.setattr(store, "get", broken)
+
+    response = client.post(URL, json={"session_id": "s1", "answer": "A1"})
+
+    assert response.status_code == 500
+
+    assert "s1" not in _inflight
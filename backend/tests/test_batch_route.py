@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from app import create_app
+from core import batch_evaluator
+from routes import interview
+
+URL = "/api/interview/evaluate/batch"
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+def _post(client, lines, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    body = "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines)
+    response = client.post(URL, data=body, headers=headers, content_type="application/x-ndjson")
+    response.close()
+    return response
+
+
+def test_disabled_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(interview, "BATCH_EVAL_API_TOKEN", "")
+    assert _post(client, [{"qa_history": []}], token="anything").status_code == 404
+
+
+def test_requires_the_configured_token(client, monkeypatch):
+    monkeypatch.setattr(interview, "BATCH_EVAL_API_TOKEN", "secret")
+    assert _post(client, [{"qa_history": []}]).status_code == 401
+    assert _post(client, [{"qa_history": []}], token="wrong").status_code == 401
+
+
+@pytest.mark.parametrize("line", [
+    "[1, 2]",
+    '"just a string"',
+    {"id": "a", "qa_history": "not a list"},
+    {"id": "b", "qa_history": ["not an object"]},
+    {"id": "c", "qa_history": [{"question": None, "answer": "x"}]},
+    {"id": "d", "qa_history": [{"question": "q", "answer": 42}]},
+    {"id": "e", "role": None, "qa_history": []},
+    {"id": "f", "topic": ["Python"], "qa_history": []}
+])
+def test_malformed_transcripts_are_rejected_before_streaming(client, monkeypatch, line):
+    monkeypatch.setattr(interview, "BATCH_EVAL_API_TOKEN", "secret")
+    response = _post(client, [{"id": "ok", "qa_history": []}, line], token="secret")
+    assert response.status_code == 400
+    assert "Transcript 2" in response.get_json()["error"]
+
+
+def test_batch_reports_unscorable_transcripts_as_error_rows():
+    transcripts = [
+        {"id": "a", "qa_history": [{"question": None, "answer": "x"}]},
+        {"id": "b", "topic": "Python", "qa_history": [{"question": "What is a list?", "answer": ""}]}
+    ]
+    rows = list(batch_evaluator.evaluate_batch(transcripts, llm=lambda prompt: "{}"))
+    by_id = {row["id"]: row for row in rows[:-1]}
+
+    assert by_id["a"] == {
+        "id": "a", "index": None, "question": None,
+        "error": 'Transcript 1: "qa_history"[0]["question"] must be a string'
+    }
+    assert "evaluation" in by_id["b"]
+    assert rows[-1]["summary"]["failed"] == 1
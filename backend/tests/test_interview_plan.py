@@ -0,0 +1,59 @@
+import threading
+
+from core import interview_plan
+from utils.session_store import MemorySessionStore
+
+
+def _session(**fields):
+    session = {
+        "session_id": "s1",
+        "qa_history": [{"question": "Q1?", "answer": "A1"}],
+        "weak_areas": []
+    }
+    session.update(fields)
+    return session
+
+
+def _plan(focus=()):
+    return {
+        "questions": {"2": {"phase": "warmup", "similar": "Q2?", "easier": "Q2 easy?", "deeper": None}},
+        "focus": list(focus)
+    }
+
+
+def test_pick_question_serves_planned_intents():
+    session = _session()
+
+    assert interview_plan.pick_question(_plan(), session, "similar") == "Q2?"
+    assert interview_plan.pick_question(_plan(), session, "easier") == "Q2 easy?"
+    assert interview_plan.pick_question(_plan(), session, "deeper") is None
+
+
+def test_focused_needs_a_plan_for_the_current_weak_areas():
+    plan = _plan(focus=["Python clarity"])
+
+    assert interview_plan.pick_question(plan, _session(weak_areas=["Python clarity"]), "focused") == "Q2?"
+    assert interview_plan.pick_question(plan, _session(weak_areas=["Python depth"]), "focused") is None
+    assert interview_plan.pick_question(_plan(), _session(weak_areas=["Python clarity"]), "focused") is None
+
+
+def test_plan_discarded_while_generating_is_not_saved(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_plan(prompt, numbers, focus):
+        started.set()
+        release.wait(5)
+        return _plan()
+
+    monkeypatch.setattr(interview_plan, "generate_plan", slow_plan)
+    monkeypatch.setattr(interview_plan, "build_plan_prompt", lambda *args: ("prompt", [2]))
+    store = MemorySessionStore()
+    session = _session()
+
+    future = interview_plan.schedule_plan(store, session, 2)
+    assert started.wait(5)
+    interview_plan.discard_plan(store, session)
+    release.set()
+
+    assert future.result(5) is None
+    assert store.get("s1:question_plan") is None
@@ -0,0 +1,159 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from utils.llm_client import (
+    LLM_BACKOFF_MAX_SECONDS,
+    LLMRateLimitError,
+    LLMResponseError,
+    LLMTimeoutError,
+    LLMUnavailableError,
+    TokenBucket,
+    _backoff_delay
+)
+
+
+def test_call_llm_returns_completion(llm, stub_groq):
+    stub_groq.push(content="What is a closure?")
+
+    assert llm.call_llm("Ask a question", template="question") == "What is a closure?"
+    assert stub_groq.requests[0]["model"]
+
+
+def test_retries_5xx_then_succeeds(llm, stub_groq):
+    stub_groq.push(status=503, content="overloaded")
+    stub_groq.push(status=500, content="boom")
+    stub_groq.push(content="recovered")
+
+    assert llm.call_llm("prompt") == "recovered"
+    assert len(stub_groq.requests) == 3
+
+
+def test_5xx_exhausts_retries_as_unavailable(llm, stub_groq):
+    for _ in range(llm.LLM_MAX_RETRIES + 1):
+        stub_groq.push(status=503, content="overloaded")
+
+    with pytest.raises(LLMUnavailableError) as raised:
+        llm.call_llm("prompt")
+    assert raised.value.status_code == 503
+    assert len(stub_groq.requests) == llm.LLM_MAX_RETRIES + 1
+
+
+def test_429_honours_retry_after(llm, stub_groq):
+    stub_groq.push(status=429, content="slow down", headers={"retry-after": "0.3"})
+    stub_groq.push(content="after the wait")
+
+    start = time.monotonic()
+    assert llm.call_llm("prompt") == "after the wait"
+    assert time.monotonic() - start >= 0.3
+    assert len(stub_groq.requests) == 2
+
+
+def test_429_exhausts_retries_as_rate_limit(llm, stub_groq):
+    for _ in range(llm.LLM_MAX_RETRIES + 1):
+        stub_groq.push(status=429, content="slow down", headers={"retry-after": "0"})
+
+    with pytest.raises(LLMRateLimitError) as raised:
+        llm.call_llm("prompt")
+    assert raised.value.retryable
+
+
+def test_4xx_is_not_retried(llm, stub_groq):
+    stub_groq.push(status=400, content="bad request")
+
+    with pytest.raises(LLMResponseError) as raised:
+        llm.call_llm("prompt")
+    assert raised.value.status_code == 400
+    assert len(stub_groq.requests) == 1
+
+
+def test_timeout_maps_to_timeout_error(llm, stub_groq, monkeypatch):
+    monkeypatch.setattr(llm, "LLM_MAX_RETRIES", 0)
+    stub_groq.push(content="too late", delay=1.5)
+
+    with pytest.raises(LLMTimeoutError):
+        llm.call_llm("prompt")
+
+
+def test_connection_refused_maps_to_unavailable(llm, monkeypatch):
+    monkeypatch.setattr(llm, "LLM_MAX_RETRIES", 0)
+    monkeypatch.setattr(llm, "LLM_BASE_URL", "http://127.0.0.1:9")
+
+    with pytest.raises(LLMUnavailableError):
+        llm.call_llm("prompt")
+
+
+def test_empty_completion_is_response_error(llm, stub_groq):
+    stub_groq.push(content="")
+
+    with pytest.raises(LLMResponseError):
+        llm.call_llm("prompt")
+
+
+def test_stream_retries_before_first_delta(llm, stub_groq):
+    stub_groq.push(status=503, content="overloaded")
+    stub_groq.push(content="streamed question text")
+
+    assert "".join(llm.stream_llm("prompt")).strip() == "streamed question text"
+    assert len(stub_groq.requests) == 2
+
+
+def test_stream_slot_is_freed_while_the_consumer_is_still_reading(llm, stub_groq, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(llm, "_concurrency", slots)
+    stub_groq.push(content="one two three four")
+
+    stream = llm.stream_llm("prompt")
+    next(stream)
+    # The consumer has not read further (nor closed the stream)
+    deadline = time.monotonic() + 5
+    while not slots.acquire(timeout=0.05):
+        assert time.monotonic() < deadline
+    slots.release()
+
+    assert "".join(stream)
+    stream.close()
+
+
+def test_async_call_retries_and_returns(llm, stub_groq):
+    stub_groq.push(status=429, content="slow down", headers={"retry-after": "0.1"})
+    stub_groq.push(content="async answer")
+
+    assert asyncio.run(llm.acall_llm("prompt")) == "async answer"
+    assert len(stub_groq.requests) == 2
+
+
+def test_async_call_maps_errors(llm, stub_groq):
+    stub_groq.push(status=404, content="no such model")
+
+    with pytest.raises(LLMResponseError):
+        asyncio.run(llm.acall_llm("prompt"))
+
+
+def test_rate_limit_wait_is_capped(llm, stub_groq, monkeypatch):
+    # One token, refilled every 100 s: the second call would wait ~100 s
+    monkeypatch.setattr(llm, "_bucket", TokenBucket(0.01, 1))
+    monkeypatch.setattr(llm, "LLM_RATE_LIMIT_MAX_WAIT_SECONDS", 0.5)
+    assert llm.call_llm("first") == "ok"
+
+    start = time.monotonic()
+    with pytest.raises(LLMRateLimitError):
+        llm.call_llm("second")
+    assert time.monotonic() - start < 0.5
+    assert len(stub_groq.requests) == 1
+
+
+def test_refused_reservation_takes_no_token():
+    bucket = TokenBucket(1.0, 1)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve(max_wait=0.1) is None
+    assert 0.5 < bucket.reserve() <= 1.0
+
+
+def test_backoff_honours_retry_after_up_to_the_cap():
+    error = LLMRateLimitError("slow down", retry_after=2.0)
+    assert _backoff_delay(0, error) >= min(2.0, LLM_BACKOFF_MAX_SECONDS)
+    error = LLMRateLimitError("slow down", retry_after=1000.0)
+    assert _backoff_delay(0, error) <= LLM_BACKOFF_MAX_SECONDS
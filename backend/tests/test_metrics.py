@@ -0,0 +1,24 @@
+from utils import metrics
+from utils.metrics import timed_stream
+
+
+def _count(stage: str) -> int:
+    key = metrics._key("stage_duration_seconds", {"stage": stage})
+    histogram = metrics._histograms.get(key)
+    return histogram["count"] if histogram else 0
+
+
+def test_timed_stream_records_exhausted_and_closed_streams():
+    @timed_stream("test_stream")
+    def tokens():
+        yield "a"
+        yield "b"
+
+    before = _count("test_stream")
+    assert list(tokens()) == ["a", "b"]
+
+    stream = tokens()
+    next(stream)
+    stream.close()
+
+    assert _count("test_stream") == before + 2
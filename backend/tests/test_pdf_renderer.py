@@ -0,0 +1,33 @@
+from app import create_app
+from utils.pdf_renderer import render_report_pdf, _inline, _paragraph, PDF_MAX_REPORT_CHARS
+
+
+def test_code_spans_are_not_read_as_bold():
+    markup = _inline("Squares: `a**2` + `b**2` is **the** formula")
+    assert markup == (
+        'Squares: <font face="Courier">a**2</font> + '
+        '<font face="Courier">b**2</font> is <b>the</b> formula'
+    )
+
+
+def test_python_flavoured_report_renders():
+    report = (
+        "1. Final Score & Verdict\n"
+        "- Final Score: 6/10\n"
+        "Squares: `a**2` + `b**2` is the formula\n"
+        "- **Note:** `__init__` and `x ** y` vs `<T>` & `**kwargs`\n"
+    )
+    assert render_report_pdf(report).startswith(b"%PDF")
+
+
+def test_unparseable_markup_falls_back_to_plain_text():
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    paragraph = _paragraph("<b>unclosed", "<b>unclosed", getSampleStyleSheet()["BodyText"])
+    assert "unclosed" in paragraph.getPlainText()
+
+
+def test_route_rejects_oversized_reports():
+    client = create_app().test_client()
+    response = client.post("/api/interview/report/pdf", json={"report": "x" * (PDF_MAX_REPORT_CHARS + 1)})
+    assert response.status_code == 413
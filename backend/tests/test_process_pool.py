@@ -0,0 +1,23 @@
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.process_pool import retire_executor
+
+
+def test_retired_pool_finishes_other_jobs_and_kills_the_stuck_one():
+    executor = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    stuck = executor.submit(time.sleep, 60)
+    healthy = executor.submit(time.sleep, 0.5)
+    queued = executor.submit(pow, 2, 10)
+    processes = list(executor._processes.values())
+
+    retire_executor(executor, 2.0)
+
+    assert healthy.result(10) is None
+    assert queued.result(10) == 1024
+    deadline = time.monotonic() + 10
+    while any(p.is_alive() for p in processes) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not any(p.is_alive() for p in processes)
+    assert stuck.exception(10) is not None
@@ -0,0 +1,39 @@
+from core import question_bank
+from core.question_generator import generate_next_question
+
+
+def _bank(monkeypatch):
+    monkeypatch.setattr(question_bank, "QUESTION_BANK_ENABLED", True)
+    monkeypatch.setattr(question_bank, "_index", {
+        "Python|Warm-up": [("conceptual", "What is a Python list?")]
+    })
+
+
+def test_technical_interviews_draw_from_the_bank(monkeypatch):
+    _bank(monkeypatch)
+    question = question_bank.draw_question("Python", "Warm-up", [], role="Technical")
+    assert question == "What is a Python list?"
+
+
+def test_other_roles_never_get_bank_questions(monkeypatch):
+    _bank(monkeypatch)
+    for role in ("HR", "Behavioral"):
+        assert question_bank.draw_question("Python", "Warm-up", [], role=role) is None
+
+
+def test_hr_question_is_generated_live(monkeypatch):
+    _bank(monkeypatch)
+    prompts = []
+    # Warm-up questions go through the question cache; make it a pass-through
+    monkeypatch.setattr("core.question_generator.cached_question", lambda inputs, history, generate: generate())
+    monkeypatch.setattr(
+        "core.question_generator._cacheable_llm_question",
+        lambda prompt: prompts.append(prompt) or "Tell me about a conflict you resolved?"
+    )
+
+    question = generate_next_question(
+        role="HR", topic="Python", confidence=5, competence_summary="Interview started",
+        qa_history=[], is_fresher=True
+    )
+    assert question != "What is a Python list?"
+    assert prompts and "Interview type: HR" in prompts[0]
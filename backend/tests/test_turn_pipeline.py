@@ -0,0 +1,38 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core import turn_pipeline
+
+
+def test_dropped_speculation_finishes_before_the_turn_returns(monkeypatch):
+    counted = []
+    monkeypatch.setattr(turn_pipeline, "inc", lambda name, **labels: counted.append((name, labels)))
+    started, finished = threading.Event(), threading.Event()
+
+    def speculate():
+        started.set()
+        threading.Event().wait(0.2)
+        finished.set()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        speculative = pool.submit(speculate)
+        assert started.wait(5)
+        turn_pipeline._drop_speculation(speculative)
+
+    assert finished.is_set()
+    assert counted == [("speculation_wasted_total", {"reason": "plan"})]
+
+
+def test_queued_speculation_is_cancelled(monkeypatch):
+    counted = []
+    monkeypatch.setattr(turn_pipeline, "inc", lambda name, **labels: counted.append((name, labels)))
+    release = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(release.wait, 5)
+        speculative = pool.submit(lambda: "never")
+        turn_pipeline._drop_speculation(speculative)
+        release.set()
+
+    assert speculative.cancelled()
+    assert counted == []
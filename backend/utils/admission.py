@@ -0,0 +1,275 @@
+"""
+Admission control for the LLM-bound interview routes.
+
+    @interview_bp.route("/answer", methods=["POST"])
+    @admitted("answer")
+    def submit_answer(): ...
+
+- at most ADMISSION_MAX_ACTIVE admitted requests per process; the last
+  ADMISSION_RESERVED_FOR_ANSWERS slots are only for running interviews
+  (/answer), so a burst of new candidates cannot starve them
+- at most ADMISSION_MAX_PER_CLIENT running requests per client; more
+  from the same client (e.g. candidates behind one NAT) wait their turn,
+  up to as many again
+- the rest wait in a bounded priority queue (answer > start > batch,
+  FIFO within a kind) until their kind's deadline; a waiter held back
+  by its client's limit does not block the ones behind it; when the
+  queue is full a higher-priority request takes the place of the newest
+  lower-priority one
+- rejected requests get 429 with Retry-After and their queue position
+
+A slot is held until the response is closed, so SSE streams count for
+their whole duration. Limits are per worker process.
+"""
+
+import os
+import math
+import time
+import bisect
+import itertools
+import threading
+import functools
+from collections import defaultdict
+
+from flask import request, jsonify, make_response
+
+from utils.metrics import inc, observe, register_collector
+
+ADMISSION_MAX_ACTIVE = int(os.getenv("ADMISSION_MAX_ACTIVE", "32"))
+ADMISSION_RESERVED_FOR_ANSWERS = int(os.getenv("ADMISSION_RESERVED_FOR_ANSWERS", "8"))
+# Running requests per client; as many again may wait. 0 disables the
+# per-client limit (e.g. load tests from one host)
+ADMISSION_MAX_PER_CLIENT = int(os.getenv("ADMISSION_MAX_PER_CLIENT", "8"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+# Proxies in front of the app (set 1 on Render); the client address is
+# taken that many entries from the right of X-Forwarded-For, since
+# anything left of it is supplied by the client. 0 ignores the header.
+ADMISSION_TRUSTED_PROXIES = int(os.getenv("ADMISSION_TRUSTED_PROXIES", "0"))
+
+PRIORITIES = {"answer": 0, "start": 1, "batch": 2}
+WAIT_SECONDS = {
+    "answer": float(os.getenv("ADMISSION_ANSWER_WAIT_SECONDS", "30")),
+    "start": float(os.getenv("ADMISSION_START_WAIT_SECONDS", "10")),
+    "batch": float(os.getenv("ADMISSION_BATCH_WAIT_SECONDS", "5"))
+}
+
+BUSY_ERROR = "Server is busy. Please retry shortly."
+
+# Initial guess of one request's duration, refined per kind (EWMA)
+DEFAULT_SERVICE_SECONDS = 3.0
+SERVICE_EWMA_ALPHA = 0.2
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str, position: int, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.position = position
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    def __init__(self, kind: str, client: str, seq: int):
+        self.kind = kind
+        self.client = client
+        self.key = (PRIORITIES[kind], seq)
+        self.evicted = False
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+class Ticket:
+    def __init__(self, controller, kind: str, client: str):
+        self.controller = controller
+        self.kind = kind
+        self.client = client
+        self.start = time.perf_counter()
+        self.released = False
+
+    def release(self):
+        self.controller.release(self)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_active: int = ADMISSION_MAX_ACTIVE,
+        reserved_for_answers: int = ADMISSION_RESERVED_FOR_ANSWERS,
+        max_per_client: int = ADMISSION_MAX_PER_CLIENT,
+        queue_size: int = ADMISSION_QUEUE_SIZE
+    ):
+        self.max_active = max_active
+        self.reserved = min(reserved_for_answers, max_active - 1)
+        self.max_per_client = max_per_client
+        self.queue_size = queue_size
+        self.cond = threading.Condition()
+        self.active = 0
+        self.running = defaultdict(int)   # per client
+        self.queued = defaultdict(int)    # waiting per client
+        self.waiting = []                 # sorted _Waiter list
+        self.seq = itertools.count()
+        self.service = {}                 # kind -> EWMA seconds
+
+    # ---------------- helpers (call with cond held) ----------------
+    def _limit(self, kind: str) -> int:
+        return self.max_active if kind == "answer" else self.max_active - self.reserved
+
+    def _retry_after(self, kind: str, position: int) -> int:
+        service = self.service.get(kind, DEFAULT_SERVICE_SECONDS)
+        return max(1, math.ceil(position * service / self.max_active))
+
+    def _reject(self, reason: str, kind: str, position: int):
+        inc("admission_total", kind=kind, outcome=reason)
+        return Rejected(reason, position, self._retry_after(kind, position))
+
+    def _runnable(self, client: str) -> bool:
+        return not self.max_per_client or self.running[client] < self.max_per_client
+
+    def _next_waiter(self):
+        """
+        First waiter whose client is under its limit, or None.
+        """
+        for waiter in self.waiting:
+            if self._runnable(waiter.client):
+                return waiter
+        return None
+
+    @staticmethod
+    def _count(counts: dict, client: str, delta: int):
+        counts[client] += delta
+        if counts[client] <= 0:
+            del counts[client]
+
+    def _start(self, kind: str, client: str) -> Ticket:
+        self.active += 1
+        self._count(self.running, client, 1)
+        return Ticket(self, kind, client)
+
+    # ---------------- public ----------------
+    def acquire(self, kind: str, client: str) -> Ticket:
+        """
+        Blocks until admitted; raises Rejected (full, per-client limit,
+        deadline, or evicted by a higher-priority request).
+        """
+        start = time.perf_counter()
+        deadline = time.monotonic() + WAIT_SECONDS[kind]
+
+        with self.cond:
+            if (
+                self._runnable(client)
+                and self._next_waiter() is None
+                and self.active < self._limit(kind)
+            ):
+                inc("admission_total", kind=kind, outcome="admitted")
+                return self._start(kind, client)
+
+            if self.max_per_client and self.queued[client] >= self.max_per_client:
+                raise self._reject("client_limit", kind, len(self.waiting) + 1)
+
+            waiter = _Waiter(kind, client, next(self.seq))
+            if len(self.waiting) >= self.queue_size:
+                worst = self.waiting[-1]
+                if worst.key[0] <= waiter.key[0]:
+                    raise self._reject("queue_full", kind, len(self.waiting) + 1)
+                # Newest lower-priority waiter gives up its place
+                self.waiting.pop()
+                worst.evicted = True
+
+            bisect.insort(self.waiting, waiter)
+            self._count(self.queued, client, 1)
+            self.cond.notify_all()
+
+            while True:
+                if waiter.evicted:
+                    self._count(self.queued, client, -1)
+                    raise self._reject("evicted", kind, len(self.waiting) + 1)
+
+                if self._next_waiter() is waiter and self.active < self._limit(kind):
+                    self.waiting.remove(waiter)
+                    self._count(self.queued, client, -1)
+                    ticket = self._start(kind, client)
+                    inc("admission_total", kind=kind, outcome="queued")
+                    observe("admission_wait_seconds", time.perf_counter() - start, kind=kind)
+                    # The next waiter may fit too (e.g. an answer behind a start)
+                    self.cond.notify_all()
+                    return ticket
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    position = self.waiting.index(waiter) + 1
+                    self.waiting.remove(waiter)
+                    self._count(self.queued, client, -1)
+                    self.cond.notify_all()
+                    raise self._reject("timeout", kind, position)
+                self.cond.wait(remaining)
+
+    def release(self, ticket: Ticket):
+        with self.cond:
+            if ticket.released:
+                return
+            ticket.released = True
+            self.active -= 1
+            self._count(self.running, ticket.client, -1)
+
+            seconds = time.perf_counter() - ticket.start
+            previous = self.service.get(ticket.kind)
+            self.service[ticket.kind] = seconds if previous is None else (
+                previous + SERVICE_EWMA_ALPHA * (seconds - previous)
+            )
+            self.cond.notify_all()
+
+    def collect(self):
+        with self.cond:
+            yield "admission_active", "gauge", {}, self.active
+            yield "admission_waiting", "gauge", {}, len(self.waiting)
+
+
+controller = AdmissionController()
+register_collector(controller.collect)
+
+
+def client_id() -> str:
+    hops = [
+        hop.strip()
+        for hop in request.headers.get("X-Forwarded-For", "").split(",")
+        if hop.strip()
+    ]
+    if ADMISSION_TRUSTED_PROXIES and len(hops) >= ADMISSION_TRUSTED_PROXIES:
+        return hops[-ADMISSION_TRUSTED_PROXIES]
+    return request.remote_addr or "unknown"
+
+
+def busy_response(rejected: Rejected):
+    response = jsonify({
+        "error": BUSY_ERROR,
+        "queue_position": rejected.position,
+        "retry_after": rejected.retry_after
+    })
+    response.status_code = 429
+    response.headers["Retry-After"] = str(rejected.retry_after)
+    return response
+
+
+def admitted(kind: str):
+    """
+    View decorator; kind is "answer", "start" or "batch".
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                ticket = controller.acquire(kind, client_id())
+            except Rejected as rejected:
+                return busy_response(rejected)
+
+            try:
+                response = make_response(view(*args, **kwargs))
+            except Exception:
+                ticket.release()
+                raise
+            # Streams keep the slot until the last chunk is sent
+            response.call_on_close(ticket.release)
+            return response
+        return wrapper
+    return decorator
@@ -1,5 +1,37 @@
+import os
 import re
-import requests
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import inc, span, register_collector
+
+GITHUB_API = "https://api.github.com"
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+GITHUB_TIMEOUT_SECONDS = float(os.getenv("GITHUB_TIMEOUT_SECONDS", "10"))
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "16"))
+GITHUB_FETCH_WORKERS = int(os.getenv("GITHUB_FETCH_WORKERS", "4"))
+GITHUB_CACHE_DIR = os.getenv(
+    "GITHUB_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "interview-github-cache")
+)
+# Cached responses younger than this are served without revalidation
+GITHUB_CACHE_FRESH_SECONDS = int(os.getenv("GITHUB_CACHE_FRESH_SECONDS", "300"))
+# Least recently used entries beyond this are removed
+GITHUB_CACHE_MAX_FILES = int(os.getenv("GITHUB_CACHE_MAX_FILES", "2000"))
+
+FILE_CHAR_LIMIT = 3000
+
+_session = None
+_session_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=GITHUB_FETCH_WORKERS)
+
+# Last X-RateLimit-* headers seen; while exhausted only the cache is used
+_rate_limit = {"remaining": None, "reset": 0.0}
+_rate_limit_lock = threading.Lock()
 
 
 def is_valid_github_url(url: str) -> bool:
@@ -10,56 +42,227 @@ def extract_repo_name(repo_url: str) -> str:
     return repo_url.rstrip("/").split("/")[-1]
 
 
-def fetch_readme(repo_url: str) -> str:
+def repo_slug(repo_url: str) -> str:
     """
-    Fetch README content from GitHub repository
-    Works reliably on Render / Railway
+    "https://github.com/owner/repo(.git)/..." -> "owner/repo"
     """
+    parts = repo_url.rstrip("/").split("github.com/", 1)[-1].split("/")
+    owner, name = parts[0], parts[1] if len(parts) > 1 else ""
+    if name.endswith(".git"):
+        name = name[:-4]
+    return f"{owner}/{name}"
+
+
+# ======================================================
+# HTTP + DISK CACHE
+# ======================================================
+def get_session():
+    """
+    Shared requests.Session, created (and requests imported) on first
+    use; project interviews are the only caller.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=GITHUB_POOL_SIZE,
+                    pool_maxsize=GITHUB_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.headers["User-Agent"] = "AI-Mock-Interviewer"
+                if GITHUB_TOKEN:
+                    session.headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+                _session = session
+    return _session
+
+
+def _cache_path(slug: str, ref: str, resource: str) -> str:
+    key = hashlib.sha1(f"{slug}|{ref}|{resource}".encode("utf-8")).hexdigest()
+    return os.path.join(GITHUB_CACHE_DIR, f"{key}.json")
+
+
+def _read_cache(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        os.utime(path)  # keeps recently used entries out of the prune
+        return entry
+    except (OSError, ValueError):
+        return None
+
+
+def _prune_cache():
+    try:
+        files = [
+            os.path.join(GITHUB_CACHE_DIR, f)
+            for f in os.listdir(GITHUB_CACHE_DIR)
+            if f.endswith(".json")
+        ]
+        if len(files) <= GITHUB_CACHE_MAX_FILES:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - GITHUB_CACHE_MAX_FILES]:
+            os.remove(path)
+    except OSError as e:
+        print("GitHub cache prune error:", e)
+
+
+def _write_cache(path: str, entry: dict):
     try:
-        api = repo_url.replace("github.com", "api.github.com/repos")
-        url = f"{api}/readme"
+        os.makedirs(GITHUB_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=GITHUB_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print("GitHub cache write error:", e)
+        return
+    _prune_cache()
+
+
+def _record_rate_limit(response):
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    if remaining is None:
+        return
+    with _rate_limit_lock:
+        _rate_limit["remaining"] = int(remaining)
+        if reset is not None:
+            _rate_limit["reset"] = float(reset)
+
 
-        headers = {
-            "Accept": "application/vnd.github.v3.raw",
-            "User-Agent": "AI-Mock-Interviewer"
-        }
+def rate_limited() -> bool:
+    with _rate_limit_lock:
+        return _rate_limit["remaining"] == 0 and time.time() < _rate_limit["reset"]
 
-        r = requests.get(url, headers=headers, timeout=15)
 
-        if r.status_code == 200 and r.text.strip():
-            return r.text
+def rate_limit_status() -> dict:
+    with _rate_limit_lock:
+        return dict(_rate_limit)
 
-        return ""
 
-    except Exception as e:
-        print("README fetch error:", e)
-        return ""
+def _collect_metrics():
+    remaining = rate_limit_status()["remaining"]
+    if remaining is not None:
+        yield "github_rate_limit_remaining", "gauge", {}, remaining
 
 
+register_collector(_collect_metrics)
+
+
+def _github_get(
+    slug: str,
+    resource: str,
+    ref: str = "HEAD",
+    accept: str = "application/vnd.github.v3.raw"
+):
+    """
+    GET {GITHUB_API}/repos/{slug}/{resource} through the disk cache.
+    Fresh entries are served directly, older ones are revalidated with
+    If-None-Match (a 304 does not count against the rate limit).
+    Returns the body text, "" for a cached 404, or None if unavailable.
+    """
+    path = _cache_path(slug, ref, resource)
+    entry = _read_cache(path)
+
+    if entry and time.time() - entry["fetched_at"] < GITHUB_CACHE_FRESH_SECONDS:
+        inc("github_requests_total", outcome="fresh")
+        return entry["body"]
+
+    if rate_limited():
+        # Stale data beats an error page while the quota is exhausted
+        inc("github_requests_total", outcome="rate_limited")
+        return entry["body"] if entry else None
+
+    headers = {"Accept": accept}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+
+    session = get_session()
+    import requests
+
+    try:
+        with span("github_fetch"):
+            r = session.get(
+                f"{GITHUB_API}/repos/{slug}/{resource}",
+                headers=headers,
+                timeout=GITHUB_TIMEOUT_SECONDS
+            )
+    except requests.RequestException as e:
+        print("GitHub fetch error:", e)
+        inc("github_requests_total", outcome="error")
+        return entry["body"] if entry else None
+
+    _record_rate_limit(r)
+
+    if r.status_code == 304 and entry:
+        inc("github_requests_total", outcome="revalidated")
+        entry["fetched_at"] = time.time()
+        _write_cache(path, entry)
+        return entry["body"]
+
+    if r.status_code in (200, 404):
+        body = r.text if r.status_code == 200 else ""
+        inc("github_requests_total", outcome="fetched" if body else "not_found")
+        _write_cache(path, {
+            "etag": r.headers.get("ETag"),
+            "fetched_at": time.time(),
+            "body": body
+        })
+        return body
+
+    print("GitHub fetch error:", r.status_code, slug, resource)
+    inc("github_requests_total", outcome="error")
+    return entry["body"] if entry else None
+
+
+# ======================================================
+# REPOSITORY CONTENT
+# ======================================================
+def fetch_readme(repo_url: str, ref: str = "HEAD") -> str:
+    """
+    Fetch README content from GitHub repository
+    Works reliably on Render / Railway
+    """
+    resource = "readme" if ref == "HEAD" else f"readme?ref={ref}"
+    readme = _github_get(repo_slug(repo_url), resource, ref)
+    return readme if readme and readme.strip() else ""
+
+
+# Also the README sections prompt budgets keep first (utils/prompt_budget.py)
+STRONG_README_KEYWORDS = ["architecture", "features", "workflow", "tech stack", "design"]
+
 
 def is_strong_readme(readme: str) -> bool:
     if not readme:
         return False
-    keywords = ["architecture", "features", "workflow", "tech stack", "design"]
-    return len(readme.split()) > 150 or any(k in readme.lower() for k in keywords)
+    return len(readme.split()) > 150 or any(k in readme.lower() for k in STRONG_README_KEYWORDS)
 
 
-def fetch_repo_tree(repo_url: str) -> list[str]:
+def fetch_repo_tree(repo_url: str, ref: str = "HEAD") -> list[str]:
     """
     Fetch full repository file tree (for future code-based interview)
     """
+    body = _github_get(
+        repo_slug(repo_url),
+        f"git/trees/{ref}?recursive=1",
+        ref,
+        accept="application/vnd.github+json"
+    )
+    if not body:
+        return []
     try:
-        api = repo_url.replace("github.com", "api.github.com/repos")
-        url = f"{api}/git/trees/HEAD?recursive=1"
-        r = requests.get(url, timeout=10)
-        if r.status_code != 200:
-            return []
         return [
             f["path"]
-            for f in r.json().get("tree", [])
+            for f in json.loads(body).get("tree", [])
             if f.get("type") == "blob"
         ]
-    except Exception:
+    except ValueError:
         return []
 
 
@@ -84,15 +287,29 @@ def select_important_files(paths, limit=4):
     return chosen
 
 
-def fetch_file_content(repo_url: str, path: str) -> str:
+def fetch_file_content(repo_url: str, path: str, ref: str = "HEAD") -> str:
     """
     Fetch file content (used later for deep code interviews)
     """
-    try:
-        api = repo_url.replace("github.com", "api.github.com/repos")
-        url = f"{api}/contents/{path}"
-        headers = {"Accept": "application/vnd.github.v3.raw"}
-        r = requests.get(url, headers=headers, timeout=10)
-        return r.text[:3000] if r.status_code == 200 else ""
-    except Exception:
-        return ""
+    resource = f"contents/{path}" if ref == "HEAD" else f"contents/{path}?ref={ref}"
+    content = _github_get(repo_slug(repo_url), resource, ref)
+    return content[:FILE_CHAR_LIMIT] if content else ""
+
+
+def fetch_files(repo_url: str, paths, ref: str = "HEAD") -> dict:
+    """
+    Fetches several files in parallel. Returns {path: content}.
+    """
+    contents = _executor.map(
+        lambda p: fetch_file_content(repo_url, p, ref),
+        paths
+    )
+    return dict(zip(paths, contents))
+
+
+def fetch_important_files(repo_url: str, limit: int = 4, ref: str = "HEAD") -> dict:
+    return fetch_files(
+        repo_url,
+        select_important_files(fetch_repo_tree(repo_url, ref), limit),
+        ref
+    )
@@ -0,0 +1,101 @@
+"""
+Idempotent interview turns.
+
+Clients send an Idempotency-Key per turn (the web client uses
+"<session_id>:<question index>"), reused on every retry of that turn.
+
+- replay:   the last turn's response is kept on the session, so a retry
+            after the turn finished gets the same response without
+            re-running any LLM call (works across workers with a
+            shared session store)
+- in-flight: concurrent requests with the same key share one
+            computation (per process); a different key for a session
+            that already has a turn running is rejected
+
+Requests without a key fall back to a derived key (turn number +
+answer hash): duplicates in flight are still shared, but a finished
+turn cannot be told apart from a new turn with the same answer, so it
+is not replayed.
+"""
+
+import os
+import hashlib
+import threading
+from concurrent.futures import Future
+
+from utils.metrics import inc
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# How long a duplicate request waits for the original turn
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "120"))
+
+# session_id -> (key, Future of the response payload)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+class TurnInProgress(Exception):
+    """
+    Another turn (different key) is running for this session.
+    """
+
+
+def turn_key(client_key: str, session: dict, answer: str) -> tuple:
+    """
+    (key, replayable). Derived keys are only used for in-flight sharing.
+    """
+    if client_key:
+        return f"client:{client_key[:200]}", True
+    digest = hashlib.sha256(answer.encode("utf-8")).hexdigest()[:16]
+    return f"derived:{session['question_count']}:{digest}", False
+
+
+def replay(session: dict, key: str):
+    """
+    The stored response if key is the session's last finished turn.
+    """
+    last = session.get("last_turn")
+    if last and last["key"] == key:
+        inc("idempotency_total", outcome="replayed")
+        return last["response"]
+    return None
+
+
+def remember(session: dict, key: str, response: dict):
+    # Only the latest turn can be retried, so only it is kept
+    session["last_turn"] = {"key": key, "response": response}
+
+
+def claim(session_id: str, key: str) -> tuple:
+    """
+    (owner, future). The owner runs the turn and must call release();
+    others wait on future.result(IDEMPOTENCY_WAIT_SECONDS).
+    Raises TurnInProgress for a different key.
+    """
+    with _inflight_lock:
+        entry = _inflight.get(session_id)
+        if entry is None:
+            future = Future()
+            _inflight[session_id] = (key, future)
+            return True, future
+        running_key, future = entry
+
+    if running_key != key:
+        inc("idempotency_total", outcome="conflict")
+        raise TurnInProgress(session_id)
+    inc("idempotency_total", outcome="shared")
+    return False, future
+
+
+def release(session_id: str, future: Future, response: dict = None, error: Exception = None):
+    with _inflight_lock:
+        entry = _inflight.get(session_id)
+        if entry is not None and entry[1] is future:
+            _inflight.pop(session_id)
+
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(response)
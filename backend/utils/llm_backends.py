@@ -0,0 +1,347 @@
+"""
+LLM backends used by utils.llm_client (selected with LLM_BACKEND).
+
+groq  the real provider (default)
+fake  deterministic local stand-in for load tests, benchmarks and CI:
+      template-aware canned responses, configurable latency, token rate
+      and failure injection; no network or API key needed
+
+A backend exposes complete(), stream() and acomplete() with the
+call_llm arguments (json_mode asks for a JSON object) and raises
+provider errors; limits, retries and
+error translation stay in llm_client. complete() / acomplete() return
+(text, usage) where usage is {"prompt_tokens", "completion_tokens"}
+or None.
+"""
+
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import weakref
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")
+
+# ---------------- FAKE BACKEND ----------------
+# fixed:<ms> | uniform:<min_ms>:<max_ms> | lognormal:<median_ms>:<sigma>
+LLM_FAKE_LATENCY_MS = os.getenv("LLM_FAKE_LATENCY_MS", "lognormal:400:0.4")
+LLM_FAKE_TOKENS_PER_SECOND = float(os.getenv("LLM_FAKE_TOKENS_PER_SECOND", "250"))
+LLM_FAKE_FAILURE_RATE = float(os.getenv("LLM_FAKE_FAILURE_RATE", "0"))
+LLM_FAKE_FAILURE_KINDS = os.getenv("LLM_FAKE_FAILURE_KINDS", "rate_limit,timeout,unavailable")
+LLM_FAKE_SEED = int(os.getenv("LLM_FAKE_SEED", "7"))
+
+
+# ======================================================
+# GROQ
+# ======================================================
+class GroqBackend:
+    name = "groq"
+
+    def __init__(self, model, base_url=None, timeout=30.0, max_connections=8):
+        self.model = model
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+        self._client_lock = threading.Lock()
+        # httpx async pools are bound to the event loop that created them
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _limits(self):
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections
+        )
+
+    @property
+    def client(self):
+        # Created on first use so importing the app needs no API key
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+                    from groq import Groq
+
+                    self._client = Groq(
+                        api_key=os.getenv("GROQ_API_KEY"),
+                        base_url=self.base_url,
+                        max_retries=0,
+                        timeout=self.timeout,
+                        http_client=httpx.Client(limits=self._limits(), timeout=self.timeout)
+                    )
+        return self._client
+
+    def _async_client(self):
+        loop = asyncio.get_running_loop()
+        async_client = self._async_clients.get(loop)
+        if async_client is None:
+            import httpx
+            from groq import AsyncGroq
+
+            async_client = AsyncGroq(
+                api_key=os.getenv("GROQ_API_KEY"),
+                base_url=self.base_url,
+                max_retries=0,
+                timeout=self.timeout,
+                http_client=httpx.AsyncClient(limits=self._limits(), timeout=self.timeout)
+            )
+            self._async_clients[loop] = async_client
+        return async_client
+
+    @staticmethod
+    def _result(completion) -> tuple:
+        text = completion.choices[0].message.content if completion.choices else None
+        usage = None
+        if completion.usage:
+            usage = {
+                "prompt_tokens": completion.usage.prompt_tokens,
+                "completion_tokens": completion.usage.completion_tokens
+            }
+        return text, usage
+
+    def _request(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool) -> dict:
+        request = dict(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        if json_mode:
+            # JSON mode needs the word "JSON" in the prompt; ours all ask for it
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def complete(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False) -> tuple:
+        return self._result(self.client.chat.completions.create(
+            **self._request(prompt, temperature, max_tokens, json_mode)
+        ))
+
+    async def acomplete(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False) -> tuple:
+        return self._result(await self._async_client().chat.completions.create(
+            **self._request(prompt, temperature, max_tokens, json_mode)
+        ))
+
+    def stream(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False):
+        stream = self.client.chat.completions.create(
+            stream=True,
+            **self._request(prompt, temperature, max_tokens, json_mode)
+        )
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        finally:
+            # Frees the connection when the caller stops reading early
+            stream.close()
+
+
+# ======================================================
+# FAKE
+# ======================================================
+FAKE_TOPICS = [
+    "caching", "indexing", "concurrency", "error handling", "memory management",
+    "API design", "testing", "data modelling", "scalability", "recursion"
+]
+
+
+def parse_latency(spec: str):
+    """
+    Returns a function rng -> seconds for a LLM_FAKE_LATENCY_MS spec.
+    """
+    kind, *args = spec.split(":")
+    args = [float(a) for a in args]
+    if kind == "fixed":
+        return lambda rng: args[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1]) / 1000
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(0, args[1]) * args[0] / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeBackend:
+    """
+    Response text depends only on the prompt, so runs are repeatable.
+    Latency and failures come from one seeded stream.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: str = LLM_FAKE_LATENCY_MS,
+        tokens_per_second: float = LLM_FAKE_TOKENS_PER_SECOND,
+        failure_rate: float = LLM_FAKE_FAILURE_RATE,
+        failure_kinds: str = LLM_FAKE_FAILURE_KINDS,
+        seed: int = LLM_FAKE_SEED
+    ):
+        self.latency = parse_latency(latency)
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self.failure_kinds = [k.strip() for k in failure_kinds.split(",") if k.strip()]
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.calls = 0
+
+    # ---------------- timing / failures ----------------
+    def _plan(self):
+        """
+        (first_token_delay, failure_kind or None) for the next call.
+        """
+        with self._rng_lock:
+            self.calls += 1
+            delay = self.latency(self._rng)
+            failed = self._rng.random() < self.failure_rate
+            kind = self._rng.choice(self.failure_kinds) if failed and self.failure_kinds else None
+        return delay, kind
+
+    @staticmethod
+    def _raise(kind: str):
+        from utils.llm_client import (
+            LLMRateLimitError,
+            LLMTimeoutError,
+            LLMUnavailableError,
+            LLMResponseError
+        )
+
+        if kind == "rate_limit":
+            raise LLMRateLimitError("Fake rate limit", retry_after=0.1)
+        if kind == "timeout":
+            raise LLMTimeoutError("Fake timeout")
+        if kind == "unavailable":
+            raise LLMUnavailableError("Fake 503", 503)
+        raise LLMResponseError(f"Fake {kind} error", 400)
+
+    @staticmethod
+    def _usage(prompt: str, text: str) -> dict:
+        return {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(text) // 4}
+
+    def _generation_seconds(self, text: str) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return (len(text) / 4) / self.tokens_per_second
+
+    # ---------------- responses ----------------
+    def respond(self, prompt: str) -> str:
+        digest = hashlib.sha1(f"{self.seed}|{prompt}".encode("utf-8")).digest()
+        rng = random.Random(digest)
+        topic = rng.choice(FAKE_TOPICS)
+
+        if "Evaluate EACH" in prompt:
+            ids = [int(i) for i in re.findall(r"Answer id: (\d+)", prompt)]
+            return json.dumps({"evaluations": [
+                dict(self._evaluation(rng), id=i) for i in ids
+            ]})
+        if "interview plan" in prompt:
+            count = len(re.findall(r"^Q\d+ \(", prompt, re.MULTILINE))
+            return json.dumps({"questions": [
+                {
+                    "question": f"How does {rng.choice(FAKE_TOPICS)} work in case {rng.randint(1, 10**6)}?",
+                    "easier": f"What is {rng.choice(FAKE_TOPICS)}?",
+                    "deeper": f"What breaks in {rng.choice(FAKE_TOPICS)} at {rng.randint(2, 50)}x load, and why?"
+                }
+                for _ in range(count)
+            ]})
+        if "question bank" in prompt:
+            count = int((re.search(r"Write (\d+) DIFFERENT", prompt) or [0, 5])[1])
+            return json.dumps({"questions": [
+                f"How would you approach {rng.choice(FAKE_TOPICS)} in case {rng.randint(1, 10**6)}?"
+                for _ in range(count)
+            ]})
+        if "depth_assessment" in prompt:
+            return json.dumps(self._evaluation(rng))
+        if "Estimate competence" in prompt:
+            return json.dumps({
+                "estimated_competence": rng.randint(3, 8),
+                "confidence_alignment": rng.choice(["overconfident", "underconfident", "aligned"]),
+                "weak_areas": [topic],
+                "next_question_intent": rng.choice(["easier", "similar", "deeper", "focused"]),
+                "reasoning": f"Answers on {topic} were uneven."
+            })
+        if "evaluation of this answer" in prompt:
+            return "- Covered the basics\n- Needs more depth on edge cases"
+        if "interview report" in prompt:
+            return self._report(prompt, rng)
+        return (
+            f"How would you handle {topic} when the load on your service "
+            f"grows {rng.randint(2, 50)}x, and what trade-offs would you make?"
+        )
+
+    @staticmethod
+    def _evaluation(rng) -> dict:
+        score = rng.randint(2, 9)
+        return {
+            "score": score,
+            "technical_accuracy": score,
+            "communication_clarity": rng.randint(3, 9),
+            "problem_solving": rng.randint(3, 9),
+            "strengths": "Explained the core idea.",
+            "weaknesses": "Missed some edge cases.",
+            "depth_assessment": rng.choice(["surface", "moderate", "deep"])
+        }
+
+    @staticmethod
+    def _report(prompt: str, rng) -> str:
+        questions = re.findall(r"^Q(\d+): (.+)$", prompt, re.MULTILINE)
+        review = "\n\n".join(
+            f"Q{n}. Question:\n{q}\n\nCandidate Answer:\n(as given)\n\n"
+            f"Evaluation:\n- Covered the basics\n- Needs more depth"
+            for n, q in questions
+        )
+        review = f"6. Question-wise Review\n{review}\n\n" if review else ""
+        return (
+            "1. Final Score & Verdict\n"
+            f"- Final Score: {rng.randint(3, 8)}/10\n"
+            "- Verdict: Borderline\n\n"
+            "2. Overall Performance Summary\nA fair attempt overall.\n\n"
+            "3. Strengths\n- Clear communication\n\n"
+            "4. Areas for Improvement\n- Needs more practice with edge cases\n\n"
+            "5. Confidence vs Competence\nRoughly aligned.\n\n"
+            f"{review}"
+            "7. Actionable Next Steps\n- Practise system design\n- Review core data structures"
+        )
+
+    # ---------------- backend interface ----------------
+    def complete(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False) -> tuple:
+        delay, failure = self._plan()
+        time.sleep(delay)
+        if failure:
+            self._raise(failure)
+        text = self.respond(prompt)
+        time.sleep(self._generation_seconds(text))
+        return text, self._usage(prompt, text)
+
+    async def acomplete(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False) -> tuple:
+        delay, failure = self._plan()
+        await asyncio.sleep(delay)
+        if failure:
+            self._raise(failure)
+        text = self.respond(prompt)
+        await asyncio.sleep(self._generation_seconds(text))
+        return text, self._usage(prompt, text)
+
+    def stream(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False):
+        delay, failure = self._plan()
+        time.sleep(delay)
+        if failure:
+            self._raise(failure)
+        text = self.respond(prompt)
+        for piece in re.findall(r"\S+\s*|\s+", text):
+            time.sleep(self._generation_seconds(piece))
+            yield piece
+
+
+def create_backend(name: str = LLM_BACKEND, **groq_options):
+    if name == "fake":
+        return FakeBackend()
+    if name == "groq":
+        return GroqBackend(**groq_options)
+    raise ValueError(f"Unknown LLM_BACKEND: {name}")
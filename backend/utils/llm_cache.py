@@ -0,0 +1,80 @@
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def normalize_input(value):
+    """
+    Canonical form of a prompt input: lowercase, collapsed whitespace.
+    """
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip().lower()
+    return value
+
+
+def cache_key(namespace: str, **inputs) -> str:
+    """
+    Stable key over normalized prompt inputs (argument order does not matter).
+    """
+    canonical = json.dumps(
+        {k: normalize_input(v) for k, v in inputs.items()},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return f"{namespace}:{hashlib.sha1(canonical.encode('utf-8')).hexdigest()}"
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL and hit/miss counters.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default=None, record: bool = True):
+        """
+        record=False reads without touching the hit/miss counters.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self.entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += record
+                return default
+            self.entries.move_to_end(key)
+            self.hits += record
+            return entry[1]
+
+    def set(self, key: str, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
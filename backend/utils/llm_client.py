@@ -1,29 +1,425 @@
 import os
+import sys
+import time
+import queue
+import random
+import asyncio
+import threading
+
 from dotenv import load_dotenv
-from groq import Groq
+
+from utils.llm_backends import create_backend, LLM_BACKEND
+from utils.llm_router import create_router
+from utils.metrics import inc, observe
 
 load_dotenv()
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Fast model for questions / evaluation, strong one for the report
+# (per-template routing and failover in utils.llm_router)
 MODEL_NAME = "llama-3.1-8b-instant"
+STRONG_MODEL_NAME = "llama-3.3-70b-versatile"
+
+# ---------------- LIMITS ----------------
+# Sized to the provider limits (Groq free tier: 30 requests/minute).
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+LLM_BURST = int(os.getenv("LLM_BURST", str(LLM_MAX_CONCURRENCY)))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+# Longest a call may queue for the local rate limit (across its retries);
+# keeps bursts from parking request threads past the worker timeout
+LLM_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT_SECONDS", "20"))
 
+# Point at a local fake server for tests / offline runs
+LLM_BASE_URL = os.getenv("GROQ_BASE_URL") or None
 
-def call_llm(prompt: str, temperature: float = 0.6, max_tokens: int = 2048) -> str:
+
+# ======================================================
+# ERRORS
+# ======================================================
+class LLMError(Exception):
     """
-    Robust LLM caller with higher token limit
-    and safe trimming.
+    Base error for every failed LLM call.
     """
+
+    retryable = False
+
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LLMRateLimitError(LLMError):
+    retryable = True
+
+    def __init__(self, message: str, status_code: int = 429, retry_after: float = None):
+        super().__init__(message, status_code)
+        self.retry_after = retry_after
+
+
+class LLMTimeoutError(LLMError):
+    retryable = True
+
+
+class LLMUnavailableError(LLMError):
+    """
+    5xx responses and connection failures.
+    """
+
+    retryable = True
+
+
+class LLMResponseError(LLMError):
+    """
+    Non-retryable 4xx responses and empty completions.
+    """
+
+
+def _retry_after(response) -> float:
     try:
-        completion = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature,
-            max_tokens=max_tokens
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _translate_error(e: Exception) -> LLMError:
+    if isinstance(e, LLMError):
+        return e
+    # The Groq SDK is imported with the first Groq client (~200 ms);
+    # if it is not loaded, e cannot be one of its errors
+    groq = sys.modules.get("groq")
+    if groq is None:
+        return LLMError(str(e))
+    if isinstance(e, groq.RateLimitError):
+        return LLMRateLimitError(str(e), retry_after=_retry_after(e.response))
+    if isinstance(e, groq.APITimeoutError):
+        return LLMTimeoutError(str(e))
+    if isinstance(e, groq.APIConnectionError):
+        return LLMUnavailableError(str(e))
+    if isinstance(e, groq.APIStatusError):
+        if e.status_code >= 500:
+            return LLMUnavailableError(str(e), e.status_code)
+        return LLMResponseError(str(e), e.status_code)
+    return LLMError(str(e))
+
+
+# ======================================================
+# RATE LIMITING
+# ======================================================
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by sync and async callers.
+    reserve() takes a token and returns how long to wait before using it,
+    or returns None (taking nothing) when that wait exceeds max_wait.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = rate_per_second
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, max_wait: float = None) -> float:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+
+_bucket = TokenBucket(LLM_REQUESTS_PER_MINUTE / 60.0, LLM_BURST)
+_concurrency = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+
+def _rate_limit_wait(template: str, deadline: float) -> float:
+    """
+    Seconds to wait for a rate-limit token. Raises LLMRateLimitError
+    (not retried) when the wait would run past deadline.
+    """
+    wait = _bucket.reserve(max(0.0, deadline - time.monotonic()))
+    if wait is None:
+        inc("llm_rate_limit_rejected_total", template=template)
+        raise LLMRateLimitError(
+            "Local LLM rate limit: queue too long",
+            retry_after=LLM_RATE_LIMIT_MAX_WAIT_SECONDS
         )
+    return wait
+
+
+def _backoff_delay(attempt: int, error: LLMError) -> float:
+    """
+    Full-jitter exponential backoff, honouring Retry-After on 429.
+    """
+    delay = random.uniform(
+        0,
+        min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    )
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        delay = max(delay, min(retry_after, LLM_BACKOFF_MAX_SECONDS))
+    return delay
+
 
-        text = completion.choices[0].message.content.strip()
+# ======================================================
+# BACKEND (LLM_BACKEND=groq | fake, see utils.llm_backends)
+# ======================================================
+_router = None
+_router_lock = threading.Lock()
+_backend = None
 
-        return text
 
+def get_router():
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = create_router(
+                    LLM_BACKEND,
+                    MODEL_NAME,
+                    STRONG_MODEL_NAME,
+                    create_backend,
+                    base_url=LLM_BASE_URL,
+                    timeout=LLM_TIMEOUT_SECONDS,
+                    max_connections=LLM_MAX_CONCURRENCY
+                )
+    return _router
+
+
+def get_backend(template: str = "other"):
+    if _backend is not None:
+        return _backend
+    return get_router().for_template(template)
+
+
+def warm_up():
+    """
+    Builds the router and every route's client (SDK import, HTTP pool)
+    ahead of the first call. Sends no request.
+    """
+    for route in get_router().routes():
+        try:
+            getattr(route.backend, "client", None)
+        except Exception as e:
+            print("LLM client warm-up error:", e)
+
+
+def set_backend(backend):
+    """
+    Uses one backend for every template, bypassing the router
+    (benchmarks / load tests). None restores routing.
+    """
+    global _backend
+    _backend = backend
+
+
+def _completion_text(content: str) -> str:
+    if not content or not content.strip():
+        raise LLMResponseError("Empty completion from LLM")
+    return content.strip()
+
+
+def _record(template: str, start: float, error: LLMError = None, usage: dict = None,
+            prompt: str = "", completion: str = ""):
+    """
+    Latency, outcome and token counters for one call_llm / stream_llm call.
+    Streams carry no usage, so their tokens are estimated (~4 chars/token).
+    """
+    observe("llm_request_duration_seconds", time.perf_counter() - start, template=template)
+    inc(
+        "llm_requests_total",
+        template=template,
+        outcome=type(error).__name__ if error else "ok"
+    )
+    if usage is None:
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(completion) // 4}
+    inc("llm_tokens_total", usage["prompt_tokens"], template=template, kind="prompt")
+    inc("llm_tokens_total", usage["completion_tokens"], template=template, kind="completion")
+
+
+# ======================================================
+# PUBLIC API
+# ======================================================
+def call_llm(
+    prompt: str,
+    temperature: float = 0.6,
+    max_tokens: int = 2048,
+    template: str = "other",
+    json_mode: bool = False
+) -> str:
+    """
+    Robust LLM caller with higher token limit and safe trimming.
+    Rate limited, concurrency capped and retried with backoff.
+    Raises LLMError once retries are exhausted, LLMRateLimitError when
+    the local rate-limit queue would take longer than
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS.
+    template labels the call in the metrics; json_mode asks the
+    provider for a JSON object (see utils.structured_output).
+    """
+    start = time.perf_counter()
+    deadline = time.monotonic() + LLM_RATE_LIMIT_MAX_WAIT_SECONDS
+    attempt = 0
+    while True:
+        try:
+            wait = _rate_limit_wait(template, deadline)
+        except LLMRateLimitError as error:
+            _record(template, start, error, prompt=prompt)
+            raise
+        time.sleep(wait)
+        try:
+            with _concurrency:
+                content, usage = get_backend(template).complete(prompt, temperature, max_tokens, json_mode)
+            text = _completion_text(content)
+            _record(template, start, usage=usage, prompt=prompt, completion=text)
+            return text
+
+        except Exception as e:
+            error = _translate_error(e)
+            if not error.retryable or attempt >= LLM_MAX_RETRIES:
+                _record(template, start, error, prompt=prompt)
+                raise error from e
+            inc("llm_retries_total", template=template)
+            time.sleep(_backoff_delay(attempt, error))
+            attempt += 1
+
+
+async def _acquire_slot():
+    # Polls the process-wide semaphore so sync and async callers share one cap
+    while not _concurrency.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+
+
+async def acall_llm(
+    prompt: str,
+    temperature: float = 0.6,
+    max_tokens: int = 2048,
+    template: str = "other",
+    json_mode: bool = False
+) -> str:
+    """
+    Async variant of call_llm with the same limits and retry policy.
+    """
+    start = time.perf_counter()
+    deadline = time.monotonic() + LLM_RATE_LIMIT_MAX_WAIT_SECONDS
+    attempt = 0
+    while True:
+        try:
+            wait = _rate_limit_wait(template, deadline)
+        except LLMRateLimitError as error:
+            _record(template, start, error, prompt=prompt)
+            raise
+        await asyncio.sleep(wait)
+        try:
+            await _acquire_slot()
+            try:
+                content, usage = await get_backend(template).acomplete(prompt, temperature, max_tokens, json_mode)
+            finally:
+                _concurrency.release()
+            text = _completion_text(content)
+            _record(template, start, usage=usage, prompt=prompt, completion=text)
+            return text
+
+        except Exception as e:
+            error = _translate_error(e)
+            if not error.retryable or attempt >= LLM_MAX_RETRIES:
+                _record(template, start, error, prompt=prompt)
+                raise error from e
+            inc("llm_retries_total", template=template)
+            await asyncio.sleep(_backoff_delay(attempt, error))
+            attempt += 1
+
+
+_STREAM_END = object()
+
+
+def _pump(stream, deltas: queue.Queue, stop: threading.Event):
+    """
+    Reads a provider stream into deltas, holding a concurrency slot only
+    for the provider request and its read loop: a slow consumer (e.g. an
+    SSE client) never holds the slot. Ends early once stop is set.
+    """
+    _concurrency.acquire()
+    try:
+        if not stop.is_set():
+            for delta in stream:
+                deltas.put(delta)
+                if stop.is_set():
+                    break
+        deltas.put(_STREAM_END)
     except Exception as e:
-        return f"LLM Error: {str(e)}"
+        deltas.put(e)
+    finally:
+        stream.close()
+        _concurrency.release()
+
+
+def stream_llm(
+    prompt: str,
+    temperature: float = 0.6,
+    max_tokens: int = 2048,
+    template: str = "other",
+    json_mode: bool = False
+):
+    """
+    Streaming variant of call_llm. Yields text deltas as they arrive.
+    Retries only happen before the first delta has been yielded.
+    Closing the generator early (e.g. once a JSON object is complete)
+    ends the call and still records it.
+    """
+    start = time.perf_counter()
+    deadline = time.monotonic() + LLM_RATE_LIMIT_MAX_WAIT_SECONDS
+    attempt = 0
+    while True:
+        try:
+            wait = _rate_limit_wait(template, deadline)
+        except LLMRateLimitError as error:
+            _record(template, start, error, prompt=prompt)
+            raise
+        time.sleep(wait)
+        parts = []
+        deltas = queue.Queue()
+        stop = threading.Event()
+        try:
+            threading.Thread(
+                target=_pump,
+                args=(get_backend(template).stream(prompt, temperature, max_tokens, json_mode), deltas, stop),
+                name="llm-stream",
+                daemon=True
+            ).start()
+            while True:
+                delta = deltas.get()
+                if delta is _STREAM_END:
+                    break
+                if isinstance(delta, Exception):
+                    raise delta
+                parts.append(delta)
+                yield delta
+            if not parts:
+                raise LLMResponseError("Empty completion from LLM")
+            _record(template, start, prompt=prompt, completion="".join(parts))
+            return
+
+        except GeneratorExit:
+            _record(template, start, prompt=prompt, completion="".join(parts))
+            raise
+
+        except Exception as e:
+            error = _translate_error(e)
+            if parts or not error.retryable or attempt >= LLM_MAX_RETRIES:
+                _record(template, start, error, prompt=prompt, completion="".join(parts))
+                raise error from e
+            inc("llm_retries_total", template=template)
+            time.sleep(_backoff_delay(attempt, error))
+            attempt += 1
+        finally:
+            # Closed by the consumer or failed: the pump stops reading
+            stop.set()
@@ -0,0 +1,340 @@
+"""
+Routes LLM calls to a model tier by prompt template, picks the
+fastest healthy backend in the tier and fails over between them.
+
+    LLM_ROUTES_FAST=groq:llama-3.1-8b-instant
+    LLM_ROUTES_STRONG=groq:llama-3.3-70b-versatile|groq:llama-3.1-8b-instant
+    LLM_STRONG_TEMPLATES=report,report_synthesis,report_continuation
+
+Each route is "<backend>:<model>" (backends from utils.llm_backends).
+Comma-separated routes are interchangeable; routes after a "|" are
+fallbacks, only used when everything before them failed or is cooling
+down. Per route the router keeps an EWMA of latency and error rate;
+interchangeable routes are tried fastest-expected first, and a route
+that fails LLM_ROUTER_TRIP_ERRORS times in a row sits out
+LLM_ROUTER_COOLDOWN_SECONDS.
+
+With LLM_HEDGE=true a blocking call that is still running after the
+route's recent p95 latency sends the same request to the next route
+and returns whichever answers first (the loser is left to finish).
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from utils.metrics import inc, register_collector
+
+LLM_ROUTES_FAST = os.getenv("LLM_ROUTES_FAST", "")
+LLM_ROUTES_STRONG = os.getenv("LLM_ROUTES_STRONG", "")
+LLM_STRONG_TEMPLATES = os.getenv(
+    "LLM_STRONG_TEMPLATES",
+    "report,report_synthesis,report_continuation"
+)
+LLM_ROUTER_EWMA_ALPHA = float(os.getenv("LLM_ROUTER_EWMA_ALPHA", "0.2"))
+LLM_ROUTER_TRIP_ERRORS = int(os.getenv("LLM_ROUTER_TRIP_ERRORS", "3"))
+LLM_ROUTER_COOLDOWN_SECONDS = float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", "30"))
+LLM_HEDGE = os.getenv("LLM_HEDGE", "false").lower() == "true"
+# No hedging until a route has this many latency samples
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# Hedged calls run both requests here; keep it >= 2 x LLM_MAX_CONCURRENCY
+LLM_HEDGE_WORKERS = int(os.getenv("LLM_HEDGE_WORKERS", "32"))
+
+LATENCY_WINDOW = 200
+
+
+# ======================================================
+# ROUTE (ONE BACKEND + MODEL) AND ITS HEALTH
+# ======================================================
+class Route:
+    def __init__(self, label: str, backend):
+        self.label = label
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.latency = None          # EWMA seconds, None until measured
+        self.error_rate = 0.0        # EWMA of 0 / 1 outcomes
+        self.consecutive_errors = 0
+        self.open_until = 0.0
+        self.recent = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds: float = None, error: Exception = None):
+        alpha = LLM_ROUTER_EWMA_ALPHA
+        with self.lock:
+            self.error_rate += alpha * ((1.0 if error else 0.0) - self.error_rate)
+            if error:
+                self.consecutive_errors += 1
+                if self.consecutive_errors >= LLM_ROUTER_TRIP_ERRORS:
+                    self.open_until = time.monotonic() + LLM_ROUTER_COOLDOWN_SECONDS
+                return
+            self.consecutive_errors = 0
+            self.open_until = 0.0
+            self.recent.append(seconds)
+            self.latency = seconds if self.latency is None else (
+                self.latency + alpha * (seconds - self.latency)
+            )
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def expected_latency(self) -> float:
+        """
+        Latency inflated by the error rate (expected time to a success).
+        Unmeasured routes score 0 so each one gets tried.
+        """
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(0.05, 1.0 - self.error_rate)
+
+    def p95(self):
+        with self.lock:
+            if len(self.recent) < LLM_HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.recent)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+def _retryable(e: Exception) -> bool:
+    from utils.llm_client import _translate_error
+
+    return _translate_error(e).retryable
+
+
+# ======================================================
+# ONE TIER AS A BACKEND
+# ======================================================
+class TierBackend:
+    """
+    Backend interface (complete / acomplete / stream) over the routes
+    of one tier. Non-retryable errors (4xx) are raised at once; the
+    retry / backoff policy stays in llm_client.
+    """
+
+    def __init__(self, router, tier: str, groups: list):
+        self.router = router
+        self.name = tier
+        self.groups = groups
+        self.routes = [route for group in groups for route in group]
+
+    def ordered(self) -> list:
+        """
+        Available routes by preference group, fastest first within a
+        group; cooling-down routes last (still tried if all else fails).
+        """
+        ranked = [
+            (not route.available, g, route.expected_latency(), route)
+            for g, group in enumerate(self.groups)
+            for route in group
+        ]
+        return [item[-1] for item in sorted(ranked, key=lambda item: item[:3])]
+
+    def _call(self, route, prompt, temperature, max_tokens, json_mode):
+        start = time.perf_counter()
+        try:
+            result = route.backend.complete(prompt, temperature, max_tokens, json_mode)
+        except Exception as e:
+            route.record(error=e)
+            raise
+        route.record(time.perf_counter() - start)
+        return result
+
+    def complete(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False) -> tuple:
+        routes = self.ordered()
+        if self.router.hedge and len(routes) > 1 and routes[0].p95() is not None:
+            return self._hedged(routes, prompt, temperature, max_tokens, json_mode)
+
+        error = None
+        for i, route in enumerate(routes):
+            try:
+                return self._call(route, prompt, temperature, max_tokens, json_mode)
+            except Exception as e:
+                if not _retryable(e):
+                    raise
+                error = e
+                if i + 1 < len(routes):
+                    inc("llm_failovers_total", tier=self.name, route=route.label)
+        raise error
+
+    def _hedged(self, routes, prompt, temperature, max_tokens, json_mode) -> tuple:
+        primary, backup = routes[0], routes[1]
+        pending = {self.router.pool.submit(
+            self._call, primary, prompt, temperature, max_tokens, json_mode
+        ): "primary"}
+        done, _ = wait(pending, timeout=primary.p95())
+
+        if not done:
+            inc("llm_hedges_total", tier=self.name)
+            pending[self.router.pool.submit(
+                self._call, backup, prompt, temperature, max_tokens, json_mode
+            )] = "hedge"
+
+        error = None
+        remaining = set(pending)
+        while remaining:
+            done, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                inc("llm_hedge_wins_total", tier=self.name, winner=pending[future])
+                return result
+
+        if not _retryable(error) or len(pending) > 1:
+            raise error
+        # Primary failed fast, before the hedge deadline
+        inc("llm_failovers_total", tier=self.name, route=primary.label)
+        return self._call(backup, prompt, temperature, max_tokens, json_mode)
+
+    async def acomplete(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False) -> tuple:
+        error = None
+        routes = self.ordered()
+        for i, route in enumerate(routes):
+            start = time.perf_counter()
+            try:
+                result = await route.backend.acomplete(prompt, temperature, max_tokens, json_mode)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                route.record(error=e)
+                if not _retryable(e):
+                    raise
+                error = e
+                if i + 1 < len(routes):
+                    inc("llm_failovers_total", tier=self.name, route=route.label)
+                continue
+            route.record(time.perf_counter() - start)
+            return result
+        raise error
+
+    def stream(self, prompt: str, temperature: float, max_tokens: int, json_mode: bool = False):
+        """
+        Fails over only before the first delta; latency is time to first delta.
+        """
+        error = None
+        routes = self.ordered()
+        for i, route in enumerate(routes):
+            start = time.perf_counter()
+            started = False
+            try:
+                for delta in route.backend.stream(prompt, temperature, max_tokens, json_mode):
+                    if not started:
+                        started = True
+                        route.record(time.perf_counter() - start)
+                    yield delta
+                return
+            except Exception as e:
+                route.record(error=e)
+                if started or not _retryable(e):
+                    raise
+                error = e
+                if i + 1 < len(routes):
+                    inc("llm_failovers_total", tier=self.name, route=route.label)
+        raise error
+
+
+# ======================================================
+# ROUTER
+# ======================================================
+class Router:
+    def __init__(self, tiers: dict, strong_templates=(), hedge: bool = LLM_HEDGE):
+        """
+        tiers: {"fast": [[Route, ...], [fallback Route, ...]], "strong": ...}
+        ("fast" is the default). A flat [Route, ...] is one group.
+        """
+        self.tiers = {}
+        for name, groups in tiers.items():
+            if groups and isinstance(groups[0], Route):
+                groups = [groups]
+            groups = [group for group in groups if group]
+            if groups:
+                self.tiers[name] = TierBackend(self, name, groups)
+        self.strong_templates = set(strong_templates)
+        self.hedge = hedge
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=LLM_HEDGE_WORKERS,
+                        thread_name_prefix="llm-hedge"
+                    )
+        return self._pool
+
+    def for_template(self, template: str) -> TierBackend:
+        if template in self.strong_templates and "strong" in self.tiers:
+            return self.tiers["strong"]
+        return self.tiers["fast"]
+
+    def routes(self) -> list:
+        seen = {}
+        for tier in self.tiers.values():
+            for route in tier.routes:
+                seen.setdefault(route.label, route)
+        return list(seen.values())
+
+    def collect(self):
+        for route in self.routes():
+            if route.latency is not None:
+                yield "llm_route_latency_ewma_seconds", "gauge", {"route": route.label}, round(route.latency, 4)
+            yield "llm_route_error_rate", "gauge", {"route": route.label}, round(route.error_rate, 4)
+            yield "llm_route_available", "gauge", {"route": route.label}, int(route.available)
+
+
+def parse_routes(spec: str) -> list:
+    """
+    "groq:a,fake:x|groq:b" -> [[("groq", "a"), ("fake", "x")], [("groq", "b")]]
+    """
+    groups = []
+    for part in spec.split("|"):
+        group = []
+        for item in part.split(","):
+            item = item.strip()
+            if item:
+                backend, _, model = item.partition(":")
+                group.append((backend, model))
+        if group:
+            groups.append(group)
+    return groups
+
+
+def create_router(default_backend: str, fast_model: str, strong_model: str, create_backend, **options):
+    """
+    Router from the LLM_ROUTES_* settings. Without them: one fast route
+    (the current model) and a strong tier that falls back to it.
+    """
+    fast_spec = LLM_ROUTES_FAST or f"{default_backend}:{fast_model}"
+    strong_spec = LLM_ROUTES_STRONG or f"{default_backend}:{strong_model}|{fast_spec}"
+
+    # One Route per backend:model, so both tiers share its health
+    shared = {}
+
+    def build(spec):
+        groups = []
+        for group in parse_routes(spec):
+            routes = []
+            for backend, model in group:
+                label = f"{backend}:{model}"
+                if label not in shared:
+                    shared[label] = Route(
+                        label,
+                        create_backend(backend, model=model or fast_model, **options)
+                    )
+                routes.append(shared[label])
+            groups.append(routes)
+        return groups
+
+    router = Router(
+        {"fast": build(fast_spec), "strong": build(strong_spec)},
+        strong_templates=[t.strip() for t in LLM_STRONG_TEMPLATES.split(",") if t.strip()]
+    )
+    register_collector(router.collect)
+    return router
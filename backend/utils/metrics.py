@@ -0,0 +1,203 @@
+"""
+In-process metrics in Prometheus text format (GET /api/health/metrics).
+
+    inc("fallbacks_total", component="evaluator")
+    observe("llm_request_duration_seconds", 0.42, template="question")
+    with span("evaluate_answer"): ...
+    @timed("generate_final_report")
+
+Values are per worker process; scrape each worker (or run one) when
+serving with several gunicorn workers.
+"""
+
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+# Seconds; LLM calls dominate so the buckets reach well past a minute
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+METRIC_HELP = {
+    "stage_duration_seconds": ("histogram", "Time spent in an instrumented stage"),
+    "stage_errors_total": ("counter", "Stages that raised"),
+    "llm_request_duration_seconds": ("histogram", "LLM call latency including retries"),
+    "llm_requests_total": ("counter", "LLM calls by template and outcome"),
+    "llm_retries_total": ("counter", "LLM call retries"),
+    "llm_rate_limit_rejected_total": ("counter", "LLM calls refused because the local rate-limit wait exceeded its cap"),
+    "llm_tokens_total": ("counter", "Prompt / completion tokens by template"),
+    "prompt_input_tokens_total": ("counter", "Approximate tokens of budgeted prompt inputs (README, resume) sent per template"),
+    "prompt_budget_total": ("counter", "Budgeted prompt inputs by outcome (fit / compressed)"),
+    "prompt_budget_saved_tokens_total": ("counter", "Tokens removed by section-aware compression"),
+    "answer_prescreen_total": ("counter", "Answers by local pre-screen label (evaluate = sent to the LLM)"),
+    "structured_output_total": ("counter", "JSON completions by outcome (ok / repaired / failed)"),
+    "llm_failovers_total": ("counter", "LLM calls moved to the next route after a failure"),
+    "llm_hedges_total": ("counter", "Hedged duplicate LLM requests sent"),
+    "llm_hedge_wins_total": ("counter", "Hedged LLM calls by which request answered first"),
+    "llm_route_latency_ewma_seconds": ("gauge", "EWMA latency per LLM route"),
+    "llm_route_error_rate": ("gauge", "EWMA error rate per LLM route"),
+    "llm_route_available": ("gauge", "0 while a route is cooling down after errors"),
+    "fallbacks_total": ("counter", "Canned fallbacks used instead of an LLM result"),
+    "github_requests_total": ("counter", "GitHub fetches by cache outcome"),
+    "github_rate_limit_remaining": ("gauge", "Last X-RateLimit-Remaining seen"),
+    "speculation_wasted_total": ("counter", "Speculative next questions generated but not served (miss / plan)"),
+    "speculation_total": ("counter", "Next questions by speculation outcome (hit / miss / off = not speculated / plan)"),
+    "speculation_hold_rate": ("gauge", "EWMA share of turns whose intent held, per previous intent"),
+    "report_sections_total": ("counter", "Report review sections by when they were drafted"),
+    "question_plan_total": ("counter", "Interview plans (planned / revised / failed / discarded) and next questions by plan outcome (hit / miss / unavailable)"),
+    "idempotency_total": ("counter", "Duplicate /answer requests (replayed / shared / conflict)"),
+    "admission_total": ("counter", "Admission decisions per route kind (admitted / queued / client_limit / queue_full / timeout / evicted)"),
+    "admission_wait_seconds": ("histogram", "Time queued requests waited for a slot"),
+    "admission_active": ("gauge", "Requests holding an admission slot"),
+    "admission_waiting": ("gauge", "Requests waiting for an admission slot"),
+    "pdf_cache_total": ("counter", "Report PDF requests by cache outcome"),
+    "question_cache_total": ("counter", "Question cache / pool lookups by outcome"),
+    "question_cache_entries": ("gauge", "Entries held by the question cache")
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_collectors = []
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels):
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {
+                "buckets": [0] * len(DURATION_BUCKETS),
+                "sum": 0.0,
+                "count": 0
+            }
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                histogram["buckets"][i] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+
+@contextmanager
+def span(stage: str, **labels):
+    """
+    Times the block into stage_duration_seconds{stage=...}.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        inc("stage_errors_total", stage=stage, **labels)
+        raise
+    finally:
+        observe("stage_duration_seconds", time.perf_counter() - start, stage=stage, **labels)
+
+
+def timed(stage: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_stream(stage: str):
+    """
+    timed() for generators: the span covers the whole stream (until it
+    is exhausted or closed), so streamed and blocking calls share a stage.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                yield from fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_collector(collect):
+    """
+    collect() -> iterable of (name, type, labels, value), read at scrape time.
+    Used for values owned elsewhere (cache sizes, hit counts).
+    """
+    _collectors.append(collect)
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {
+                key: {"buckets": list(h["buckets"]), "sum": h["sum"], "count": h["count"]}
+                for key, h in _histograms.items()
+            }
+        }
+
+
+# ======================================================
+# PROMETHEUS TEXT FORMAT
+# ======================================================
+def _labels(labels, extra=()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (
+        k + '="' + str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for k, v in items
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _header(lines: list, seen: set, name: str, kind: str, help_text: str = ""):
+    if name in seen:
+        return
+    seen.add(name)
+    help_text = help_text or METRIC_HELP.get(name, (kind, name))[1]
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def render_prometheus() -> str:
+    data = snapshot()
+    lines, seen = [], set()
+
+    for (name, labels), value in sorted(data["counters"].items()):
+        _header(lines, seen, name, "counter")
+        lines.append(f"{name}{_labels(labels)} {value}")
+
+    for (name, labels), h in sorted(data["histograms"].items()):
+        _header(lines, seen, name, "histogram")
+        for bound, count in zip(DURATION_BUCKETS, h["buckets"]):
+            lines.append(f"{name}_bucket{_labels(labels, [('le', bound)])} {count}")
+        lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {h['count']}")
+        lines.append(f"{name}_sum{_labels(labels)} {round(h['sum'], 6)}")
+        lines.append(f"{name}_count{_labels(labels)} {h['count']}")
+
+    # Samples of one metric must be contiguous, so collected values are grouped
+    collected = {}
+    for collect in _collectors:
+        try:
+            for name, kind, labels, value in collect():
+                collected.setdefault((name, kind), []).append(
+                    f"{name}{_labels(sorted(labels.items()))} {value}"
+                )
+        except Exception as e:
+            print("Metrics collector error:", e)
+
+    for (name, kind), samples in collected.items():
+        _header(lines, seen, name, kind)
+        lines.extend(samples)
+
+    return "\n".join(lines) + "\n"
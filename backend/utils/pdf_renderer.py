@@ -0,0 +1,266 @@
+import os
+import re
+import io
+import hashlib
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+from utils.metrics import inc, timed
+from utils.process_pool import retire_executor
+
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+PDF_RENDER_TIMEOUT_SECONDS = float(os.getenv("PDF_RENDER_TIMEOUT_SECONDS", "30"))
+PDF_CACHE_DIR = os.getenv(
+    "PDF_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "interview-report-pdf")
+)
+PDF_CACHE_MAX_FILES = int(os.getenv("PDF_CACHE_MAX_FILES", "500"))
+# Final reports are a few thousand characters; larger bodies are refused
+PDF_MAX_REPORT_CHARS = 100_000
+
+# Bump when the layout changes so stale cached PDFs are not served
+RENDERER_VERSION = "3"
+
+_executor = None
+_executor_lock = threading.Lock()
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+# ======================================================
+# LAYOUT (runs in the worker processes)
+# ======================================================
+SECTION_RE = re.compile(r"^\d+\.\s+\S.{0,60}$")
+QUESTION_RE = re.compile(r"^Q\d+\.")
+BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+\))\s+")
+LABELS = ("Candidate Answer:", "Evaluation:", "Question:")
+CODE_SPAN_RE = re.compile(r"`([^`]+)`")
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _inline(text: str) -> str:
+    """
+    Escapes XML for reportlab Paragraph and maps **bold** / `code`.
+    Code spans are split out first, so "`a**2`" is never read as bold.
+    """
+    parts = []
+    for i, part in enumerate(CODE_SPAN_RE.split(text)):
+        if i % 2:
+            parts.append(f'<font face="Courier">{_escape(part)}</font>')
+        else:
+            parts.append(re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", _escape(part)))
+    return "".join(parts)
+
+
+def _paragraph(markup: str, text: str, style, **kwargs):
+    """
+    Paragraph from markup, or from the escaped plain text when reportlab
+    cannot parse the markup (a report must always render).
+    """
+    from reportlab.platypus import Paragraph
+
+    try:
+        return Paragraph(markup, style, **kwargs)
+    except ValueError as e:
+        print("PDF markup error:", e)
+        return Paragraph(_escape(text), style, **kwargs)
+
+
+def render_report_pdf(report_text: str) -> bytes:
+    """
+    Lays out a FINAL_REPORT_PROMPT report with wrapped paragraphs,
+    section headings, bullets and code blocks.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Preformatted, Spacer
+
+    styles = getSampleStyleSheet()
+    body = ParagraphStyle("Body", parent=styles["BodyText"], fontSize=10, leading=14)
+    bullet = ParagraphStyle("Bullet", parent=body, leftIndent=12, bulletIndent=2)
+    section = ParagraphStyle("Section", parent=styles["Heading2"], spaceBefore=10)
+    question = ParagraphStyle("Question", parent=styles["Heading4"], spaceBefore=8)
+    code = ParagraphStyle("Code", parent=styles["Code"], fontSize=8.5, leading=11)
+
+    story = []
+    code_lines = None
+
+    for raw_line in report_text.splitlines():
+        line = raw_line.rstrip()
+
+        # ---------- code fences ----------
+        if line.strip().startswith("```"):
+            if code_lines is None:
+                code_lines = []
+            else:
+                story.append(Preformatted("\n".join(code_lines), code, maxLineLength=95))
+                code_lines = None
+            continue
+        if code_lines is not None:
+            code_lines.append(raw_line)
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            story.append(Spacer(1, 4))
+            continue
+
+        plain = stripped.strip("*").strip()
+
+        if stripped.startswith("#"):
+            level = len(stripped) - len(stripped.lstrip("#"))
+            text = stripped.lstrip("#").strip().strip("*")
+            story.append(_paragraph(_inline(text), text, section if level <= 2 else question))
+        elif SECTION_RE.match(plain) and not plain.endswith("."):
+            story.append(_paragraph(_inline(plain), plain, section))
+        elif QUESTION_RE.match(plain):
+            story.append(_paragraph(_inline(plain), plain, question))
+        elif plain in LABELS:
+            story.append(_paragraph(f"<b>{_inline(plain)}</b>", plain, body))
+        elif BULLET_RE.match(stripped):
+            text = BULLET_RE.sub("", stripped, count=1)
+            story.append(_paragraph(_inline(text), text, bullet, bulletText="•"))
+        else:
+            story.append(_paragraph(_inline(stripped), stripped, body))
+
+    if code_lines:
+        story.append(Preformatted("\n".join(code_lines), code, maxLineLength=95))
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=18 * mm,
+        rightMargin=18 * mm,
+        topMargin=16 * mm,
+        bottomMargin=16 * mm,
+        title="Interview Report"
+    )
+    doc.build(story)
+    return buffer.getvalue()
+
+
+# ======================================================
+# CACHED RENDERING SERVICE (request side)
+# ======================================================
+def report_digest(report_text: str) -> str:
+    return hashlib.sha256(
+        f"{RENDERER_VERSION}\n{report_text}".encode("utf-8")
+    ).hexdigest()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn: never fork a threaded gunicorn worker
+                _executor = ProcessPoolExecutor(
+                    max_workers=PDF_RENDER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+
+def _reset_executor():
+    """
+    A timed-out render keeps its worker busy, so new renders go to a new
+    pool; the old one finishes the renders already in it before its
+    processes are killed (utils.process_pool).
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    retire_executor(executor, PDF_RENDER_TIMEOUT_SECONDS)
+
+
+def _import_reportlab():
+    import reportlab.platypus  # noqa: F401
+
+
+def warm_up():
+    """
+    Starts a render process and imports reportlab in it, so the first
+    report download does not pay for either.
+    """
+    _get_executor().submit(_import_reportlab).result(timeout=PDF_RENDER_TIMEOUT_SECONDS)
+
+
+def _prune_cache():
+    try:
+        files = [
+            os.path.join(PDF_CACHE_DIR, f)
+            for f in os.listdir(PDF_CACHE_DIR)
+            if f.endswith(".pdf")
+        ]
+        if len(files) <= PDF_CACHE_MAX_FILES:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - PDF_CACHE_MAX_FILES]:
+            os.remove(path)
+    except OSError as e:
+        print("PDF cache prune error:", e)
+
+
+def _write_atomic(path: str, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=PDF_CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+@timed("report_pdf")
+def get_report_pdf(report_text: str) -> tuple:
+    """
+    Returns (digest, path) of the rendered PDF, rendering it on the
+    process pool only when no cached copy exists. Concurrent requests
+    for the same report share one render.
+    Raises concurrent.futures.TimeoutError if rendering takes too long.
+    """
+    digest = report_digest(report_text)
+    path = os.path.join(PDF_CACHE_DIR, f"{digest}.pdf")
+
+    try:
+        os.utime(path)  # cache hit; also keeps it out of the prune
+        inc("pdf_cache_total", outcome="hit")
+        return digest, path
+    except FileNotFoundError:
+        pass
+
+    with _inflight_lock:
+        pending = _inflight.get(digest)
+        owner = pending is None
+        if owner:
+            pending = Future()
+            _inflight[digest] = pending
+
+    inc("pdf_cache_total", outcome="shared" if not owner else "miss")
+    if not owner:
+        pending.result(timeout=PDF_RENDER_TIMEOUT_SECONDS)
+        return digest, path
+
+    try:
+        pdf_bytes = _get_executor().submit(render_report_pdf, report_text).result(
+            timeout=PDF_RENDER_TIMEOUT_SECONDS
+        )
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        _write_atomic(path, pdf_bytes)
+        _prune_cache()
+        pending.set_result(path)
+    except Exception as e:
+        if isinstance(e, FuturesTimeoutError):
+            _reset_executor()
+        pending.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(digest, None)
+
+    return digest, path
@@ -0,0 +1,44 @@
+"""
+Optional warm-up for workers (APP_PRELOAD=true, run by gunicorn's
+post_worker_init before the worker accepts requests).
+
+Importing the app stays cheap: the Groq SDK, requests, reportlab and
+PyPDF2 load on first use. That keeps scale-to-zero cold starts short,
+but the first interview pays for them instead. Preloading moves the
+cost back to boot on hosts that keep workers warm.
+"""
+
+import os
+import time
+
+APP_PRELOAD = os.getenv("APP_PRELOAD", "false").lower() == "true"
+
+
+def _steps():
+    from utils import llm_client, github_fetcher, pdf_renderer, resume_ingest
+    from core import question_bank
+
+    return [
+        ("llm_clients", llm_client.warm_up),
+        ("github_session", github_fetcher.get_session),
+        ("question_bank", question_bank.warm_up),
+        ("pdf_renderer", pdf_renderer.warm_up),
+        ("resume_parser", resume_ingest.warm_up)
+    ]
+
+
+def preload() -> dict:
+    """
+    Runs every warm-up step; a failing step is logged and skipped.
+    Returns {step: milliseconds}.
+    """
+    timings = {}
+    for name, step in _steps():
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print("Preload error:", name, e)
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    print("Preloaded:", timings)
+    return timings
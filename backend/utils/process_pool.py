@@ -0,0 +1,32 @@
+"""
+Retiring a process pool that has a stuck worker.
+
+ProcessPoolExecutor cannot cancel a running job or tell which process
+runs it. So the pool with the stuck job is swapped out for a new one
+(the caller's lazy getter creates it) and retired:
+
+- it takes no new work, while the jobs already in it keep running, so
+  other users' parses / renders are not failed
+- once every job submitted before has had its timeout to finish, the
+  processes still alive are killed: anything running then has already
+  been given up on by its caller
+"""
+
+import threading
+
+
+def retire_executor(executor, timeout_seconds: float):
+    if executor is None:
+        return
+    # shutdown() drops the process table, so take it first
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False)
+
+    def reap():
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+
+    timer = threading.Timer(timeout_seconds, reap)
+    timer.daemon = True
+    timer.start()
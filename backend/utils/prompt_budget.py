@@ -0,0 +1,298 @@
+"""
+Token budgets for long inputs injected into prompts (project README,
+resume text).
+
+    readme = fit_input("project_question", "readme", project_readme)
+
+Oversized inputs are compressed section by section instead of being
+cut off: noise is stripped (badges, images, HTML, long code blocks),
+boilerplate sections (license, contributing, ...) are dropped, and the
+budget is shared out so key sections (architecture, features, tech
+stack, ...) are filled first and every kept section gets a fair share.
+
+/start stores the compressed form on the session, so later turns only
+count it. Every call records input tokens and outcome per template.
+"""
+
+import os
+import re
+import hashlib
+
+from utils.llm_cache import TTLCache
+from utils.metrics import inc
+from utils.github_fetcher import STRONG_README_KEYWORDS
+
+PROMPT_README_TOKEN_BUDGET = int(os.getenv("PROMPT_README_TOKEN_BUDGET", "1200"))
+PROMPT_README_EXCERPT_TOKEN_BUDGET = int(os.getenv("PROMPT_README_EXCERPT_TOKEN_BUDGET", "400"))
+PROMPT_RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "1000"))
+
+# (template, field) -> token budget
+INPUT_BUDGETS = {
+    ("project_question", "readme"): PROMPT_README_TOKEN_BUDGET,
+    ("project_code_question", "readme"): PROMPT_README_EXCERPT_TOKEN_BUDGET,
+    ("resume_question", "resume_text"): PROMPT_RESUME_TOKEN_BUDGET
+}
+
+# Section titles, matched as substrings of the lowercased heading
+KEY_SECTIONS = tuple(STRONG_README_KEYWORDS) + (
+    "overview", "about", "introduction", "how it works", "structure",
+    "stack", "built with", "technolog", "components", "modules", "api",
+    "projects", "experience", "skills"
+)
+SETUP_SECTIONS = (
+    "install", "getting started", "setup", "set up", "usage", "running",
+    "deploy", "configuration", "environment", "prerequisite", "test"
+)
+DROP_SECTIONS = (
+    "license", "contribut", "acknowledg", "table of contents", "contents",
+    "sponsor", "support", "changelog", "star history", "code of conduct",
+    "contact", "author", "credits", "screenshot"
+)
+
+CODE_BLOCK_LINES = 8
+MIN_SECTION_TOKENS = 40
+
+COMPRESSED_CACHE_MAX_ENTRIES = 200
+COMPRESSED_CACHE_TTL_SECONDS = 3600
+
+HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+SETEXT_RE = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+LABEL_RE = re.compile(r"^([A-Z][A-Z &/]{2,40}):\s*$")
+BADGE_RE = re.compile(r"^\s*((\[\s*)?!\[[^\]]*\]\([^)]*\)(\]\([^)]*\))?\s*)+$")
+HTML_RE = re.compile(r"^\s*(<!--.*?-->|</?[a-zA-Z][^>]*>\s*)+$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+_compressed = TTLCache(COMPRESSED_CACHE_MAX_ENTRIES, COMPRESSED_CACHE_TTL_SECONDS)
+
+
+def approx_tokens(text: str) -> int:
+    # ~4 characters per token for English prose and code
+    return (len(text) + 3) // 4
+
+
+# ======================================================
+# SECTIONS
+# ======================================================
+def split_sections(text: str) -> list:
+    """
+    [{"title", "heading", "lines"}] in document order; text before the
+    first heading is a section with an empty title. Recognises markdown
+    headings (#, setext) and "LABEL:" lines (resume_prompt_text).
+    """
+    sections = [{"title": "", "heading": [], "lines": []}]
+    lines = text.splitlines()
+
+    for i, line in enumerate(lines):
+        heading = HEADING_RE.match(line) or LABEL_RE.match(line)
+        if heading:
+            sections.append({"title": heading.group(1).strip(), "heading": [line], "lines": []})
+            continue
+
+        underline = i + 1 < len(lines) and SETEXT_RE.match(lines[i + 1])
+        if underline and line.strip() and not FENCE_RE.match(line):
+            sections.append({"title": line.strip(), "heading": [line, lines[i + 1]], "lines": []})
+            continue
+        if i > 0 and SETEXT_RE.match(line) and sections[-1]["heading"][-1:] == [line]:
+            continue
+
+        sections[-1]["lines"].append(line)
+
+    return [s for s in sections if s["title"] or any(l.strip() for l in s["lines"])]
+
+
+def clean_lines(lines: list) -> list:
+    """
+    Drops badges, images, HTML-only lines and repeated blank lines;
+    shortens code blocks to CODE_BLOCK_LINES.
+    """
+    cleaned = []
+    in_code = False
+    code_lines = 0
+
+    for line in lines:
+        if FENCE_RE.match(line):
+            if in_code and code_lines > CODE_BLOCK_LINES:
+                cleaned.append("...")
+            in_code = not in_code
+            code_lines = 0
+            cleaned.append(line)
+            continue
+        if in_code:
+            code_lines += 1
+            if code_lines <= CODE_BLOCK_LINES:
+                cleaned.append(line)
+            continue
+        if BADGE_RE.match(line) or HTML_RE.match(line):
+            continue
+        if not line.strip() and (not cleaned or not cleaned[-1].strip()):
+            continue
+        cleaned.append(line.rstrip())
+
+    while cleaned and not cleaned[-1].strip():
+        cleaned.pop()
+    return cleaned
+
+
+def section_rank(title: str, first: bool = False) -> int:
+    """
+    0 = key section or the intro (first section, usually the project
+    title and description), 1 = other, 2 = setup, None = dropped.
+    """
+    title = title.lower()
+    if not title or first:
+        return 0
+    if any(k in title for k in DROP_SECTIONS):
+        return None
+    if any(k in title for k in KEY_SECTIONS):
+        return 0
+    if any(k in title for k in SETUP_SECTIONS):
+        return 2
+    return 1
+
+
+# ======================================================
+# BUDGET
+# ======================================================
+def _share(sizes: dict, budget: int) -> dict:
+    """
+    Fair share of budget over sections: small sections are kept whole
+    and what they leave is split among the larger ones. When shares
+    would drop below MIN_SECTION_TOKENS, earlier sections win.
+    """
+    allocation = {}
+    pending = sorted(sizes, key=lambda i: sizes[i])
+
+    while pending:
+        share = budget // len(pending)
+        if share < MIN_SECTION_TOKENS:
+            for i in sorted(pending):
+                allocation[i] = min(sizes[i], budget)
+                budget -= allocation[i]
+                if budget < MIN_SECTION_TOKENS:
+                    break
+            return allocation
+
+        smallest = pending[0]
+        if sizes[smallest] > share:
+            for i in pending:
+                allocation[i] = share
+            return allocation
+
+        allocation[smallest] = sizes[smallest]
+        budget -= sizes[smallest]
+        pending.pop(0)
+
+    return allocation
+
+
+def _clip(lines: list, tokens: int) -> list:
+    limit = tokens * 4
+    kept = []
+    used = 0
+
+    for line in lines:
+        if used + len(line) + 1 <= limit:
+            kept.append(line)
+            used += len(line) + 1
+            continue
+        room = limit - used - 4
+        if room > 40:
+            kept.append(line[:room].rstrip() + " ...")
+        elif kept:
+            kept.append("...")
+        break
+
+    return kept
+
+
+def compress(text: str, budget: int) -> str:
+    """
+    Section-aware compression of text to about budget tokens.
+    """
+    sections = []
+    for i, section in enumerate(split_sections(text)):
+        rank = section_rank(section["title"], first=i == 0)
+        if rank is None:
+            continue
+        lines = clean_lines(section["lines"])
+        if not lines and not section["title"]:
+            continue
+        section["lines"] = lines
+        section["rank"] = rank
+        section["size"] = approx_tokens("\n".join(section["heading"] + lines))
+        sections.append(section)
+
+    if sum(s["size"] for s in sections) <= budget:
+        allocation = {i: s["size"] for i, s in enumerate(sections)}
+    else:
+        # Key sections first, then the rest with what is left
+        allocation = {}
+        remaining = budget
+        for rank in (0, 1, 2):
+            sizes = {i: s["size"] for i, s in enumerate(sections) if s["rank"] == rank}
+            if not sizes or remaining < MIN_SECTION_TOKENS:
+                continue
+            granted = _share(sizes, remaining)
+            allocation.update(granted)
+            remaining -= sum(granted.values())
+
+    parts = []
+    for i, section in enumerate(sections):
+        tokens = allocation.get(i, 0)
+        if tokens <= 0:
+            continue
+        heading = section["heading"]
+        body = section["lines"] if tokens >= section["size"] else _clip(
+            section["lines"], tokens - approx_tokens("\n".join(heading))
+        )
+        if body or not heading:
+            parts.append("\n".join(heading + body))
+
+    return "\n\n".join(parts).strip()
+
+
+# ======================================================
+# PROMPT INPUTS
+# ======================================================
+def compress_input(template: str, field: str, text: str) -> str:
+    """
+    text within the (template, field) budget. Compressed forms are
+    cached by content hash (per process); /start keeps the result on
+    the session so later turns skip this.
+    """
+    budget = INPUT_BUDGETS[(template, field)]
+    if not text or approx_tokens(text) <= budget:
+        return text
+
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    key = f"{template}:{field}:{budget}:{digest}"
+    compressed = _compressed.get(key)
+    if compressed is None:
+        compressed = compress(text, budget)
+        # Last resort for text without usable sections
+        if approx_tokens(compressed) > budget:
+            compressed = compressed[:budget * 4].rstrip() + " ..."
+        _compressed.set(key, compressed)
+        inc(
+            "prompt_budget_saved_tokens_total",
+            approx_tokens(text) - approx_tokens(compressed),
+            template=template,
+            field=field
+        )
+    return compressed
+
+
+def fit_input(template: str, field: str, text: str) -> str:
+    """
+    Per-call entry point: enforces the budget and records the input's
+    size (prompt_input_tokens_total) and outcome (fit / compressed).
+    """
+    fitted = compress_input(template, field, text)
+    inc(
+        "prompt_budget_total",
+        template=template,
+        field=field,
+        outcome="fit" if fitted is text else "compressed"
+    )
+    inc("prompt_input_tokens_total", approx_tokens(fitted), template=template, field=field)
+    return fitted
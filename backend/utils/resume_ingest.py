@@ -0,0 +1,192 @@
+import io
+import os
+import re
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.llm_cache import TTLCache
+from utils.metrics import timed
+from utils.process_pool import retire_executor
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(2 * 1024 * 1024)))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "5"))
+RESUME_PARSE_TIMEOUT_SECONDS = float(os.getenv("RESUME_PARSE_TIMEOUT_SECONDS", "10"))
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "500"))
+RESUME_CACHE_TTL_SECONDS = int(os.getenv("RESUME_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+
+# Sections passed to question prompts, in order (sized by
+# PROMPT_RESUME_TOKEN_BUDGET, see utils/prompt_budget.py)
+PROMPT_SECTIONS = ("summary", "skills", "projects", "experience")
+
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "objective", "about me"),
+    "skills": ("skills", "technical skills", "technologies", "tech stack", "tools"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "experience": (
+        "experience", "work experience", "professional experience",
+        "internship", "internships", "employment"
+    ),
+    "education": ("education", "academics", "academic background"),
+    "certifications": ("certifications", "certificates", "courses"),
+    "achievements": ("achievements", "awards", "accomplishments")
+}
+
+_HEADING_LOOKUP = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+_cache = TTLCache(RESUME_CACHE_MAX_ENTRIES, RESUME_CACHE_TTL_SECONDS)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class ResumeRejected(Exception):
+    """
+    Upload is too large or cannot be parsed in time.
+    """
+
+
+# ======================================================
+# PARSING (runs in the worker processes)
+# ======================================================
+def iter_page_text(data: bytes, max_pages: int = RESUME_MAX_PAGES):
+    """
+    Yields page text lazily, stopping at max_pages.
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    for i, page in enumerate(reader.pages):
+        if i >= max_pages:
+            break
+        yield page.extract_text() or ""
+
+
+def _section_for(line: str):
+    heading = re.sub(r"[^a-z ]", "", line.lower()).strip()
+    if not heading or len(heading) > 30:
+        return None
+    return _HEADING_LOOKUP.get(heading)
+
+
+def extract_sections(text: str) -> dict:
+    """
+    Splits resume text on recognised headings (skills, projects, ...).
+    Text before the first heading is kept as "header".
+    """
+    sections = {}
+    current = "header"
+    for line in text.splitlines():
+        section = _section_for(line)
+        if section:
+            current = section
+            continue
+        if line.strip():
+            sections.setdefault(current, []).append(line.strip())
+    return {name: "\n".join(lines) for name, lines in sections.items()}
+
+
+def parse_resume_pdf(data: bytes, max_pages: int = RESUME_MAX_PAGES) -> dict:
+    text = "\n".join(iter_page_text(data, max_pages))
+    return {
+        "text": text,
+        "sections": extract_sections(text)
+    }
+
+
+# ======================================================
+# INGESTION (request side)
+# ======================================================
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=RESUME_PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+
+def _import_pdf_reader():
+    from PyPDF2 import PdfReader  # noqa: F401
+
+
+def warm_up():
+    """
+    Starts a parse process and imports PyPDF2 in it.
+    """
+    _get_executor().submit(_import_pdf_reader).result(timeout=RESUME_PARSE_TIMEOUT_SECONDS)
+
+
+def _reset_executor():
+    """
+    A timed-out parse keeps its worker busy, so new parses go to a new
+    pool; the old one finishes the parses already in it before its
+    processes are killed (utils.process_pool).
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    retire_executor(executor, RESUME_PARSE_TIMEOUT_SECONDS)
+
+
+def read_upload(file) -> bytes:
+    data = file.read(RESUME_MAX_BYTES + 1)
+    if len(data) > RESUME_MAX_BYTES:
+        raise ResumeRejected(
+            f"Resume file is too large (max {RESUME_MAX_BYTES // (1024 * 1024)} MB)."
+        )
+    return data
+
+
+@timed("resume_parse")
+def ingest_resume(file) -> dict:
+    """
+    Returns {"digest", "text", "sections"} for an uploaded PDF.
+    Parsed results are cached by content hash, so re-uploads are free.
+    Raises ResumeRejected for oversized or unparseable uploads.
+    """
+    data = read_upload(file)
+    digest = hashlib.sha256(data).hexdigest()
+
+    cached = _cache.get(digest)
+    if cached is not None:
+        return cached
+
+    try:
+        parsed = _get_executor().submit(parse_resume_pdf, data).result(
+            timeout=RESUME_PARSE_TIMEOUT_SECONDS
+        )
+    except FuturesTimeoutError as e:
+        _reset_executor()
+        raise ResumeRejected("Resume took too long to read.") from e
+    except BrokenProcessPool as e:
+        _reset_executor()
+        raise ResumeRejected("Unable to read resume file.") from e
+
+    result = {"digest": digest, **parsed}
+    _cache.set(digest, result)
+    return result
+
+
+def resume_prompt_text(resume: dict) -> str:
+    """
+    The parts of the resume question prompts need (summary, skills,
+    projects, experience); the whole text if no headings were found.
+    """
+    sections = resume["sections"]
+    parts = [
+        f"{name.upper()}:\n{sections[name]}"
+        for name in PROMPT_SECTIONS
+        if sections.get(name)
+    ]
+    return "\n\n".join(parts) if parts else resume["text"]
@@ -1,4 +1,4 @@
-from PyPDF2 import PdfReader
+from utils.resume_ingest import ingest_resume, resume_prompt_text, ResumeRejected
 
 RESUME_KEYWORDS = [
     "education",
@@ -10,20 +10,14 @@ RESUME_KEYWORDS = [
 ]
 
 
-def extract_text_from_pdf(file) -> str:
-    reader = PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text.lower()
-
-
 def is_valid_resume(file):
     """
-    Validate resume PDF and return extracted text
+    Validate resume PDF and return the resume text used in prompts
+    (relevant sections only)
     """
     try:
-        text = extract_text_from_pdf(file)
+        resume = ingest_resume(file)
+        text = resume["text"].lower()
 
         if len(text.strip()) < 300:
             return False, "Resume content is too short."
@@ -32,7 +26,10 @@ def is_valid_resume(file):
         if hits < 2:
             return False, "Document does not appear to be a valid resume."
 
-        return True, text
+        return True, resume_prompt_text(resume)
+
+    except ResumeRejected as e:
+        return False, str(e)
 
     except Exception:
         return False, "Unable to read resume file."
@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(2 * 60 * 60)))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", "sessions.db")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Per-session side data (report drafts, question plans): up to
+# MAX_QUESTIONS + 1 entries per session, kept out of the session LRU
+SESSION_DERIVED_MAX_ENTRIES = int(os.getenv("SESSION_DERIVED_MAX_ENTRIES", str(SESSION_MAX_ENTRIES * 6)))
+
+
+# ======================================================
+# SERIALIZATION
+# ======================================================
+def dumps_session(session: dict) -> bytes:
+    """
+    Compact wire format shared by every backend: minified JSON, zlib-compressed.
+    """
+    raw = json.dumps(session, separators=(",", ":"), ensure_ascii=False)
+    return zlib.compress(raw.encode("utf-8"))
+
+
+def loads_session(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class SessionStore:
+    """
+    Interview session storage.
+
+    get() returns a private copy of the session; changes are only
+    persisted by save(), so a failed turn never leaves half-written state.
+    """
+
+    def get(self, session_id: str):
+        raise NotImplementedError
+
+    def save(self, session_id: str, session: dict):
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+
+# ======================================================
+# IN-MEMORY (LRU + TTL)
+# ======================================================
+class MemorySessionStore(SessionStore):
+    """
+    Per-process store with a size cap (LRU eviction) and idle TTL.
+    Not shared between gunicorn workers - use sqlite or redis for that.
+    """
+
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _purge_expired(self, now: float):
+        # Oldest entries sit at the front, so stop at the first live one
+        while self.entries:
+            session_id, (expires_at, _) = next(iter(self.entries.items()))
+            if expires_at > now:
+                break
+            self.entries.popitem(last=False)
+
+    def get(self, session_id: str):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(session_id)
+            if entry is None:
+                return None
+            expires_at, blob = entry
+            if expires_at <= now:
+                del self.entries[session_id]
+                return None
+            self.entries[session_id] = (now + self.ttl_seconds, blob)
+            self.entries.move_to_end(session_id)
+        return loads_session(blob)
+
+    def save(self, session_id: str, session: dict):
+        blob = dumps_session(session)
+        now = time.monotonic()
+        with self.lock:
+            self.entries[session_id] = (now + self.ttl_seconds, blob)
+            self.entries.move_to_end(session_id)
+            self._purge_expired(now)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, session_id: str):
+        with self.lock:
+            self.entries.pop(session_id, None)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# ======================================================
+# SQLITE (shared by workers on one host, survives restarts)
+# ======================================================
+class SQLiteSessionStore(SessionStore):
+    PURGE_EVERY = 200
+
+    def __init__(self, path: str = SESSION_SQLITE_PATH, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.local = threading.local()
+        self.saves = 0
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, data BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def get(self, session_id: str):
+        row = self._conn().execute(
+            "SELECT data FROM sessions WHERE id = ? AND expires_at > ?",
+            (session_id, time.time())
+        ).fetchone()
+        return loads_session(row[0]) if row else None
+
+    def save(self, session_id: str, session: dict):
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (id, data, expires_at) VALUES (?, ?, ?)",
+            (session_id, dumps_session(session), now + self.ttl_seconds)
+        )
+        self.saves += 1
+        if self.saves % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        conn.commit()
+
+    def delete(self, session_id: str):
+        conn = self._conn()
+        conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        conn.commit()
+
+
+# ======================================================
+# REDIS (shared across hosts)
+# ======================================================
+class RedisSessionStore(SessionStore):
+    """
+    Works with any client exposing redis-py's get / set(ex=) / delete,
+    so a local stand-in (e.g. fakeredis) can replace a real server.
+    """
+
+    def __init__(self, client, ttl_seconds: int = SESSION_TTL_SECONDS, prefix: str = "interview:session:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str = REDIS_URL, **kwargs):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "SESSION_BACKEND=redis requires the 'redis' package (pip install redis)"
+            ) from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, session_id: str):
+        blob = self.client.get(self.prefix + session_id)
+        return loads_session(blob) if blob else None
+
+    def save(self, session_id: str, session: dict):
+        self.client.set(self.prefix + session_id, dumps_session(session), ex=self.ttl_seconds)
+
+    def delete(self, session_id: str):
+        self.client.delete(self.prefix + session_id)
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    if backend == "redis":
+        return RedisSessionStore.from_url()
+    raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+
+
+def create_derived_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    """
+    Store for data derived from sessions ("<session_id>:..." keys), on
+    the same backend so every worker sees it, but never counted against
+    the sessions: a separate LRU in memory, a separate prefix in redis
+    (sqlite has no entry cap).
+    """
+    if backend == "memory":
+        return MemorySessionStore(max_entries=SESSION_DERIVED_MAX_ENTRIES)
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    if backend == "redis":
+        return RedisSessionStore.from_url(prefix="interview:derived:")
+    raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
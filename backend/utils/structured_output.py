@@ -0,0 +1,344 @@
+"""
+Structured (JSON) LLM output.
+
+    evaluation = call_structured(prompt, EVALUATION_SCHEMA, template="evaluation")
+
+- JSON mode on the provider (Groq response_format=json_object; the
+  model in use has no json_schema support, so the schema is checked here)
+- the completion is streamed through JSONObjectScanner and the stream
+  is closed as soon as the first object is complete
+- the object is validated against a small JSON-Schema subset (type,
+  properties, required, enum, minimum / maximum, items); numbers are
+  clamped and numeric strings coerced rather than rejected
+- on a parse / validation failure, ONE short repair call with the
+  errors and the bad output; after that StructuredOutputError
+"""
+
+import json
+import functools
+
+from utils.llm_client import call_llm, stream_llm, LLMResponseError
+from config.prompts import JSON_REPAIR_PROMPT
+from utils.metrics import inc
+
+# The repair only re-emits a small object
+REPAIR_MAX_TOKENS = 512
+
+
+class StructuredOutputError(LLMResponseError):
+    """
+    The completion was not valid JSON for the schema, even after repair.
+    """
+
+
+# ======================================================
+# SCHEMAS
+# ======================================================
+# "required" lists only what a caller cannot default; optional fields
+# are still type-checked when present (normalize_evaluation fills gaps)
+def _score(description: str) -> dict:
+    return {"type": "number", "minimum": 0, "maximum": 10, "description": description}
+
+
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "required": ["score"],
+    "properties": {
+        "score": _score("overall score"),
+        "technical_accuracy": _score("technical accuracy"),
+        "communication_clarity": _score("communication clarity"),
+        "problem_solving": _score("problem solving"),
+        "strengths": {"type": "string"},
+        "weaknesses": {"type": "string"},
+        "depth_assessment": {"type": "string", "enum": ["none", "surface", "moderate", "deep"]}
+    }
+}
+
+BATCH_EVALUATION_SCHEMA = {
+    "type": "object",
+    "required": ["evaluations"],
+    "properties": {
+        "evaluations": {"type": "array", "items": {"type": "object"}}
+    }
+}
+
+COMPETENCE_SCHEMA = {
+    "type": "object",
+    "required": ["estimated_competence", "next_question_intent"],
+    "properties": {
+        "estimated_competence": _score("estimated competence"),
+        "confidence_alignment": {
+            "type": "string",
+            "enum": ["overconfident", "underconfident", "aligned"]
+        },
+        "weak_areas": {"type": "array", "items": {"type": "string"}},
+        "next_question_intent": {
+            "type": "string",
+            "enum": ["easier", "similar", "deeper", "focused"]
+        },
+        "reasoning": {"type": "string"}
+    }
+}
+
+QUESTION_BANK_SCHEMA = {
+    "type": "object",
+    "required": ["questions"],
+    "properties": {
+        "questions": {"type": "array", "items": {"type": "string"}}
+    }
+}
+
+QUESTION_PLAN_SCHEMA = {
+    "type": "object",
+    "required": ["questions"],
+    "properties": {
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["question"],
+                "properties": {
+                    "question": {"type": "string"},
+                    "easier": {"type": "string"},
+                    "deeper": {"type": "string"}
+                }
+            }
+        }
+    }
+}
+
+
+# ======================================================
+# INCREMENTAL PARSER
+# ======================================================
+class JSONObjectScanner:
+    """
+    Finds the first complete top-level JSON object in a stream of
+    chunks. Text before it (prose, ``` fences) is skipped; braces
+    inside strings are ignored.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.complete = False
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Returns True once the object is complete (further input is ignored).
+        """
+        if self.complete:
+            return True
+
+        start = 0
+        for i, ch in enumerate(chunk):
+            if self.depth == 0:
+                if ch == "{":
+                    self.depth = 1
+                    start = i
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.parts.append(chunk[start:i + 1])
+                    self.complete = True
+                    return True
+
+        if self.depth > 0:
+            self.parts.append(chunk[start:])
+        return False
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+def extract_json(text: str) -> dict:
+    """
+    The first JSON object in an LLM response.
+    """
+    scanner = JSONObjectScanner()
+    if not scanner.feed(text):
+        raise ValueError("No complete JSON object found in LLM response")
+    return json.loads(scanner.text)
+
+
+# ======================================================
+# VALIDATION
+# ======================================================
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool
+}
+
+
+def _coerce(value, schema: dict, path: str, errors: list):
+    kind = schema.get("type")
+
+    if kind in ("number", "integer"):
+        if isinstance(value, str):
+            try:
+                value = float(value.strip().split("/")[0])
+            except ValueError:
+                pass
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            errors.append(f"{path}: expected a number, got {json.dumps(value)[:40]}")
+            return value
+        if "minimum" in schema:
+            value = max(schema["minimum"], value)
+        if "maximum" in schema:
+            value = min(schema["maximum"], value)
+        if kind == "integer" or float(value).is_integer():
+            value = int(round(value))
+        return value
+
+    if kind and not isinstance(value, _TYPES[kind]):
+        errors.append(f"{path}: expected {kind}, got {type(value).__name__}")
+        return value
+
+    if "enum" in schema:
+        normalized = value.strip().lower() if isinstance(value, str) else value
+        if normalized not in schema["enum"]:
+            errors.append(f"{path}: must be one of {', '.join(schema['enum'])}")
+        return normalized
+
+    if kind == "object":
+        for field in schema.get("required", []):
+            if field not in value:
+                errors.append(f"{path}.{field}: missing")
+        return {
+            key: _coerce(item, schema["properties"][key], f"{path}.{key}", errors)
+            if key in schema.get("properties", {}) else item
+            for key, item in value.items()
+        }
+
+    if kind == "array" and "items" in schema:
+        return [
+            _coerce(item, schema["items"], f"{path}[{i}]", errors)
+            for i, item in enumerate(value)
+        ]
+
+    return value
+
+
+def validate(value, schema: dict) -> tuple:
+    """
+    (coerced_value, errors). errors is empty when the value fits.
+    """
+    errors = []
+    value = _coerce(value, schema, "$", errors)
+    return value, errors
+
+
+def parse_structured(text: str, schema: dict) -> tuple:
+    """
+    (value, errors) for a raw completion; a parse failure is an error.
+    """
+    try:
+        parsed = extract_json(text)
+    except ValueError as e:
+        return None, [str(e)]
+    return validate(parsed, schema)
+
+
+# ======================================================
+# CALLS
+# ======================================================
+def _describe(schema: dict) -> str:
+    lines = []
+    for field, spec in schema.get("properties", {}).items():
+        if "enum" in spec:
+            kind = " | ".join(spec["enum"])
+        elif spec.get("type") == "number" and "maximum" in spec:
+            kind = f"number between {spec.get('minimum', 0)} and {spec['maximum']}"
+        elif spec.get("type") == "array":
+            kind = f"array of {spec.get('items', {}).get('type', 'values')}"
+        else:
+            kind = spec.get("type", "value")
+        lines.append(f'- "{field}": {kind}')
+    return "\n".join(lines)
+
+
+def _stream_object(prompt: str, template: str, temperature: float, max_tokens: int) -> str:
+    """
+    Streams in JSON mode and stops reading at the end of the first object.
+    """
+    scanner = JSONObjectScanner()
+    raw = []
+    for delta in stream_llm(
+        prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        template=template,
+        json_mode=True
+    ):
+        raw.append(delta)
+        if scanner.feed(delta):
+            return scanner.text
+    return "".join(raw)
+
+
+def call_structured(
+    prompt: str,
+    schema: dict,
+    template: str = "other",
+    temperature: float = 0.6,
+    max_tokens: int = 2048,
+    llm=None,
+    repair_max_tokens: int = REPAIR_MAX_TOKENS
+) -> dict:
+    """
+    Validated JSON from the LLM, with at most one repair call
+    (repair_max_tokens: raise it for templates with large objects).
+    llm (prompt -> text) replaces the streamed JSON-mode call, e.g. for
+    batch jobs; the repair goes through it too.
+    Raises StructuredOutputError (an LLMError) if the output stays invalid.
+    """
+    if llm is None:
+        response = _stream_object(prompt, template, temperature, max_tokens)
+        repair = functools.partial(
+            call_llm,
+            temperature=0.0,
+            max_tokens=repair_max_tokens,
+            template=f"{template}_repair",
+            json_mode=True
+        )
+    else:
+        response = llm(prompt)
+        repair = llm
+
+    value, errors = parse_structured(response, schema)
+    if not errors:
+        inc("structured_output_total", template=template, outcome="ok")
+        return value
+
+    repaired = repair(JSON_REPAIR_PROMPT.format(
+        errors="\n".join(f"- {e}" for e in errors[:10]),
+        response=response[:4000],
+        fields=_describe(schema)
+    ))
+    value, errors = parse_structured(repaired, schema)
+    if not errors:
+        inc("structured_output_total", template=template, outcome="repaired")
+        return value
+
+    inc("structured_output_total", template=template, outcome="failed")
+    raise StructuredOutputError("Invalid structured output: " + "; ".join(errors[:3]))
@@ -1,6 +1,6 @@
 import React, { useEffect, useState, useMemo, useRef } from "react";
 import { useParams, useNavigate } from "react-router-dom";
-import { submitAnswer } from "../services/api";
+import { streamAnswer, getSession } from "../services/api";
 import Editor from "@monaco-editor/react";
 import ReactMarkdown from "react-markdown";
 import { motion, AnimatePresence } from "framer-motion";
@@ -24,7 +24,7 @@ const languageFromTopic = (topic = "") => {
   return "plaintext";
 };
 
-const TOTAL_QUESTIONS = 5;
+const DEFAULT_TOTAL_QUESTIONS = 5;
 const ANSWER_BOX_HEIGHT = 500;
 
 export default function Interview() {
@@ -46,6 +46,7 @@ export default function Interview() {
   const speechRef = useRef(null);
 
   const topic = sessionStorage.getItem("topic") || "";
+  const TOTAL_QUESTIONS = Number(sessionStorage.getItem("max_questions")) || DEFAULT_TOTAL_QUESTIONS;
   const language = useMemo(() => languageFromTopic(topic), [topic]);
 
   /* -------------------------------
@@ -73,14 +74,32 @@ export default function Interview() {
      Load first question
   -------------------------------- */
   useEffect(() => {
-    const q = sessionStorage.getItem("current_question");
-    if (!q) {
-      setError("Interview session expired. Please restart.");
-      return;
-    }
-    setQuestion(q);
-    setQuestionIndex(0);
-    speakQuestion(q);
+    const showQuestion = (q, index) => {
+      setQuestion(q);
+      setQuestionIndex(index);
+      speakQuestion(q);
+    };
+
+    // Resume from the server so a reload keeps the right question and turn
+    getSession(sessionId)
+      .then((res) => {
+        if (res.data.done) {
+          sessionStorage.setItem("final_report", res.data.report);
+          sessionStorage.setItem("evaluation_history", JSON.stringify(res.data.evaluation_history));
+          navigate(`/report/${sessionId}`);
+          return;
+        }
+        sessionStorage.setItem("current_question", res.data.current_question);
+        showQuestion(res.data.current_question, res.data.question_count);
+      })
+      .catch(() => {
+        const q = sessionStorage.getItem("current_question");
+        if (!q) {
+          setError("Interview session expired. Please restart.");
+          return;
+        }
+        showQuestion(q, 0);
+      });
     return () => window.speechSynthesis.cancel();
   }, []);
 
@@ -98,7 +117,12 @@ export default function Interview() {
 
     try {
       const combinedAnswer = textAnswer + (codeAnswer ? "\n\n--- CODE ---\n" + codeAnswer : "");
-      const res = await submitAnswer({ session_id: sessionId, answer: combinedAnswer });
+      let streamed = "";
+      const res = await streamAnswer({ session_id: sessionId, answer: combinedAnswer }, (event, data) => {
+        if (event !== "token") return;
+        streamed += data.text;
+        setQuestion(streamed);
+      }, `${sessionId}:${questionIndex}`);
 
       if (res.data.done) {
         sessionStorage.removeItem("current_question");
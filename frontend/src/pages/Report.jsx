@@ -65,7 +65,7 @@ export default function Report() {
   const persona = getPersona(score);
 
   const handleDownload = async () => {
-    const res = await downloadReportPdf(report);
+    const res = await downloadReportPdf(report, sessionId);
     const blob = new Blob([res.data], { type: "application/pdf" });
     const url = window.URL.createObjectURL(blob);
     const a = document.createElement("a");
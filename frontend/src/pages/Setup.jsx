@@ -56,6 +56,7 @@ export default function Setup() {
 
             sessionStorage.setItem("session_id", res.data.session_id);
             sessionStorage.setItem("current_question", res.data.question);
+            sessionStorage.setItem("max_questions", res.data.max_questions || 5);
             sessionStorage.setItem("topic", formData.topic || "Project"); // For syntax highlighting hints
 
             navigate(`/interview/${res.data.session_id}`);
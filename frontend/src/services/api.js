@@ -10,12 +10,70 @@ export const startInterview = (formData) =>
     headers: { "Content-Type": "multipart/form-data" },
   });
 
-export const submitAnswer = (payload) =>
-  axios.post(`${API}/interview/answer`, payload);
+/* idempotencyKey identifies the turn; retries must reuse it so the
+   server replays the original response instead of re-scoring. */
+export const submitAnswer = (payload, idempotencyKey) =>
+  axios.post(`${API}/interview/answer`, payload, {
+    headers: idempotencyKey ? { "Idempotency-Key": idempotencyKey } : {},
+  });
+
+export const getSession = (sessionId) =>
+  axios.get(`${API}/interview/session/${sessionId}`);
 
-export const downloadReportPdf = (report) =>
+export const downloadReportPdf = (report, sessionId) =>
   axios.post(
     `${API}/interview/report/pdf`,
-    { report },
+    { report, session_id: sessionId },
     { responseType: "blob" }
   );
+
+/* Streams /answer as Server-Sent Events.
+   EventSource is GET-only, so this reads the POST body with fetch.
+   Resolves with { data } shaped like the non-streaming response. */
+export const streamAnswer = async (payload, onEvent = () => {}, idempotencyKey) => {
+  const headers = { "Content-Type": "application/json" };
+  if (idempotencyKey) headers["Idempotency-Key"] = idempotencyKey;
+
+  const res = await fetch(`${API}/interview/answer/stream`, {
+    method: "POST",
+    headers,
+    body: JSON.stringify(payload),
+  });
+
+  if (!res.ok) {
+    const data = await res.json().catch(() => ({}));
+    throw { response: { data } };
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let result = null;
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const chunk = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = "message";
+      let data = "";
+      chunk.split("\n").forEach((line) => {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      });
+
+      const parsed = data ? JSON.parse(data) : {};
+      if (event === "error") throw { response: { data: parsed } };
+      if (event === "done") result = parsed;
+      onEvent(event, parsed);
+    }
+  }
+
+  if (!result) throw { response: { data: { error: "Connection interrupted. Please try again." } } };
+  return { data: result };
+};